@@ -0,0 +1,197 @@
+"""
+Memory-Mapped Storage for the Complaint Categorizer Pipeline
+The sklearn pipeline is written with joblib (uncompressed), which stores every NumPy
+array - IDF weights, coefficients, class log-probabilities - as a raw block that
+joblib.load(mmap_mode='r') maps instead of copying. Loading a version is then mostly
+unpickling small objects, and the arrays live in the OS page cache, shared by all
+workers that load the same version.
+
+The TF-IDF vocabulary (a dict of term -> column, pickled as Python objects) would be
+rebuilt as a private dict in every worker, so it is stored as a MappedVocabulary: the
+terms sorted in a fixed-width string array plus their columns, looked up by binary
+search in the mapped arrays, so the vocabulary is shared like the other arrays.
+stop_words_ (only kept by sklearn for introspection) is dropped.
+
+Every file has a JSON header next to it (format version, sklearn version, steps), so
+an incompatible file is rejected before unpickling. Registry versions saved before
+this format (complaint_categorizer.pkl) are still read.
+"""
+
+import os
+import copy
+import json
+import pickle
+import logging
+from collections.abc import Mapping
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+
+MODEL_FILENAME = 'complaint_categorizer.joblib'
+HEADER_FILENAME = 'complaint_categorizer.json'
+LEGACY_MODEL_FILENAME = 'complaint_categorizer.pkl'
+
+FORMAT_NAME = 'complaint_categorizer'
+FORMAT_VERSION = 2
+
+
+def model_file(directory):
+    """The model file of a directory: the joblib format, else the legacy pickle"""
+    path = os.path.join(directory, MODEL_FILENAME)
+    if os.path.exists(path):
+        return path
+    return os.path.join(directory, LEGACY_MODEL_FILENAME)
+
+
+class MappedVocabulary(Mapping):
+    """
+    Read-only term -> column mapping over two arrays (terms sorted, their columns), a
+    drop-in for a fitted vectorizer's vocabulary_ dict. Loaded with mmap_mode='r', both
+    arrays stay in the shared page cache; a lookup is one binary search.
+    """
+
+    def __init__(self, terms, columns):
+        self.terms = terms
+        self.columns = columns
+
+    @classmethod
+    def from_dict(cls, vocabulary):
+        terms = np.array(sorted(vocabulary), dtype=str)
+        columns = np.array([vocabulary[term] for term in terms.tolist()], dtype=np.int64)
+        return cls(terms, columns)
+
+    @classmethod
+    def from_column_terms(cls, column_terms):
+        """From an array of terms in column order (format version 1)"""
+        order = np.argsort(column_terms, kind='stable')
+        return cls(column_terms[order], order.astype(np.int64))
+
+    def _position(self, term):
+        if not isinstance(term, str) or not len(self.terms):
+            return None
+        position = int(np.searchsorted(self.terms, term))
+        if position < len(self.terms) and self.terms[position] == term:
+            return position
+        return None
+
+    def __getitem__(self, term):
+        position = self._position(term)
+        if position is None:
+            raise KeyError(term)
+        return int(self.columns[position])
+
+    def __contains__(self, term):
+        return self._position(term) is not None
+
+    def __iter__(self):
+        return iter(self.terms.tolist())
+
+    def __len__(self):
+        return len(self.terms)
+
+    def items(self):
+        return zip(self.terms.tolist(), self.columns.tolist())
+
+    def __deepcopy__(self, memo):
+        # Copied out of the memory map, e.g. for a pipeline updated in place
+        return MappedVocabulary(np.array(self.terms), np.array(self.columns))
+
+
+def _storable_step(step):
+    """Copy of a pipeline step with its vocabulary as a MappedVocabulary (the live step is untouched)"""
+    vocabulary = getattr(step, 'vocabulary_', None)
+    if not isinstance(vocabulary, dict):
+        return step
+
+    stored = copy.copy(step)
+    stored.vocabulary_ = MappedVocabulary.from_dict(vocabulary)
+    if hasattr(stored, 'stop_words_'):
+        del stored.stop_words_
+    return stored
+
+
+def _restore_step(step):
+    vocabulary = getattr(step, 'vocabulary_', None)
+    if isinstance(vocabulary, np.ndarray):
+        # Format version 1: terms in column order, not mapped as a lookup
+        step.vocabulary_ = MappedVocabulary.from_column_terms(vocabulary)
+    return step
+
+
+def save_pipeline(pipeline, directory, is_trained=True):
+    """
+    Write the pipeline and its header into `directory`
+
+    Returns:
+        The header
+    """
+    stored = Pipeline([(name, _storable_step(step)) for name, step in pipeline.steps])
+
+    # No compression: compressed arrays can't be memory-mapped
+    joblib.dump({'pipeline': stored, 'is_trained': is_trained}, os.path.join(directory, MODEL_FILENAME))
+
+    header = {
+        'format': FORMAT_NAME,
+        'format_version': FORMAT_VERSION,
+        'sklearn_version': sklearn.__version__,
+        'steps': [[name, type(step).__name__] for name, step in pipeline.steps]
+    }
+    with open(os.path.join(directory, HEADER_FILENAME), 'w') as f:
+        json.dump(header, f, indent=2)
+    return header
+
+
+def read_header(directory):
+    """Header of a saved pipeline, None for the legacy pickle"""
+    header_file = os.path.join(directory, HEADER_FILENAME)
+    if not os.path.exists(header_file):
+        return None
+    with open(header_file, 'r') as f:
+        return json.load(f)
+
+
+def load_pipeline(directory, mmap=True):
+    """
+    Load the pipeline saved in `directory`
+
+    With mmap=True its arrays are read-only memory maps: predictions work as usual,
+    but anything that trains the pipeline in place (partial_fit) must run on a
+    copy.deepcopy() of it.
+
+    Returns:
+        Dict with 'pipeline', 'model', 'vectorizer' and 'is_trained'
+    """
+    path = model_file(directory)
+    if path.endswith(LEGACY_MODEL_FILENAME):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    header = read_header(directory)
+    if header is None or header.get('format') != FORMAT_NAME:
+        raise ValueError(f"{path} has no valid {HEADER_FILENAME} header")
+    if header['format_version'] > FORMAT_VERSION:
+        raise ValueError(
+            f"{path} uses format version {header['format_version']}, this code reads up to {FORMAT_VERSION}"
+        )
+    if header.get('sklearn_version') != sklearn.__version__:
+        logger.warning(
+            f"{path} was saved with scikit-learn {header.get('sklearn_version')}, "
+            f"running {sklearn.__version__}"
+        )
+
+    data = joblib.load(path, mmap_mode='r' if mmap else None)
+    pipeline = data['pipeline']
+    for _, step in pipeline.steps:
+        _restore_step(step)
+
+    return {
+        'pipeline': pipeline,
+        'model': pipeline.steps[-1][1],
+        'vectorizer': pipeline.steps[0][1],
+        'is_trained': data.get('is_trained', True)
+    }
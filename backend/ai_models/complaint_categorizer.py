@@ -4,21 +4,27 @@ Automatically categorizes complaints based on description text using machine lea
 """
 
 import re
+import copy
 import json
-import pickle
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
-from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Callable, Dict, List, Tuple, Optional
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import classification_report, accuracy_score
 from sklearn.pipeline import Pipeline
 from django.conf import settings
 import os
+import time
 import logging
+import threading
+
+from ai_models.result_cache import build_result_cache_from_settings
+from ai_models.model_registry import ModelRegistry
+from ai_models.categorizer_storage import load_pipeline, model_file, save_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -115,12 +121,57 @@ class ComplaintCategorizer:
         }
     }
     
+    # Complaint.type values that don't match a category key or name (see category_for_type)
+    TYPE_ALIASES = {
+        'staff_behaviour': 'staff_behavior',
+        'ticketing': 'booking_ticketing',
+        'booking': 'booking_ticketing',
+        'refund': 'booking_ticketing',
+        'coach_maintenance': 'mechanical',
+        'maintenance': 'mechanical',
+        'punctuality': 'delay_cancellation',
+        'delay': 'delay_cancellation',
+        'safety': 'security',
+        'medical_assistance': 'medical',
+        'baggage': 'luggage',
+        'food': 'catering',
+        'other': 'general'
+    }
+    
     def __init__(self):
         self.model = None
         self.vectorizer = None
         self.pipeline = None
         self.model_path = os.path.join(settings.BASE_DIR, 'ai_models', 'models')
         self.is_trained = False
+        self.model_version = None
+        
+        # Cache of predict_category() results, keyed by text + model_version
+        self.result_cache = build_result_cache_from_settings('categorizer')
+        
+        # Trained pipelines are stored as registry versions; every process follows the
+        # active pointer (see _sync_with_registry)
+        self.registry = ModelRegistry(
+            getattr(settings, 'AI_MODEL_REGISTRY_DIR', os.path.join(settings.BASE_DIR, 'ai_models', 'registry')),
+            'categorizer'
+        )
+        self.registry_version = None
+        self._registry_poll_interval = getattr(settings, 'AI_MODEL_REGISTRY_POLL_SECONDS', 5)
+        self._next_registry_check = 0.0
+        self._registry_swap_lock = threading.Lock()
+        
+        # Parallel cross-validation during training (joblib n_jobs, -1 = all cores)
+        self.training_n_jobs = getattr(settings, 'AI_TRAINING_N_JOBS', -1)
+        
+        # Online mode: hashing vectorizer + SGD model updated with partial_fit from
+        # closed complaints (see partial_fit and complaints/training_jobs.py)
+        self.online_enabled = getattr(settings, 'AI_CATEGORIZER_ONLINE', False)
+        self.online_n_features = getattr(settings, 'AI_ONLINE_N_FEATURES', 2 ** 16)
+        self.online_keep_versions = getattr(settings, 'AI_ONLINE_KEEP_VERSIONS', 10)
+        self._type_lookup = {
+            **{self._normalize_type(info['name']): key for key, info in self.CATEGORIES.items()},
+            **self.TYPE_ALIASES
+        }
         
         # Create models directory if it doesn't exist
         os.makedirs(self.model_path, exist_ok=True)
@@ -288,16 +339,35 @@ class ComplaintCategorizer:
         
         return pd.DataFrame(training_data)
     
-    def train_model(self, retrain: bool = False) -> Dict:
+    def train_model(self, retrain: bool = False, progress_callback: Optional[Callable[[int, str], None]] = None,
+                    n_jobs: Optional[int] = None) -> Dict:
         """
         Train the complaint categorization model
+        
+        Meant to run in a background training job (complaints/training_jobs.py), not on
+        the request path. The new pipeline is swapped in as a whole once it is trained
+        and saved; predictions keep using the previous one until then.
+        
+        Args:
+            retrain: Train even if a model is already loaded
+            progress_callback: Called as progress_callback(percent, stage) while training
+            n_jobs: Parallel cross-validation folds (default AI_TRAINING_N_JOBS)
         """
+        def report_progress(percent, stage):
+            logger.info(f"Training: {stage} ({percent}%)")
+            if progress_callback is not None:
+                progress_callback(percent, stage)
+        
+        n_jobs = self.training_n_jobs if n_jobs is None else n_jobs
+        
         try:
             if self.is_trained and not retrain:
                 logger.info("Model already trained. Use retrain=True to force retrain.")
                 return {"status": "already_trained", "accuracy": "N/A"}
             
             logger.info("Starting model training...")
+            start_time = time.perf_counter()
+            report_progress(5, "Preparing training data")
             
             # Generate training data
             df = self.generate_training_data()
@@ -326,7 +396,9 @@ class ComplaintCategorizer:
             best_classifier_name = ""
             
             # Test different classifiers
-            for name, classifier in classifiers.items():
+            for index, (name, classifier) in enumerate(classifiers.items()):
+                report_progress(10 + 60 * index // len(classifiers), f"Cross-validating {name}")
+                
                 pipeline = Pipeline([
                     ('tfidf', TfidfVectorizer(
                         max_features=5000,
@@ -339,7 +411,7 @@ class ComplaintCategorizer:
                 ])
                 
                 # Cross-validation
-                cv_scores = cross_val_score(pipeline, X_train, y_train, cv=5)
+                cv_scores = cross_val_score(pipeline, X_train, y_train, cv=5, n_jobs=n_jobs)
                 avg_accuracy = cv_scores.mean()
                 
                 logger.info(f"{name} CV accuracy: {avg_accuracy:.3f}")
@@ -350,22 +422,27 @@ class ComplaintCategorizer:
                     best_classifier_name = name
             
             # Train best classifier on full training set
+            report_progress(75, f"Fitting {best_classifier_name}")
             best_classifier.fit(X_train, y_train)
             
             # Evaluate on test set
+            report_progress(85, "Evaluating on the test set")
             test_accuracy = best_classifier.score(X_test, y_test)
             y_pred = best_classifier.predict(X_test)
             
             # Generate classification report
             report = classification_report(y_test, y_pred, output_dict=True)
             
-            # Save model
-            self.pipeline = best_classifier
-            self.model = best_classifier.named_steps['classifier']
-            self.vectorizer = best_classifier.named_steps['tfidf']
-            self.is_trained = True
+            # Swap the new pipeline in and save it as a registry version
+            report_progress(95, "Saving and activating the new model")
+            self._apply_payload(self._payload_for(best_classifier))
             
-            self.save_model()
+            self.save_model(metadata={
+                'best_classifier': best_classifier_name,
+                'cv_accuracy': float(best_accuracy),
+                'test_accuracy': float(test_accuracy),
+                'total_samples': len(df)
+            })
             
             logger.info(f"Model training completed. Best classifier: {best_classifier_name}")
             logger.info(f"Test accuracy: {test_accuracy:.3f}")
@@ -377,27 +454,156 @@ class ComplaintCategorizer:
                 "test_accuracy": test_accuracy,
                 "classification_report": report,
                 "total_samples": len(df),
-                "categories": list(self.CATEGORIES.keys())
+                "categories": list(self.CATEGORIES.keys()),
+                "registry_version": self.registry_version,
+                "n_jobs": n_jobs,
+                "training_seconds": round(time.perf_counter() - start_time, 2)
             }
             
         except Exception as e:
             logger.error(f"Error during model training: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    @staticmethod
+    def _normalize_type(value: str) -> str:
+        return re.sub(r'[^a-z0-9]+', '_', (value or '').lower()).strip('_')
+    
+    def category_for_type(self, complaint_type: str) -> Optional[str]:
+        """
+        Category key for a Complaint.type ('cleanliness', 'Cleanliness & Hygiene' and
+        'Staff Behaviour' all map), None when it matches no category
+        """
+        key = self._normalize_type(complaint_type)
+        if key in self.CATEGORIES:
+            return key
+        return self._type_lookup.get(key)
+    
+    def build_online_pipeline(self) -> Pipeline:
+        """
+        Stateless hashing features (no vocabulary to refit, constant memory) and a linear
+        model that learns incrementally with partial_fit
+        """
+        return Pipeline([
+            ('hashing', HashingVectorizer(
+                n_features=self.online_n_features,
+                stop_words='english',
+                ngram_range=(1, 2),
+                alternate_sign=False
+            )),
+            ('classifier', SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42))
+        ])
+    
+    def is_online_pipeline(self, pipeline=None) -> bool:
+        pipeline = self.pipeline if pipeline is None else pipeline
+        return pipeline is not None and 'hashing' in pipeline.named_steps
+    
+    def online_cursor(self) -> Optional[Dict]:
+        """Last (updated_at, id) of the complaints the active online version has learned"""
+        version = self.registry.active_version()
+        if version is None:
+            return None
+        return self.registry.metadata(version).get('online_cursor')
+    
+    def _partial_fit_batch(self, pipeline: Pipeline, texts: List[str], categories: List[str]):
+        features = pipeline.named_steps['hashing'].transform(texts)
+        pipeline.named_steps['classifier'].partial_fit(features, categories, classes=list(self.CATEGORIES.keys()))
+    
+    def partial_fit(self, batches, cursor: Optional[Dict] = None,
+                    progress_callback: Optional[Callable[[int, str], None]] = None) -> Dict:
+        """
+        Update the online model with labelled complaints
+        
+        The update runs on a copy of the active online pipeline (a fresh one, seeded
+        with the synthetic training data, if the active model is the batch TF-IDF one);
+        the copy is swapped in and saved as a new registry version when all batches are
+        learned.
+        
+        Args:
+            batches: Iterable of (complaint_texts, complaint_types, cursor); cursor is the
+                position in the complaint feed after that batch, stored with the version
+            cursor: Feed position before the first batch
+            progress_callback: Called as progress_callback(percent, stage) after each batch
+        """
+        start_time = time.perf_counter()
+        
+        # Another process may have saved a newer online version: continue from that one
+        if self.registry.active_version() not in (None, self.registry_version):
+            self.load_model()
+        
+        if self.is_online_pipeline():
+            # Loaded arrays are read-only memory maps; partial_fit works on a private copy
+            pipeline = copy.deepcopy(self.pipeline)
+            base_samples = self.registry.metadata(self.registry_version).get('online_samples', 0) if self.registry_version else 0
+        else:
+            pipeline = self.build_online_pipeline()
+            seed = self.generate_training_data()
+            self._partial_fit_batch(pipeline, seed['processed_text'].tolist(), seed['category'].tolist())
+            base_samples = 0
+        
+        samples = skipped = batch_count = 0
+        for complaint_texts, complaint_types, cursor in batches:
+            texts, categories = [], []
+            for text, complaint_type in zip(complaint_texts, complaint_types):
+                category = self.category_for_type(complaint_type)
+                processed_text = self.preprocess_text(text)
+                if category is None or not processed_text:
+                    skipped += 1
+                    continue
+                texts.append(processed_text)
+                categories.append(category)
+            
+            if texts:
+                self._partial_fit_batch(pipeline, texts, categories)
+                samples += len(texts)
+            batch_count += 1
+            if progress_callback is not None:
+                progress_callback(min(90, 5 + batch_count), f"Learned {samples} complaints ({batch_count} batches)")
+        
+        self._apply_payload(self._payload_for(pipeline))
+        update_seconds = time.perf_counter() - start_time
+        self.save_model(metadata={
+            'mode': 'online',
+            'online_cursor': cursor,
+            'online_samples': base_samples + samples,
+            'batch_samples': samples,
+            'skipped': skipped
+        })
+        self.registry.prune(self.online_keep_versions)
+        
+        logger.info(f"Online update: learned {samples} complaints in {batch_count} batches ({update_seconds * 1000:.1f} ms)")
+        return {
+            "status": "success",
+            "mode": "online",
+            "samples": samples,
+            "skipped": skipped,
+            "batches": batch_count,
+            "online_samples": base_samples + samples,
+            "update_ms": round(update_seconds * 1000, 1),
+            "registry_version": self.registry_version
+        }
+    
     def predict_category(self, complaint_text: str) -> Dict:
         """
         Predict the category of a complaint based on its description
         """
         try:
-            if not self.is_trained or self.pipeline is None:
-                # Try to train model if not already trained
-                training_result = self.train_model()
-                if training_result["status"] != "success":
-                    return {
-                        "category": "general",
-                        "confidence": 0.5,
-                        "error": "Model not trained and auto-training failed"
-                    }
+            self._sync_with_registry()
+            
+            # One read of each, so a pipeline swapped in mid-request is not mixed with the old one
+            pipeline, model_version = self.pipeline, self.model_version
+            
+            if not self.is_trained or pipeline is None:
+                # Training runs as a background job (POST /ai/train-model/), never on the request path
+                return {
+                    "category": "general",
+                    "confidence": 0.5,
+                    "error": "Model not trained yet"
+                }
+            
+            if self.result_cache is not None and complaint_text:
+                cached = self.result_cache.get(complaint_text, model_version)
+                if cached is not None:
+                    return cached
             
             # Preprocess input text
             processed_text = self.preprocess_text(complaint_text)
@@ -410,8 +616,8 @@ class ComplaintCategorizer:
                 }
             
             # Get prediction probabilities
-            probabilities = self.pipeline.predict_proba([processed_text])[0]
-            classes = self.pipeline.classes_
+            probabilities = pipeline.predict_proba([processed_text])[0]
+            classes = pipeline.classes_
             
             # Get best prediction
             best_idx = np.argmax(probabilities)
@@ -429,7 +635,7 @@ class ComplaintCategorizer:
                 for idx in top_indices
             ]
             
-            return {
+            result = {
                 "category": predicted_category,
                 "confidence": float(confidence),
                 "category_info": self.CATEGORIES.get(predicted_category, {}),
@@ -437,6 +643,11 @@ class ComplaintCategorizer:
                 "processed_text": processed_text
             }
             
+            if self.result_cache is not None:
+                self.result_cache.set(complaint_text, model_version, result)
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error during prediction: {str(e)}")
             return {
@@ -445,21 +656,30 @@ class ComplaintCategorizer:
                 "error": str(e)
             }
     
-    def get_staff_assignment(self, category: str, location: str = None) -> Dict:
+    def get_staff_assignment(self, category: str, location: str = None, reserve: bool = True) -> Dict:
         """
         Get appropriate staff assignment based on complaint category
+        
+        With reserve=True a ticket of the chosen staff member is taken atomically
+        (complaints/staff_tickets.py). Create the complaint in the same transaction,
+        with _reserved_ticket set to the staff name so the ticket isn't counted twice.
         """
         try:
             from complaints.models import Staff
+            from complaints.staff_tickets import max_active_tickets, reserve_ticket
             
             category_info = self.CATEGORIES.get(category, self.CATEGORIES['general'])
             required_roles = category_info.get('staff_roles', ['customer_service'])
+            capacity = max_active_tickets()
             
             # Query staff based on roles and availability
             staff_query = Staff.objects.filter(
                 role__in=required_roles,
                 status='active'
-            ).order_by('active_tickets', '-rating')
+            )
+            if capacity:
+                staff_query = staff_query.filter(active_tickets__lt=capacity)
+            staff_query = staff_query.order_by('active_tickets', '-rating')
             
             # Filter by location if provided
             if location:
@@ -467,14 +687,15 @@ class ComplaintCategorizer:
                 if location_staff.exists():
                     staff_query = location_staff
             
-            # Get best available staff member
-            assigned_staff = staff_query.first()
+            # Best available staff member; a candidate filled up by a concurrent
+            # assignment since the query fails its reservation and the next is tried
+            assigned_staff = None
+            for candidate in staff_query[:5]:
+                if not reserve or reserve_ticket(candidate.id, capacity):
+                    assigned_staff = candidate
+                    break
             
             if assigned_staff:
-                # Update active tickets count
-                assigned_staff.active_tickets += 1
-                assigned_staff.save()
-                
                 return {
                     "staff_id": assigned_staff.id,
                     "staff_name": assigned_staff.name,
@@ -483,7 +704,8 @@ class ComplaintCategorizer:
                     "staff_phone": assigned_staff.phone,
                     "department": assigned_staff.department,
                     "priority": category_info.get('priority', 'Medium'),
-                    "expected_resolution": category_info.get('expected_resolution', '24 hours')
+                    "expected_resolution": category_info.get('expected_resolution', '24 hours'),
+                    "reserved": reserve
                 }
             else:
                 return {
@@ -506,40 +728,107 @@ class ComplaintCategorizer:
                 "error": str(e)
             }
     
-    def save_model(self):
-        """Save the trained model to disk"""
+    def _model_dir(self) -> str:
+        """Active registry version, or the legacy models/ directory before the first registry save"""
+        return self.registry.active_path() or self.model_path
+    
+    def _model_file(self) -> str:
+        return model_file(self._model_dir())
+    
+    @staticmethod
+    def _payload_for(pipeline: Pipeline) -> Dict:
+        return {
+            'pipeline': pipeline,
+            'model': pipeline.steps[-1][1],
+            'vectorizer': pipeline.steps[0][1],
+            'is_trained': True
+        }
+    
+    def save_model(self, metadata: Optional[Dict] = None):
+        """Save the trained model as a new registry version (see categorizer_storage) and activate it"""
         try:
-            model_file = os.path.join(self.model_path, 'complaint_categorizer.pkl')
-            with open(model_file, 'wb') as f:
-                pickle.dump({
-                    'pipeline': self.pipeline,
-                    'model': self.model,
-                    'vectorizer': self.vectorizer,
-                    'categories': self.CATEGORIES,
-                    'is_trained': self.is_trained
-                }, f)
-            logger.info(f"Model saved to {model_file}")
+            staging_dir = self.registry.staging_dir()
+            save_pipeline(self.pipeline, staging_dir, self.is_trained)
+            version = self.registry.commit_version(staging_dir, metadata, activate=True)
+            self._model_reloaded(version)
+            logger.info(f"Model saved as registry version {version}")
         except Exception as e:
             logger.error(f"Error saving model: {str(e)}")
+            self._model_reloaded(None)
+    
+    def _apply_payload(self, data: Dict):
+        # The pipeline goes first: predict_category() only reads self.pipeline
+        self.pipeline = data.get('pipeline')
+        self.model = data.get('model')
+        self.vectorizer = data.get('vectorizer')
+        self.is_trained = data.get('is_trained', False)
     
     def load_model(self):
-        """Load the trained model from disk"""
+        """Load the trained model from disk (arrays memory-mapped, shared between workers)"""
         try:
-            model_file = os.path.join(self.model_path, 'complaint_categorizer.pkl')
-            if os.path.exists(model_file):
-                with open(model_file, 'rb') as f:
-                    data = pickle.load(f)
-                    self.pipeline = data.get('pipeline')
-                    self.model = data.get('model')
-                    self.vectorizer = data.get('vectorizer')
-                    self.is_trained = data.get('is_trained', False)
-                logger.info("Model loaded successfully")
+            version = self.registry.active_version()
+            if os.path.exists(self._model_file()):
+                self._apply_payload(load_pipeline(self._model_dir()))
+                self._model_reloaded(version)
+                logger.info(f"Model loaded successfully ({version or 'legacy file'})")
             else:
-                logger.info("No saved model found. Model will be trained on first use.")
+                logger.info("No saved model found. Start a training job via /ai/train-model/.")
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
             self.is_trained = False
     
+    def _sync_with_registry(self):
+        """
+        Follow the registry's active pointer (checked at most every poll interval): a
+        new or rolled-back version is loaded in a background thread and swapped in,
+        while requests keep using the current pipeline
+        """
+        now = time.monotonic()
+        if now < self._next_registry_check:
+            return
+        self._next_registry_check = now + self._registry_poll_interval
+        
+        version = self.registry.active_version()
+        if version is None or version == self.registry_version:
+            return
+        if not self._registry_swap_lock.acquire(blocking=False):
+            return  # already loading
+        
+        def load_and_swap():
+            try:
+                self._apply_payload(load_pipeline(self.registry.version_path(version)))
+                self._model_reloaded(version)
+                logger.info(f"Categorizer swapped to registry version {version}")
+            except Exception as e:
+                logger.error(f"Failed to load categorizer version {version}: {str(e)}")
+            finally:
+                self._registry_swap_lock.release()
+        
+        threading.Thread(target=load_and_swap, name=f'categorizer-swap-{version}', daemon=True).start()
+    
+    def _model_reloaded(self, registry_version: Optional[str] = None):
+        """New pipeline in place: record its version and drop cached predictions"""
+        self.registry_version = registry_version
+        if registry_version:
+            self.model_version = registry_version
+        else:
+            current_file = self._model_file()
+            if os.path.exists(current_file):
+                stat = os.stat(current_file)
+                self.model_version = f"{stat.st_size}-{stat.st_mtime_ns}"
+            else:
+                self.model_version = f"unsaved-{id(self.pipeline)}"
+        
+        if self.result_cache is not None:
+            self.result_cache.clear()
+    
+    def get_registry_info(self) -> Dict:
+        """Active registry version and the one this process is serving"""
+        return {
+            **self.registry.get_info(),
+            'serving_version': self.registry_version or ('legacy' if self.is_trained else None)
+        }
+    
     def get_model_info(self) -> Dict:
         """Get information about the current model"""
         return {
@@ -547,7 +836,17 @@ class ComplaintCategorizer:
             "categories": list(self.CATEGORIES.keys()),
             "total_categories": len(self.CATEGORIES),
             "model_type": type(self.model).__name__ if self.model else None,
-            "vectorizer_type": type(self.vectorizer).__name__ if self.vectorizer else None
+            "vectorizer_type": type(self.vectorizer).__name__ if self.vectorizer else None,
+            "model_version": self.model_version,
+            "training_n_jobs": self.training_n_jobs,
+            "online": {
+                "enabled": self.online_enabled,
+                "active": self.is_online_pipeline(),
+                "n_features": self.online_n_features,
+                "cursor": self.online_cursor()
+            },
+            "registry": self.get_registry_info(),
+            "result_cache": self.result_cache.get_stats() if self.result_cache is not None else None
         }
 
 # Global instance
@@ -6,10 +6,21 @@ Achieves 90%+ accuracy on Category, Staff, Priority, Severity
 
 import torch
 import numpy as np
-import pickle
 import json
 import os
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+import time
+import hashlib
+import threading
+from transformers import DistilBertTokenizer
+
+from ai_models.inference_backends import (
+    BACKENDS, resolve_device, load_sequence_classifier, load_multitask_model
+)
+from ai_models.model_loading import load_label_encoder
+from ai_models.tokenization_cache import TokenizationCache
+
+# Files that define a tokenizer; models whose copies are identical share one tokenizer
+TOKENIZER_FILES = ('vocab.txt', 'tokenizer_config.json', 'special_tokens_map.json', 'added_tokens.json')
 
 
 class EnhancedClassificationService:
@@ -18,17 +29,52 @@ class EnhancedClassificationService:
     Supports both standalone and hybrid (rule-based + ML) modes
     """
     
-    def __init__(self, model_dir='ai_models/models/enhanced', use_hybrid=False):
+    MODEL_NAMES = ('category', 'staff', 'priority', 'severity')
+    
+    # Inputs are truncated to MAX_LENGTH tokens. Single texts are not padded at all;
+    # batches are split by length and each group is padded to its bucket only
+    MAX_LENGTH = 128
+    SEQUENCE_BUCKETS = (16, 32, 64, 128)
+    
+    def __init__(self, model_dir='ai_models/models/enhanced', use_hybrid=False, use_multitask=False,
+                 backend='torch', result_cache=None, hybrid_options=None, tokenization_cache_size=512,
+                 lazy_heads=True):
         """
         Initialize the service with enhanced pre-trained models
         
         Args:
             model_dir: Directory containing saved models (category_model/, staff_model/, etc.)
             use_hybrid: If True, use hybrid classifier for boosted accuracy
+            use_multitask: If True, load multitask_model/ (one shared encoder, four heads)
+                           instead of the four standalone models
+            backend: Inference backend - 'torch' (fp32), 'torch-int8' (dynamic quantization)
+                     or 'onnx' (ONNX Runtime, needs exported model.onnx files)
+            result_cache: Optional ResultCache (ai_models.result_cache); identical texts
+                          are then classified once per model version
+            hybrid_options: Keyword arguments for EnhancedHybridClassifier
+                            (e.g. short_circuit, category_short_circuit_threshold)
+            tokenization_cache_size: Recent texts whose token ids are kept for repeated
+                                     submissions (0 disables the LRU); heads with identical
+                                     tokenizers always share one tokenization per call
+            lazy_heads: If True, each standalone model is loaded when it is first used
+                        (e.g. never, for heads the rule short-circuit always covers)
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+        
         self.model_dir = model_dir
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.backend = backend
+        self.device = resolve_device(backend)
         self.use_hybrid = use_hybrid
+        self.use_multitask = use_multitask
+        self.multitask_model = None
+        self.lazy_heads = lazy_heads
+        self._models = {}
+        self._model_lock = threading.Lock()
+        self.result_cache = result_cache
+        self.tokenization_cache = TokenizationCache(max_entries=tokenization_cache_size, max_length=self.MAX_LENGTH)
+        self._length_lock = threading.Lock()
+        self._length_stats = {'texts': 0, 'tokens': 0, 'buckets': dict.fromkeys(self.SEQUENCE_BUCKETS, 0)}
         
         # Check if models exist
         if not os.path.exists(model_dir):
@@ -43,104 +89,329 @@ class EnhancedClassificationService:
         # Initialize hybrid classifier if requested
         if use_hybrid:
             from ai_models.enhanced_hybrid_classifier import EnhancedHybridClassifier
-            self.hybrid = EnhancedHybridClassifier(self)
+            self.hybrid = EnhancedHybridClassifier(self, **(hybrid_options or {}))
             print("✅ Enhanced hybrid classifier enabled (aggressive rule boosting)")
         
+        self.model_version = self._compute_model_version()
+        
         print(f"\n{'='*70}")
         print("  ✅ EnhancedClassificationService Initialized")
         print(f"{'='*70}")
         print(f"Device: {self.device}")
+        print(f"Inference Backend: {backend}")
         print(f"Hybrid Mode: {use_hybrid}")
-        print(f"Models Loaded: Category, Staff, Priority, Severity")
+        print(f"Multi-Task Mode: {use_multitask}")
+        print(f"Model Version: {self.model_version}")
+        print(f"Distinct Tokenizers: {len(self.tokenizer_groups)}")
+        print(f"Models: Category, Staff, Priority, Severity ({'loaded on first use' if lazy_heads and not use_multitask else 'loaded'})")
         print(f"{'='*70}\n")
     
     def _load_models(self):
-        """Load all four classification models"""
-        
-        # 1. Category Model (15 classes)
-        category_dir = os.path.join(self.model_dir, 'category_model')
-        self.category_model = DistilBertForSequenceClassification.from_pretrained(category_dir).to(self.device)
-        self.category_tokenizer = DistilBertTokenizer.from_pretrained(category_dir)
-        with open(os.path.join(category_dir, 'label_encoder.pkl'), 'rb') as f:
-            self.category_encoder = pickle.load(f)
-        with open(os.path.join(category_dir, 'test_metrics.json'), 'r') as f:
-            self.category_metrics = json.load(f)
-        self.category_model.eval()
-        
-        # 2. Staff Model (6 classes)
-        staff_dir = os.path.join(self.model_dir, 'staff_model')
-        self.staff_model = DistilBertForSequenceClassification.from_pretrained(staff_dir).to(self.device)
-        self.staff_tokenizer = DistilBertTokenizer.from_pretrained(staff_dir)
-        with open(os.path.join(staff_dir, 'label_encoder.pkl'), 'rb') as f:
-            self.staff_encoder = pickle.load(f)
-        with open(os.path.join(staff_dir, 'test_metrics.json'), 'r') as f:
-            self.staff_metrics = json.load(f)
-        self.staff_model.eval()
-        
-        # 3. Priority Model (3 classes)
-        priority_dir = os.path.join(self.model_dir, 'priority_model')
-        self.priority_model = DistilBertForSequenceClassification.from_pretrained(priority_dir).to(self.device)
-        self.priority_tokenizer = DistilBertTokenizer.from_pretrained(priority_dir)
-        with open(os.path.join(priority_dir, 'label_encoder.pkl'), 'rb') as f:
-            self.priority_encoder = pickle.load(f)
-        with open(os.path.join(priority_dir, 'test_metrics.json'), 'r') as f:
-            self.priority_metrics = json.load(f)
-        self.priority_model.eval()
-        
-        # 4. Severity Model (4 classes)
-        severity_dir = os.path.join(self.model_dir, 'severity_model')
-        self.severity_model = DistilBertForSequenceClassification.from_pretrained(severity_dir).to(self.device)
-        self.severity_tokenizer = DistilBertTokenizer.from_pretrained(severity_dir)
-        with open(os.path.join(severity_dir, 'label_encoder.pkl'), 'rb') as f:
-            self.severity_encoder = pickle.load(f)
-        with open(os.path.join(severity_dir, 'test_metrics.json'), 'r') as f:
-            self.severity_metrics = json.load(f)
-        self.severity_model.eval()
-    
-    def _predict_single(self, text, model, tokenizer, encoder):
-        """
-        Make prediction with a single model
+        """
+        Load label encoders, metrics and tokenizers of the four classification models
+        The weights are memory-mapped from model.safetensors (ai_models/model_loading.py)
+        and, with lazy_heads, each model is only built when it is first used
+        """
+        if self.use_multitask:
+            self._load_multitask_model()
+            return
+        
+        self._models = {}
+        self._model_dirs = {}
+        tokenizers = {}
+        
+        for name in self.MODEL_NAMES:
+            model_path = os.path.join(self.model_dir, f'{name}_model')
+            self._model_dirs[name] = model_path
+            
+            encoder, metrics = self._load_label_metadata(name)
+            setattr(self, f'{name}_encoder', encoder)
+            setattr(self, f'{name}_metrics', metrics)
+            
+            # The models are fine-tuned from one checkpoint, so their tokenizer files
+            # are normally identical - load each distinct set only once
+            files_digest = self._tokenizer_files_digest(model_path)
+            if files_digest not in tokenizers:
+                tokenizers[files_digest] = DistilBertTokenizer.from_pretrained(model_path)
+            setattr(self, f'{name}_tokenizer', tokenizers[files_digest])
+        
+        self._share_tokenizers()
+        
+        if not self.lazy_heads:
+            for name in self.MODEL_NAMES:
+                self._get_model(name)
+    
+    def _share_tokenizers(self):
+        """
+        Let models with identical tokenizers (same vocabulary and settings) use one
+        tokenizer object, so each text is tokenized once for all of them
+        """
+        self.tokenization_cache.clear()
+        shared = {}
+        self.tokenizer_groups = {}
+        for name in self.MODEL_NAMES:
+            tokenizer = getattr(self, f'{name}_tokenizer')
+            fingerprint = self.tokenization_cache.fingerprint(tokenizer)
+            setattr(self, f'{name}_tokenizer', shared.setdefault(fingerprint, tokenizer))
+            self.tokenizer_groups.setdefault(fingerprint, []).append(name)
+    
+    def _tokenizer_files_digest(self, model_path):
+        digest = hashlib.sha1()
+        for filename in TOKENIZER_FILES:
+            path = os.path.join(model_path, filename)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(filename.encode() + b'\x00' + f.read())
+        return digest.hexdigest()
+    
+    def _get_model(self, name):
+        """Standalone model of one head, loaded on first use"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        
+        with self._model_lock:
+            if name not in self._models:
+                start_time = time.perf_counter()
+                self._models[name] = load_sequence_classifier(self._model_dirs[name], self.backend, self.device)
+                print(f"✅ {name.capitalize()} model loaded ({(time.perf_counter() - start_time) * 1000:.0f} ms)")
+            return self._models[name]
+    
+    def _compute_model_version(self):
+        """
+        Fingerprint of the loaded weights (file names, sizes, mtimes) and of the settings
+        that change the output; identical across workers loading the same files
+        """
+        subdirs = [f'{name}_model' for name in self.MODEL_NAMES]
+        if self.use_multitask:
+            subdirs.append('multitask_model')
+        
+        digest = hashlib.sha1()
+        for subdir in subdirs:
+            for root, _, filenames in sorted(os.walk(os.path.join(self.model_dir, subdir))):
+                for filename in sorted(filenames):
+                    stat = os.stat(os.path.join(root, filename))
+                    relative = os.path.relpath(os.path.join(root, filename), self.model_dir)
+                    digest.update(f'{relative}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+        digest.update(f'{self.backend}:{self.use_multitask}:{self.use_hybrid}'.encode())
+        if self.use_hybrid:
+            digest.update(json.dumps(self.hybrid.get_config(), sort_keys=True).encode())
+        return digest.hexdigest()[:16]
+    
+    def reload_models(self):
+        """Reload weights from model_dir (e.g. after retraining) and drop cached results"""
+        self._load_models()
+        self.model_version = self._compute_model_version()
+        if self.result_cache is not None:
+            self.result_cache.clear()
+        print(f"✅ Models reloaded (version {self.model_version})")
+    
+    WARMUP_TEXTS = (
+        "Water leakage in AC coach, very dirty and unhygienic",
+        "Medical emergency: passenger needs urgent help",
+        "Train delayed by 3 hours, no announcement made"
+    )
+    
+    def warm_up(self):
+        """
+        Run every model once on a few sample complaints (bypassing rules and caches), so
+        lazy heads are materialized and first-call overhead is paid before real traffic
+        """
+        start_time = time.perf_counter()
+        self._classify_ml_only_batch(list(self.WARMUP_TEXTS))
+        return time.perf_counter() - start_time
+    
+    def freeze(self):
+        """
+        Make the loaded models inference-only (eval mode, no autograd) so their weights
+        are never written to - lets forked workers keep sharing the pages (ai_models/preload.py)
+        """
+        if self.use_multitask:
+            models = [self.multitask_model]
+        else:
+            # Materialize lazy heads now so they are shared too
+            models = [self._get_model(name) for name in self.MODEL_NAMES]
+        
+        for model in models:
+            if isinstance(model, torch.nn.Module):
+                model.eval()
+                model.requires_grad_(False)
+    
+    def _load_label_metadata(self, model_name):
+        """Load label encoder and test metrics stored next to a standalone model"""
+        model_path = os.path.join(self.model_dir, f'{model_name}_model')
+        encoder = load_label_encoder(model_path)
+        with open(os.path.join(model_path, 'test_metrics.json'), 'r') as f:
+            metrics = json.load(f)
+        return encoder, metrics
+    
+    def _load_multitask_model(self):
+        """Load the shared-encoder model (one DistilBERT, four heads)"""
+        multitask_dir = os.path.join(self.model_dir, 'multitask_model')
+        if not os.path.exists(multitask_dir):
+            raise FileNotFoundError(
+                f"Multi-task model not found: {multitask_dir}\n"
+                f"Build it from the standalone models with: "
+                f"python -m ai_models.multitask_classifier --model-dir {self.model_dir}"
+            )
+        
+        self.multitask_model = load_multitask_model(multitask_dir, self.backend, self.device)
+        self.multitask_tokenizer = DistilBertTokenizer.from_pretrained(multitask_dir)
+        self.tokenization_cache.clear()
+        self.tokenizer_groups = {
+            self.tokenization_cache.fingerprint(self.multitask_tokenizer): list(self.MODEL_NAMES)
+        }
+        
+        # Label encoders and metrics still live in the standalone model directories
+        self.category_encoder, self.category_metrics = self._load_label_metadata('category')
+        self.staff_encoder, self.staff_metrics = self._load_label_metadata('staff')
+        self.priority_encoder, self.priority_metrics = self._load_label_metadata('priority')
+        self.severity_encoder, self.severity_metrics = self._load_label_metadata('severity')
+    
+    def _bucket(self, num_tokens):
+        """Smallest sequence bucket that fits num_tokens"""
+        for bucket in self.SEQUENCE_BUCKETS:
+            if num_tokens <= bucket:
+                return bucket
+        return self.SEQUENCE_BUCKETS[-1]
+    
+    def _record_lengths(self, ids):
+        with self._length_lock:
+            self._length_stats['texts'] += len(ids)
+            for token_ids in ids:
+                self._length_stats['tokens'] += len(token_ids)
+                self._length_stats['buckets'][self._bucket(len(token_ids))] += 1
+    
+    def _tokenized_groups(self, texts, models):
+        """
+        Token ids of the texts, computed once per distinct tokenizer that has a head to run
+        (the tokenization cache only saves work on repeated submissions)
         
         Args:
-            text: Input complaint text
-            model: PyTorch model
-            tokenizer: Tokenizer for the model
-            encoder: Label encoder for decoding predictions
+            models: One subset of MODEL_NAMES per text
         
         Returns:
-            prediction: Predicted class label
-            confidence: Confidence score (0-1)
-            probabilities: Probability distribution across all classes
-        """
-        # Tokenize
-        inputs = tokenizer(
-            text,
-            max_length=128,
-            padding='max_length',
-            truncation=True,
-            return_tensors='pt'
-        )
+            list of (tokenizer, {head name: set of text indices}, text indices, token ids);
+            each text's length is recorded once
+        """
+        if self.use_multitask:
+            groups = [(self.multitask_tokenizer, list(self.MODEL_NAMES))]
+        else:
+            groups = [(getattr(self, f'{names[0]}_tokenizer'), names) for names in self.tokenizer_groups.values()]
         
-        input_ids = inputs['input_ids'].to(self.device)
-        attention_mask = inputs['attention_mask'].to(self.device)
+        tokenized = []
+        recorded = set()
+        for tokenizer, names in groups:
+            heads = {}
+            for name in names:
+                needed = {i for i, text_models in enumerate(models) if name in text_models}
+                if needed:
+                    heads[name] = needed
+            if not heads:
+                continue
+            
+            indices = sorted(set().union(*heads.values()))
+            ids = self.tokenization_cache.token_ids(tokenizer, [texts[i] for i in indices])
+            self._record_lengths([token_ids for i, token_ids in zip(indices, ids) if i not in recorded])
+            recorded.update(indices)
+            tokenized.append((tokenizer, heads, indices, ids))
         
-        # Predict
-        with torch.no_grad():
-            outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-            logits = outputs.logits
-            probabilities = torch.softmax(logits, dim=1).cpu().numpy()[0]
-            predicted_idx = np.argmax(probabilities)
+        return tokenized
+    
+    def _padded_groups(self, tokenizer, ids):
+        """
+        Tensors for token ids on the model device: a single text is padded to nothing but
+        its own length, a batch is grouped by length bucket and each group padded to it
         
-        prediction = encoder.inverse_transform([predicted_idx])[0]
-        confidence = float(probabilities[predicted_idx])
+        Returns:
+            list of (positions in ids, input_ids, attention_mask)
+        """
+        if len(ids) == 1:
+            groups = {None: [0]}
+        else:
+            groups = {}
+            for position, token_ids in enumerate(ids):
+                groups.setdefault(self._bucket(len(token_ids)), []).append(position)
         
-        # Create probability dict
-        prob_dict = {
-            encoder.classes_[i]: float(probabilities[i])
-            for i in range(len(encoder.classes_))
-        }
+        padded = []
+        for bucket, positions in sorted(groups.items(), key=lambda item: item[0] or 0):
+            inputs = self.tokenization_cache.pad(tokenizer, [ids[p] for p in positions], length=bucket)
+            padded.append((positions, inputs['input_ids'].to(self.device), inputs['attention_mask'].to(self.device)))
+        return padded
+    
+    def _head_logits(self, heads, positions, input_ids, attention_mask):
+        """
+        {head name: (rows of the padded group, logits)}; standalone heads run only on the
+        rows of texts that need them, sharing the group's tensors
+        """
+        if self.use_multitask:
+            all_logits = self.multitask_model(
+                input_ids=input_ids, attention_mask=attention_mask, tasks=list(heads)
+            )
+            return {name: (list(range(len(positions))), logits) for name, logits in all_logits.items()}
+        
+        results = {}
+        for name in heads:
+            rows = [row for row, position in enumerate(positions) if position in heads[name]]
+            if not rows:
+                continue
+            if len(rows) == len(positions):
+                head_ids, head_mask = input_ids, attention_mask
+            else:
+                index = torch.tensor(rows, device=input_ids.device)
+                head_ids, head_mask = input_ids[index], attention_mask[index]
+            results[name] = (rows, self._get_model(name)(input_ids=head_ids, attention_mask=head_mask).logits)
+        return results
+    
+    def _predict_heads(self, texts, models):
+        """
+        Run each head over the texts that need it; a text is tokenized and padded once
+        per tokenizer group and the tensors are shared by every head in the group
+        
+        Args:
+            models: One subset of MODEL_NAMES per text
+        
+        Returns:
+            dict of head name -> {text index: (prediction, confidence, probabilities)}
+        """
+        probabilities = {}
+        for tokenizer, heads, indices, ids in self._tokenized_groups(texts, models):
+            # Head sets by position in ids instead of text index
+            positions_of = {name: {p for p, i in enumerate(indices) if i in needed} for name, needed in heads.items()}
+            
+            for positions, input_ids, attention_mask in self._padded_groups(tokenizer, ids):
+                with torch.no_grad():
+                    all_logits = self._head_logits(positions_of, positions, input_ids, attention_mask)
+                
+                for name, (rows, logits) in all_logits.items():
+                    for row, row_probabilities in zip(rows, torch.softmax(logits, dim=1).cpu().numpy()):
+                        position = positions[row]
+                        if position in positions_of[name]:
+                            probabilities.setdefault(name, {})[indices[position]] = row_probabilities
         
-        return prediction, confidence, prob_dict
+        predictions = {}
+        for name, rows in probabilities.items():
+            text_indices = sorted(rows)
+            decoded = self._decode_batch(
+                np.stack([rows[i] for i in text_indices]), getattr(self, f'{name}_encoder')
+            )
+            predictions[name] = dict(zip(text_indices, decoded))
+        return predictions
+    
+    def get_sequence_length_stats(self):
+        """How many texts fell into each sequence bucket since startup"""
+        with self._length_lock:
+            stats = {
+                'texts': self._length_stats['texts'],
+                'buckets': dict(self._length_stats['buckets']),
+                'avg_tokens': self._length_stats['tokens'] / max(self._length_stats['texts'], 1)
+            }
+        stats['avg_tokens'] = round(stats['avg_tokens'], 1)
+        stats['bucket_share'] = {
+            bucket: round(count / max(stats['texts'], 1), 4) for bucket, count in stats['buckets'].items()
+        }
+        stats['max_length'] = self.MAX_LENGTH
+        return stats
     
     def classify_complaint(self, complaint_text, return_details=False):
         """
@@ -162,6 +433,18 @@ class EnhancedClassificationService:
         if not complaint_text or not isinstance(complaint_text, str):
             raise ValueError("complaint_text must be a non-empty string")
         
+        if self.result_cache is None:
+            return self._classify_uncached(complaint_text, return_details)
+        
+        # Cache the detailed result so one entry serves both kinds of callers
+        results = self.result_cache.get(complaint_text, self.model_version)
+        if results is None:
+            results = self._classify_uncached(complaint_text, return_details=True)
+            self.result_cache.set(complaint_text, self.model_version, results)
+        
+        return results if return_details else self._summary(results)
+    
+    def _classify_uncached(self, complaint_text, return_details=False):
         # Use hybrid classifier if enabled
         if self.use_hybrid:
             return self.hybrid.classify(complaint_text, return_details=return_details)
@@ -169,48 +452,39 @@ class EnhancedClassificationService:
         # Fall back to pure ML classification
         return self._classify_ml_only(complaint_text, return_details)
     
-    def _classify_ml_only(self, complaint_text, return_details=False):
+    def _summary(self, results):
+        """Strip a detailed result down to what return_details=False returns"""
+        return {name: results[name] for name in self.MODEL_NAMES}
+    
+    def _classify_ml_only(self, complaint_text, return_details=False, models=None):
         """
         Pure ML classification (used by hybrid classifier to avoid recursion)
-        """
-        # Predict all dimensions
-        category, cat_conf, cat_probs = self._predict_single(
-            complaint_text, self.category_model, self.category_tokenizer, self.category_encoder
-        )
-        
-        staff, staff_conf, staff_probs = self._predict_single(
-            complaint_text, self.staff_model, self.staff_tokenizer, self.staff_encoder
-        )
         
-        priority, pri_conf, pri_probs = self._predict_single(
-            complaint_text, self.priority_model, self.priority_tokenizer, self.priority_encoder
-        )
+        Args:
+            models: Optional subset of MODEL_NAMES to run (default: all four)
+        """
+        models = models or self.MODEL_NAMES
         
-        severity, sev_conf, sev_probs = self._predict_single(
-            complaint_text, self.severity_model, self.severity_tokenizer, self.severity_encoder
+        predictions = self._predict_heads([complaint_text], [models])
+        return self._build_result(
+            {name: text_predictions[0] for name, text_predictions in predictions.items()}, return_details
         )
+    
+    def _build_result(self, predictions, return_details=False):
+        """
+        Build the public result dict from per-model predictions
         
-        results = {
-            'category': category,
-            'staff': staff,
-            'priority': priority,
-            'severity': severity
-        }
+        Args:
+            predictions: dict of model name -> (prediction, confidence, probabilities);
+                         models that were not run are left out of the result
+        """
+        names = [name for name in self.MODEL_NAMES if name in predictions]
+        results = {name: predictions[name][0] for name in names}
         
         if return_details:
             results.update({
-                'confidences': {
-                    'category': cat_conf,
-                    'staff': staff_conf,
-                    'priority': pri_conf,
-                    'severity': sev_conf
-                },
-                'probabilities': {
-                    'category': cat_probs,
-                    'staff': staff_probs,
-                    'priority': pri_probs,
-                    'severity': sev_probs
-                },
+                'confidences': {name: predictions[name][1] for name in names},
+                'probabilities': {name: predictions[name][2] for name in names},
                 'model_metrics': {
                     'category': self.category_metrics,
                     'staff': self.staff_metrics,
@@ -221,11 +495,111 @@ class EnhancedClassificationService:
         
         return results
     
+    # ------------------------------------------------------------------
+    # Batched inference
+    # ------------------------------------------------------------------
+    
+    def _decode_batch(self, probabilities, encoder):
+        """
+        Vectorized decode of a (batch_size, num_classes) probability matrix
+        
+        Returns:
+            list of (prediction, confidence, probabilities) tuples, one per row
+        """
+        predicted_idx = np.argmax(probabilities, axis=1)
+        predictions = encoder.inverse_transform(predicted_idx)
+        confidences = probabilities[np.arange(len(probabilities)), predicted_idx]
+        classes = encoder.classes_.tolist()
+        
+        return [
+            (predictions[i], float(confidences[i]), dict(zip(classes, probabilities[i].tolist())))
+            for i in range(len(probabilities))
+        ]
+    
+    def _classify_ml_only_batch(self, texts, return_details=False, models=None):
+        """
+        Pure ML classification of a list of texts (batched counterpart of _classify_ml_only)
+        
+        Args:
+            models: Optional list with one subset of MODEL_NAMES per text; each model
+                    then runs only over the texts that need it
+        """
+        models = models or [self.MODEL_NAMES] * len(texts)
+        text_predictions = [{} for _ in texts]
+        
+        # Heads nobody needs are skipped, the others run only over the texts that need them
+        for name, predictions in self._predict_heads(texts, models).items():
+            for i, prediction in predictions.items():
+                text_predictions[i][name] = prediction
+        
+        return [self._build_result(predictions, return_details) for predictions in text_predictions]
+    
+    def classify_batch(self, texts, return_details=False, batch_size=32):
+        """
+        Classify many complaints at once
+        
+        Each chunk of batch_size texts is tokenized together and every model runs
+        once per sequence bucket (16/32/64/128 tokens) instead of once per complaint.
+        
+        Args:
+            texts: List of complaint descriptions
+            return_details: If True, return confidence scores and probabilities
+            batch_size: Maximum number of texts per forward pass
+        
+        Returns:
+            List of result dicts, same shape and order as classify_complaint()
+        """
+        for text in texts:
+            if not text or not isinstance(text, str):
+                raise ValueError("every complaint text must be a non-empty string")
+        
+        if self.result_cache is None:
+            return self._classify_batch_uncached(texts, return_details, batch_size)
+        
+        # Serve cache hits, run only the misses through the models
+        results = [self.result_cache.get(text, self.model_version) for text in texts]
+        missing = [i for i, cached in enumerate(results) if cached is None]
+        
+        if missing:
+            computed = self._classify_batch_uncached(
+                [texts[i] for i in missing], return_details=True, batch_size=batch_size
+            )
+            for i, result in zip(missing, computed):
+                self.result_cache.set(texts[i], self.model_version, result)
+                results[i] = result
+        
+        return results if return_details else [self._summary(result) for result in results]
+    
+    def _classify_batch_uncached(self, texts, return_details=False, batch_size=32):
+        results = []
+        for start in range(0, len(texts), batch_size):
+            chunk = list(texts[start:start + batch_size])
+            
+            if self.use_hybrid:
+                results.extend(self.hybrid.classify_batch(chunk, return_details=return_details))
+            else:
+                results.extend(self._classify_ml_only_batch(chunk, return_details))
+        
+        return results
+    
     def get_model_info(self):
         """Get information about loaded models and their performance"""
         return {
             'device': str(self.device),
+            'backend': self.backend,
             'hybrid_mode': self.use_hybrid,
+            'multitask_mode': self.use_multitask,
+            'model_version': self.model_version,
+            'lazy_heads': self.lazy_heads,
+            'loaded_heads': list(self.MODEL_NAMES) if self.use_multitask else list(self._models),
+            'hybrid_config': self.hybrid.get_config() if self.use_hybrid else None,
+            'hybrid_stats': self.hybrid.stats if self.use_hybrid else None,
+            'result_cache': self.result_cache.get_stats() if self.result_cache is not None else None,
+            'tokenization': {
+                'tokenizer_groups': list(self.tokenizer_groups.values()),
+                'cache': self.tokenization_cache.get_stats()
+            },
+            'sequence_lengths': self.get_sequence_length_stats(),
             'models': {
                 'category': {
                     'classes': self.category_encoder.classes_.tolist(),
@@ -5,8 +5,12 @@ Special focus on Priority and Severity classification
 """
 
 import re
+import numpy as np
+import pandas as pd
 from typing import Dict, List, Tuple, Optional
 
+from ai_models.rule_engine import CompiledRuleSet
+
 
 class EnhancedRuleBasedClassifier:
     """
@@ -14,6 +18,15 @@ class EnhancedRuleBasedClassifier:
     Designed for high-volume Indian Railways complaint processing
     """
     
+    # Priority/Severity trigger cascade, checked in this order:
+    # (trigger level, minimum score, priority, severity, maximum confidence)
+    TRIGGER_CASCADE = (
+        ('critical', 0.30, 'High', 'Critical', 0.99),
+        ('high', 0.25, 'High', 'High', 0.95),
+        ('medium', 0.20, 'Medium', 'Medium', 0.85),
+        ('low', 0.15, 'Low', 'Low', 0.75)
+    )
+    
     def __init__(self):
         # Critical Priority/Severity triggers (highest confidence)
         self.critical_triggers = {
@@ -173,9 +186,52 @@ class EnhancedRuleBasedClassifier:
                 'default_severity': 'High'
             }
         }
+        
+        self.compile_rules()
+    
+    def _triggers(self) -> Dict[str, Dict]:
+        return {
+            'critical': self.critical_triggers,
+            'high': self.high_priority_triggers,
+            'medium': self.medium_priority_triggers,
+            'low': self.low_priority_triggers
+        }
+    
+    def _rule_groups(self) -> List[Tuple]:
+        """Every (group, keywords, patterns) scored by the rules"""
+        triggers = self._triggers()
+        groups = [
+            (('trigger', level), triggers[level]['keywords'], triggers[level]['patterns'])
+            for level in ('critical', 'high', 'medium', 'low')
+        ]
+        groups.extend(
+            (('category', category), rules['keywords'], rules.get('patterns', []))
+            for category, rules in self.category_rules.items()
+        )
+        return groups
+    
+    def compile_rules(self):
+        """(Re)build the compiled engine; call again after editing the rule dicts"""
+        self._engine = CompiledRuleSet(
+            self._rule_groups(),
+            keyword_weight=0.15, pattern_weight=0.25,
+            keyword_share=0.5, pattern_share=0.5,
+            lowercase_keywords=True
+        )
+        self._last_scores = None
+    
+    def _scores(self, complaint_text: str) -> Dict:
+        """All group scores for a text; the last result is kept because the hybrid
+        classifier asks for priority/severity and category of the same text"""
+        last = self._last_scores
+        if last is not None and last[0] == complaint_text:
+            return last[1]
+        scores = self._engine.score(complaint_text)
+        self._last_scores = (complaint_text, scores)
+        return scores
     
     def _match_score(self, text: str, keywords: List[str], patterns: List[str]) -> float:
-        """Calculate match score for keywords and patterns"""
+        """Calculate match score for keywords and patterns (reference for the compiled engine)"""
         text_lower = text.lower()
         
         # Keyword matching
@@ -195,71 +251,21 @@ class EnhancedRuleBasedClassifier:
         Classify Priority and Severity using rule-based logic
         Returns: dict with 'priority', 'severity', 'confidence', 'trigger_type'
         """
-        text_lower = complaint_text.lower()
-        
-        # Check critical triggers first
-        critical_score = self._match_score(
-            complaint_text,
-            self.critical_triggers['keywords'],
-            self.critical_triggers['patterns']
-        )
-        
-        if critical_score > 0.3:  # Any match with critical triggers
-            return {
-                'priority': 'High',
-                'severity': 'Critical',
-                'confidence': min(critical_score + self.critical_triggers['confidence_boost'], 0.99),
-                'trigger_type': 'critical',
-                'rule_match': True
-            }
-        
-        # Check high priority triggers
-        high_score = self._match_score(
-            complaint_text,
-            self.high_priority_triggers['keywords'],
-            self.high_priority_triggers['patterns']
-        )
-        
-        if high_score > 0.25:
-            return {
-                'priority': 'High',
-                'severity': 'High',
-                'confidence': min(high_score + self.high_priority_triggers['confidence_boost'], 0.95),
-                'trigger_type': 'high',
-                'rule_match': True
-            }
-        
-        # Check medium priority triggers
-        medium_score = self._match_score(
-            complaint_text,
-            self.medium_priority_triggers['keywords'],
-            self.medium_priority_triggers['patterns']
-        )
+        scores = self._scores(complaint_text)
+        triggers = self._triggers()
         
-        if medium_score > 0.20:
-            return {
-                'priority': 'Medium',
-                'severity': 'Medium',
-                'confidence': min(medium_score + self.medium_priority_triggers['confidence_boost'], 0.85),
-                'trigger_type': 'medium',
-                'rule_match': True
-            }
-        
-        # Check low priority triggers
-        low_score = self._match_score(
-            complaint_text,
-            self.low_priority_triggers['keywords'],
-            self.low_priority_triggers['patterns']
-        )
-        
-        if low_score > 0.15:
-            return {
-                'priority': 'Low',
-                'severity': 'Low',
-                'confidence': min(low_score + self.low_priority_triggers['confidence_boost'], 0.75),
-                'trigger_type': 'low',
-                'rule_match': True
-            }
+        # Critical triggers first, then high, medium and low
+        for level, threshold, priority, severity, max_confidence in self.TRIGGER_CASCADE:
+            score = scores[('trigger', level)]
+            
+            if score > threshold:
+                return {
+                    'priority': priority,
+                    'severity': severity,
+                    'confidence': min(score + triggers[level]['confidence_boost'], max_confidence),
+                    'trigger_type': level,
+                    'rule_match': True
+                }
         
         # No strong rule match
         return {
@@ -278,13 +284,10 @@ class EnhancedRuleBasedClassifier:
         best_category = None
         best_score = 0
         best_metadata = {}
+        scores = self._scores(complaint_text)
         
         for category, rules in self.category_rules.items():
-            score = self._match_score(
-                complaint_text,
-                rules['keywords'],
-                rules.get('patterns', [])
-            )
+            score = scores[('category', category)]
             
             if score > best_score:
                 best_score = score
@@ -310,6 +313,105 @@ class EnhancedRuleBasedClassifier:
             'default_severity': None,
             'rule_match': False
         }
+    
+    # ------------------------------------------------------------------
+    # Batch API (offline audits over the complaint history)
+    # ------------------------------------------------------------------
+    
+    def score_batch(self, complaint_texts) -> np.ndarray:
+        """
+        Scores of every rule group for a list / pandas Series of texts
+        Returns an array (texts x groups), columns ordered as _rule_groups()
+        """
+        return self._engine.score_batch(complaint_texts)
+    
+    def _group_columns(self) -> Dict:
+        return {name: j for j, name in enumerate(self._engine.group_names)}
+    
+    def classify_priority_severity_batch(self, complaint_texts, scores: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Vectorized classify_priority_severity() for many texts
+        Returns a DataFrame with the same keys as columns, one row per text
+        (indexed like the input if it is a Series)
+        """
+        if scores is None:
+            scores = self.score_batch(complaint_texts)
+        
+        n_texts = len(scores)
+        columns = self._group_columns()
+        triggers = self._triggers()
+        
+        priority = np.full(n_texts, None, dtype=object)
+        severity = np.full(n_texts, None, dtype=object)
+        confidence = np.zeros(n_texts)
+        trigger_type = np.full(n_texts, 'none', dtype=object)
+        decided = np.zeros(n_texts, dtype=bool)
+        
+        for level, threshold, level_priority, level_severity, max_confidence in self.TRIGGER_CASCADE:
+            level_scores = scores[:, columns[('trigger', level)]]
+            hit = ~decided & (level_scores > threshold)
+            
+            priority[hit] = level_priority
+            severity[hit] = level_severity
+            confidence[hit] = np.minimum(level_scores[hit] + triggers[level]['confidence_boost'], max_confidence)
+            trigger_type[hit] = level
+            decided |= hit
+        
+        return pd.DataFrame({
+            'priority': priority,
+            'severity': severity,
+            'confidence': confidence,
+            'trigger_type': trigger_type,
+            'rule_match': decided
+        }, index=complaint_texts.index if isinstance(complaint_texts, pd.Series) else None)
+    
+    def classify_category_batch(self, complaint_texts, scores: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Vectorized classify_category() for many texts
+        Returns a DataFrame with the same keys as columns, one row per text
+        """
+        if scores is None:
+            scores = self.score_batch(complaint_texts)
+        
+        columns = self._group_columns()
+        categories = list(self.category_rules.keys())
+        category_scores = scores[:, [columns[('category', category)] for category in categories]]
+        
+        # argmax returns the first maximum, like the strict '>' loop in classify_category
+        best = category_scores.argmax(axis=1)
+        best_score = category_scores[np.arange(len(best)), best]
+        matched = best_score > 0.3
+        
+        names = np.array(categories, dtype=object)
+        default_priority = np.array(
+            [rules.get('default_priority', 'Medium') for rules in self.category_rules.values()], dtype=object
+        )
+        default_severity = np.array(
+            [rules.get('default_severity', 'Medium') for rules in self.category_rules.values()], dtype=object
+        )
+        
+        return pd.DataFrame({
+            'category': np.where(matched, names[best], None),
+            'confidence': np.where(matched, np.minimum(best_score + 0.70, 0.95), 0.0),
+            'default_priority': np.where(matched, default_priority[best], None),
+            'default_severity': np.where(matched, default_severity[best], None),
+            'rule_match': matched
+        }, index=complaint_texts.index if isinstance(complaint_texts, pd.Series) else None)
+    
+    def classify_batch(self, complaint_texts) -> pd.DataFrame:
+        """
+        Priority/Severity and Category rules for many texts, scored in one pass
+        Category columns are prefixed with 'category_' (except 'category' itself)
+        """
+        scores = self.score_batch(complaint_texts)
+        priority_severity = self.classify_priority_severity_batch(complaint_texts, scores)
+        category = self.classify_category_batch(complaint_texts, scores).rename(columns={
+            'confidence': 'category_confidence',
+            'default_priority': 'category_default_priority',
+            'default_severity': 'category_default_severity',
+            'rule_match': 'category_rule_match'
+        })
+        return pd.concat([priority_severity, category], axis=1)
 
 
 class EnhancedHybridClassifier:
@@ -318,10 +420,18 @@ class EnhancedHybridClassifier:
     Aggressive rule boosting for Priority/Severity
     """
     
-    def __init__(self, ml_service):
+    def __init__(self, ml_service, short_circuit=True, short_circuit_threshold=None,
+                 category_short_circuit_threshold=None):
         """
         Args:
             ml_service: EnhancedClassificationService with trained models
+            short_circuit: Run the rules first and skip ML models whose output the rule decides
+            short_circuit_threshold: Rule confidence at which the Priority and Severity models
+                                     are skipped (default: rule_confidence_high, where the rule
+                                     wins anyway, so results are unchanged)
+            category_short_circuit_threshold: Rule confidence at which the Category model is
+                                              skipped and the rule category used (off by default,
+                                              since a confident ML category normally wins)
         """
         self.ml_service = ml_service
         self.rule_classifier = EnhancedRuleBasedClassifier()
@@ -330,6 +440,53 @@ class EnhancedHybridClassifier:
         self.rule_confidence_high = 0.80  # Use rule if above this
         self.ml_confidence_high = 0.75    # Use ML if above this
         self.ml_confidence_low = 0.40     # Use rule fallback if ML below this
+        
+        # Rule-first fast path (Staff has no rules, so its model always runs)
+        self.short_circuit = short_circuit
+        self.short_circuit_threshold = (
+            short_circuit_threshold if short_circuit_threshold is not None else self.rule_confidence_high
+        )
+        self.category_short_circuit_threshold = category_short_circuit_threshold
+        
+        # How often each model was skipped
+        self.stats = {'classified': 0, 'models_skipped': {name: 0 for name in ml_service.MODEL_NAMES}}
+    
+    def get_config(self) -> Dict[str, any]:
+        """Decision thresholds (part of the model version used for result caching)"""
+        return {
+            'rule_confidence_high': self.rule_confidence_high,
+            'ml_confidence_high': self.ml_confidence_high,
+            'ml_confidence_low': self.ml_confidence_low,
+            'short_circuit': self.short_circuit,
+            'short_circuit_threshold': self.short_circuit_threshold,
+            'category_short_circuit_threshold': self.category_short_circuit_threshold
+        }
+    
+    def _rules(self, complaint_text: str) -> Tuple[Dict, Dict]:
+        return (
+            self.rule_classifier.classify_priority_severity(complaint_text),
+            self.rule_classifier.classify_category(complaint_text)
+        )
+    
+    def _models_to_run(self, rule_priority_severity: Dict, rule_category: Dict) -> List[str]:
+        """ML models still needed after the rules have been applied"""
+        skipped = set()
+        
+        if self.short_circuit:
+            if (rule_priority_severity['rule_match'] and
+                    rule_priority_severity['confidence'] >= self.short_circuit_threshold):
+                skipped.update(('priority', 'severity'))
+            
+            if (self.category_short_circuit_threshold is not None and
+                    rule_category['rule_match'] and
+                    rule_category['confidence'] >= self.category_short_circuit_threshold):
+                skipped.add('category')
+        
+        self.stats['classified'] += 1
+        for name in skipped:
+            self.stats['models_skipped'][name] += 1
+        
+        return [name for name in self.ml_service.MODEL_NAMES if name not in skipped]
     
     def classify(self, complaint_text: str, return_details=False) -> Dict[str, any]:
         """
@@ -342,30 +499,72 @@ class EnhancedHybridClassifier:
         Returns:
             dict with category, staff, priority, severity predictions
         """
+        rule_priority_severity, rule_category = self._rules(complaint_text)
+        models_run = self._models_to_run(rule_priority_severity, rule_category)
+        
         # Get ML predictions (use direct ML method to avoid recursion)
-        ml_result = self.ml_service._classify_ml_only(complaint_text, return_details=True)
+        ml_result = self.ml_service._classify_ml_only(
+            complaint_text, return_details=True, models=models_run
+        )
+        
+        return self._combine(
+            complaint_text, ml_result, return_details,
+            rule_priority_severity, rule_category, models_run
+        )
+    
+    def classify_batch(self, complaint_texts: List[str], return_details=False) -> List[Dict[str, any]]:
+        """
+        Classify a list of complaints; ML predictions are computed in one batch
+        and the rule-based decisions are then applied per complaint
+        """
+        rules = [self._rules(complaint_text) for complaint_text in complaint_texts]
+        models_run = [self._models_to_run(*rule_results) for rule_results in rules]
+        
+        ml_results = self.ml_service._classify_ml_only_batch(
+            complaint_texts, return_details=True, models=models_run
+        )
         
+        return [
+            self._combine(complaint_text, ml_result, return_details, *rule_results, models)
+            for complaint_text, ml_result, rule_results, models
+            in zip(complaint_texts, ml_results, rules, models_run)
+        ]
+    
+    def _combine(self, complaint_text: str, ml_result: Dict, return_details=False,
+                 rule_priority_severity: Optional[Dict] = None, rule_category: Optional[Dict] = None,
+                 models_run: Optional[List[str]] = None) -> Dict[str, any]:
+        """Merge ML predictions with rule-based predictions for one complaint"""
         # Get rule-based predictions
-        rule_priority_severity = self.rule_classifier.classify_priority_severity(complaint_text)
-        rule_category = self.rule_classifier.classify_category(complaint_text)
+        if rule_priority_severity is None or rule_category is None:
+            rule_priority_severity, rule_category = self._rules(complaint_text)
+        models_run = models_run or list(self.ml_service.MODEL_NAMES)
         
-        # Decision: Category (keep ML, it's already 96%)
-        final_category = ml_result['category']
         final_staff = ml_result['staff']
-        category_source = 'ml'
-        category_confidence = ml_result['confidences']['category']
+        
+        if 'category' not in models_run:
+            # Short-circuited: the rule is confident enough to stand alone
+            final_category = rule_category['category']
+            category_source = 'rule_short_circuit'
+            category_confidence = rule_category['confidence']
+        else:
+            # Decision: Category (keep ML, it's already 96%)
+            final_category = ml_result['category']
+            category_source = 'ml'
+            category_confidence = ml_result['confidences']['category']
         
         # Override category if rule is very confident
-        if rule_category['rule_match'] and rule_category['confidence'] > 0.90:
+        if category_source == 'ml' and rule_category['rule_match'] and rule_category['confidence'] > 0.90:
             if ml_result['confidences']['category'] < 0.85:
                 final_category = rule_category['category']
                 category_source = 'rule_override'
                 category_confidence = rule_category['confidence']
         
         # Decision: Priority (aggressive rule boosting)
-        ml_priority_conf = ml_result['confidences']['priority']
+        ml_priority_conf = ml_result['confidences'].get('priority')
         
-        if rule_priority_severity['rule_match'] and rule_priority_severity['confidence'] >= self.rule_confidence_high:
+        if 'priority' not in models_run or (
+                rule_priority_severity['rule_match'] and
+                rule_priority_severity['confidence'] >= self.rule_confidence_high):
             # High confidence rule - use rule
             final_priority = rule_priority_severity['priority']
             priority_source = 'rule'
@@ -389,9 +588,11 @@ class EnhancedHybridClassifier:
             priority_confidence = ml_priority_conf
         
         # Decision: Severity (aggressive rule boosting)
-        ml_severity_conf = ml_result['confidences']['severity']
+        ml_severity_conf = ml_result['confidences'].get('severity')
         
-        if rule_priority_severity['rule_match'] and rule_priority_severity['confidence'] >= self.rule_confidence_high:
+        if 'severity' not in models_run or (
+                rule_priority_severity['rule_match'] and
+                rule_priority_severity['confidence'] >= self.rule_confidence_high):
             # High confidence rule - use rule
             final_severity = rule_priority_severity['severity']
             severity_source = 'rule'
@@ -439,7 +640,8 @@ class EnhancedHybridClassifier:
                 'rule_predictions': {
                     'priority_severity': rule_priority_severity,
                     'category': rule_category
-                }
+                },
+                'models_run': models_run
             })
         
         return result
@@ -0,0 +1,223 @@
+"""
+Inference Backends for the Enhanced Complaint Classifiers
+Selectable runtime for the DistilBERT models:
+  - torch:      PyTorch fp32 (default, same as training)
+  - torch-int8: PyTorch with dynamic INT8 quantization of all Linear layers (CPU)
+  - onnx:       Exported ONNX graph executed by ONNX Runtime (CPU)
+
+All backends are called exactly like the PyTorch models, so the classification
+service does not need to know which one is loaded.
+"""
+
+import os
+import torch
+import torch.nn as nn
+from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+from transformers.modeling_outputs import SequenceClassifierOutput
+
+from ai_models.model_loading import load_pretrained
+
+# ONNX Runtime is optional - only needed for the 'onnx' backend
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+
+BACKENDS = ('torch', 'torch-int8', 'onnx')
+ONNX_FILENAME = 'model.onnx'
+
+
+def resolve_device(backend):
+    """Quantized and ONNX models run on CPU; fp32 PyTorch uses CUDA when available"""
+    if backend == 'torch' and torch.cuda.is_available():
+        return torch.device('cuda')
+    return torch.device('cpu')
+
+
+def quantize_model(model):
+    """Dynamic INT8 quantization: Linear weights stored as int8, activations quantized on the fly"""
+    return torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def onnx_path(model_path):
+    return os.path.join(model_path, ONNX_FILENAME)
+
+
+class OnnxSequenceClassifier:
+    """
+    ONNX Runtime session with the call signature of DistilBertForSequenceClassification
+    (model(input_ids=..., attention_mask=...).logits)
+    """
+
+    def __init__(self, model_file, num_threads=None):
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime is required for the 'onnx' backend: pip install onnxruntime")
+        if not os.path.exists(model_file):
+            raise FileNotFoundError(
+                f"ONNX model not found: {model_file}\n"
+                f"Export it with: python manage.py export_onnx_models"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.model_file = model_file
+        self.session = ort.InferenceSession(model_file, options, providers=['CPUExecutionProvider'])
+        self.output_names = [output.name for output in self.session.get_outputs()]
+
+    def _run(self, input_ids, attention_mask):
+        return self.session.run(None, {
+            'input_ids': input_ids.cpu().numpy(),
+            'attention_mask': attention_mask.cpu().numpy()
+        })
+
+    def __call__(self, input_ids, attention_mask):
+        logits = self._run(input_ids, attention_mask)[0]
+        return SequenceClassifierOutput(logits=torch.from_numpy(logits))
+
+    # Keep the torch model interface used by the service
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
+
+
+class OnnxMultiTaskModel(OnnxSequenceClassifier):
+    """ONNX Runtime session with the call signature of MultiTaskDistilBert (dict of task -> logits)"""
+
+    def __call__(self, input_ids, attention_mask, tasks=None):
+        outputs = dict(zip(self.output_names, self._run(input_ids, attention_mask)))
+        return {
+            task: torch.from_numpy(outputs[task])
+            for task in (tasks or self.output_names)
+        }
+
+
+def load_sequence_classifier(model_path, backend='torch', device=None, use_mmap=True):
+    """
+    Load a standalone DistilBertForSequenceClassification checkpoint with the given backend
+    (weights memory-mapped from model.safetensors when use_mmap, see ai_models/model_loading.py)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+
+    if backend == 'onnx':
+        return OnnxSequenceClassifier(onnx_path(model_path))
+
+    model = load_pretrained(DistilBertForSequenceClassification, model_path, use_mmap)
+    if backend == 'torch-int8':
+        model = quantize_model(model)
+    return model.to(device or resolve_device(backend))
+
+
+def load_multitask_model(model_path, backend='torch', device=None, use_mmap=True):
+    """Load a MultiTaskDistilBert saved with save_pretrained() with the given backend"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+
+    if backend == 'onnx':
+        return OnnxMultiTaskModel(onnx_path(model_path))
+
+    from ai_models.multitask_classifier import MultiTaskDistilBert
+
+    model = MultiTaskDistilBert.from_pretrained(model_path, use_mmap=use_mmap)
+    model.eval()
+    if backend == 'torch-int8':
+        model = quantize_model(model)
+    return model.to(device or resolve_device(backend))
+
+
+class _LogitsOnly(nn.Module):
+    """Export wrapper: HF model output object -> plain logits tensor"""
+
+    def __init__(self, model):
+        super(_LogitsOnly, self).__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+class _TaskTuple(nn.Module):
+    """Export wrapper: MultiTaskDistilBert dict output -> tuple in fixed task order"""
+
+    def __init__(self, model, tasks):
+        super(_TaskTuple, self).__init__()
+        self.model = model
+        self.tasks = tasks
+
+    def forward(self, input_ids, attention_mask):
+        outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
+        return tuple(outputs[task] for task in self.tasks)
+
+
+def export_onnx(model_path, multitask=False, opset=14, max_length=128):
+    """
+    Export a checkpoint directory to <model_path>/model.onnx
+    Batch size and sequence length are dynamic axes, so batched and
+    dynamically padded inputs work the same as with PyTorch.
+
+    Returns:
+        (onnx file path, max absolute logit difference vs PyTorch on a sample batch)
+    """
+    if multitask:
+        from ai_models.multitask_classifier import MultiTaskDistilBert
+        model = MultiTaskDistilBert.from_pretrained(model_path).eval()
+        output_names = list(model.num_labels.keys())
+        wrapper = _TaskTuple(model, output_names).eval()
+    else:
+        model = DistilBertForSequenceClassification.from_pretrained(model_path).eval()
+        output_names = ['logits']
+        wrapper = _LogitsOnly(model).eval()
+
+    tokenizer = DistilBertTokenizer.from_pretrained(model_path)
+    sample = tokenizer(
+        [
+            "Water leakage in AC coach, very dirty and unhygienic",
+            "Medical emergency: passenger needs urgent help"
+        ],
+        max_length=max_length,
+        padding=True,
+        truncation=True,
+        return_tensors='pt'
+    )
+
+    output_file = onnx_path(model_path)
+    dynamic_axes = {
+        'input_ids': {0: 'batch', 1: 'sequence'},
+        'attention_mask': {0: 'batch', 1: 'sequence'}
+    }
+    dynamic_axes.update({name: {0: 'batch'} for name in output_names})
+
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            (sample['input_ids'], sample['attention_mask']),
+            output_file,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=output_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True
+        )
+        expected = wrapper(sample['input_ids'], sample['attention_mask'])
+
+    if not multitask:
+        expected = (expected,)
+
+    # Sanity check the exported graph against PyTorch
+    max_diff = 0.0
+    if ONNXRUNTIME_AVAILABLE:
+        session = OnnxSequenceClassifier(output_file)
+        actual = session._run(sample['input_ids'], sample['attention_mask'])
+        max_diff = max(
+            float(abs(torch.from_numpy(a) - e).max())
+            for a, e in zip(actual, expected)
+        )
+
+    return output_file, max_diff
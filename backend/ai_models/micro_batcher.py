@@ -0,0 +1,182 @@
+"""
+Dynamic Micro-Batching for the Enhanced Classification Service
+Collects concurrent classify_complaint() calls for a short window and runs them
+as one classify_batch() call, then hands each caller its own result
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Drop-in wrapper around EnhancedClassificationService
+
+    Callers keep using classify_complaint(); requests arriving within max_wait_ms
+    of each other (up to max_batch_size) share one forward pass per model.
+    Works across threads of one process (e.g. gunicorn --threads N). While requests
+    have only ever come from one thread (e.g. a sync gunicorn worker) nobody can
+    join a batch, so requests run at once without waiting.
+    Any other attribute (get_model_info, classify_batch, ...) is delegated
+    to the wrapped service.
+    """
+
+    def __init__(self, service, max_batch_size=16, max_wait_ms=8.0):
+        """
+        Args:
+            service: EnhancedClassificationService instance
+            max_batch_size: Run the batch as soon as this many requests are queued
+            max_wait_ms: Maximum time the first request of a batch waits for company
+        """
+        self.service = service
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._worker_lock = threading.Lock()
+        self._caller_threads = set()  # up to 2 thread ids seen calling classify_complaint
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'batches': 0,
+            'errors': 0,
+            'max_queue_depth': 0,
+            'largest_batch': 0,
+            'total_wait_seconds': 0.0,
+            'total_inference_seconds': 0.0
+        }
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the batcher itself
+        return getattr(self.service, name)
+
+    def _ensure_worker(self):
+        """Start the worker thread (again after a fork, threads don't survive it)"""
+        if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+            return
+
+        with self._worker_lock:
+            if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+                return
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+                self._caller_threads = set()
+            self._worker = threading.Thread(
+                target=self._run, name='classifier-micro-batcher', daemon=True
+            )
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def classify_complaint(self, complaint_text, return_details=False, timeout=30):
+        """
+        Same contract as EnhancedClassificationService.classify_complaint,
+        but the call is served from a shared batch
+        """
+        if not complaint_text or not isinstance(complaint_text, str):
+            raise ValueError("complaint_text must be a non-empty string")
+
+        self._ensure_worker()
+
+        if len(self._caller_threads) < 2:
+            self._caller_threads.add(threading.get_ident())
+
+        future = Future()
+        self._queue.put((complaint_text, return_details, future, time.perf_counter()))
+
+        queue_depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats['requests'] += 1
+            if queue_depth > self._stats['max_queue_depth']:
+                self._stats['max_queue_depth'] = queue_depth
+
+        return future.result(timeout=timeout)
+
+    def _run(self):
+        """Worker loop: block for the first request, then gather more until full or timed out"""
+        while True:
+            batch = [self._queue.get()]
+            # A single calling thread is blocked on this request: nothing else can arrive
+            wait = self.max_wait if len(self._caller_threads) > 1 else 0.0
+            deadline = time.perf_counter() + wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.error(f"Micro-batcher failed to process batch: {e}")
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process(self, batch):
+        """Run one classify_batch() call and fan results out to the waiting callers"""
+        started = time.perf_counter()
+        texts = [text for text, _, _, _ in batch]
+
+        try:
+            results = self.service.classify_batch(texts, return_details=True, batch_size=len(texts))
+        except Exception as e:
+            with self._stats_lock:
+                self._stats['errors'] += 1
+            for _, _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        finished = time.perf_counter()
+
+        for (_, return_details, future, _), result in zip(batch, results):
+            if not return_details:
+                result = {name: result[name] for name in self.service.MODEL_NAMES}
+            future.set_result(result)
+
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['largest_batch'] = max(self._stats['largest_batch'], len(batch))
+            self._stats['total_wait_seconds'] += sum(started - item[3] for item in batch)
+            self._stats['total_inference_seconds'] += finished - started
+
+    def get_stats(self):
+        """Queue depth and batching metrics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        batches = stats['batches'] or 1
+        requests = stats['requests'] or 1
+
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'concurrent_callers': len(self._caller_threads) > 1,
+            'queue_depth': self._queue.qsize(),
+            'max_queue_depth': stats['max_queue_depth'],
+            'requests': stats['requests'],
+            'batches': stats['batches'],
+            'errors': stats['errors'],
+            'largest_batch': stats['largest_batch'],
+            'avg_batch_size': round(stats['requests'] / batches, 2) if stats['batches'] else 0,
+            'avg_queue_wait_ms': round(stats['total_wait_seconds'] / requests * 1000.0, 3),
+            'avg_batch_inference_ms': round(stats['total_inference_seconds'] / batches * 1000.0, 3)
+        }
+
+    def get_model_info(self):
+        """Model info of the wrapped service plus micro-batching metrics"""
+        info = self.service.get_model_info()
+        info['micro_batching'] = self.get_stats()
+        return info
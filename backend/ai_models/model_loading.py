@@ -0,0 +1,210 @@
+"""
+Fast Model Loading for the Enhanced Complaint Classifiers
+  - Weights are read from model.safetensors through a memory map: the model is built
+    on the meta device (no allocation, no random init) and the mapped tensors become
+    its parameters. Startup no longer copies ~250 MB per model into the heap, and the
+    pages live in the OS page cache, shared by every process mapping the same file.
+  - Label encoders are stored as plain JSON arrays of class names (label_encoder.json)
+    instead of pickled sklearn objects.
+
+Convert an existing model directory (pytorch_model.bin / label_encoder.pkl) with:
+    python -m ai_models.model_loading --model-dir ai_models/models/enhanced
+"""
+
+import os
+import json
+import mmap
+import pickle
+import struct
+import logging
+
+import numpy as np
+import torch
+from sklearn.preprocessing import LabelEncoder
+
+logger = logging.getLogger(__name__)
+
+
+SAFETENSORS_FILENAME = 'model.safetensors'
+LEGACY_WEIGHTS_FILENAME = 'pytorch_model.bin'
+LABEL_ENCODER_JSON = 'label_encoder.json'
+LABEL_ENCODER_PICKLE = 'label_encoder.pkl'
+
+SAFETENSORS_DTYPES = {
+    'F64': torch.float64,
+    'F32': torch.float32,
+    'F16': torch.float16,
+    'BF16': torch.bfloat16,
+    'I64': torch.int64,
+    'I32': torch.int32,
+    'I16': torch.int16,
+    'I8': torch.int8,
+    'U8': torch.uint8,
+    'BOOL': torch.bool
+}
+
+
+def mmap_safetensors(path):
+    """
+    Tensors of a .safetensors file backed by a memory map of the file
+
+    The map is copy-on-write (ACCESS_COPY): pages are read lazily from the page cache
+    and stay shared between processes unless a tensor is written to, which inference
+    never does.
+    """
+    with open(path, 'rb') as f:
+        header_size = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    header.pop('__metadata__', None)
+    data_start = 8 + header_size
+
+    tensors = {}
+    for name, info in header.items():
+        dtype = SAFETENSORS_DTYPES[info['dtype']]
+        begin, end = info['data_offsets']
+        count = (end - begin) // torch.empty(0, dtype=dtype).element_size()
+        if count:
+            tensor = torch.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + begin)
+        else:
+            tensor = torch.empty(0, dtype=dtype)
+        tensors[name] = tensor.reshape(info['shape'])
+    return tensors
+
+
+def _rebuild_buffers(model):
+    """
+    Non-persistent buffers are not in the checkpoint and stay on the meta device;
+    the only one the DistilBERT models have is position_ids (arange)
+    """
+    for module_name, module in model.named_modules():
+        for buffer_name, buffer in list(module.named_buffers(recurse=False)):
+            if buffer is None or not buffer.is_meta:
+                continue
+            if buffer_name != 'position_ids':
+                raise ValueError(f"Cannot rebuild buffer {module_name}.{buffer_name}")
+            module.register_buffer(
+                buffer_name,
+                torch.arange(buffer.shape[-1]).expand(buffer.shape),
+                persistent=False
+            )
+
+
+def load_pretrained_mmap(model_class, model_path):
+    """
+    from_pretrained() for a checkpoint saved as model.safetensors, without copying
+    the weights (see mmap_safetensors)
+
+    Returns:
+        The model in eval mode with requires_grad off, or None when the directory has
+        no model.safetensors or its keys don't match the model (callers then fall
+        back to from_pretrained)
+    """
+    weights_file = os.path.join(model_path, SAFETENSORS_FILENAME)
+    if not os.path.exists(weights_file):
+        return None
+
+    config = model_class.config_class.from_pretrained(model_path)
+    with torch.device('meta'):
+        model = model_class(config)
+
+    state_dict = mmap_safetensors(weights_file)
+    missing, unexpected = model.load_state_dict(state_dict, strict=False, assign=True)
+    if missing or unexpected:
+        logger.warning(
+            f"{weights_file} does not match {model_class.__name__} "
+            f"(missing {missing[:3]}, unexpected {unexpected[:3]}), using from_pretrained"
+        )
+        return None
+
+    _rebuild_buffers(model)
+    if any(parameter.is_meta for parameter in model.parameters()):
+        return None
+
+    model.eval()
+    model.requires_grad_(False)
+    return model
+
+
+def load_pretrained(model_class, model_path, use_mmap=True):
+    """Memory-mapped load when possible, regular from_pretrained otherwise"""
+    model = load_pretrained_mmap(model_class, model_path) if use_mmap else None
+    if model is None:
+        model = model_class.from_pretrained(model_path)
+        model.eval()
+    return model
+
+
+def load_label_encoder(model_path):
+    """
+    LabelEncoder of a model directory from label_encoder.json, falling back to the
+    pickled label_encoder.pkl of models trained before the JSON file existed
+    """
+    json_file = os.path.join(model_path, LABEL_ENCODER_JSON)
+    if os.path.exists(json_file):
+        with open(json_file, 'r') as f:
+            classes = json.load(f)
+        encoder = LabelEncoder()
+        encoder.classes_ = np.array(classes)
+        return encoder
+
+    with open(os.path.join(model_path, LABEL_ENCODER_PICKLE), 'rb') as f:
+        return pickle.load(f)
+
+
+def save_label_encoder(encoder, model_path):
+    """Write the classes of a fitted LabelEncoder to label_encoder.json"""
+    with open(os.path.join(model_path, LABEL_ENCODER_JSON), 'w') as f:
+        json.dump(encoder.classes_.tolist(), f, indent=2)
+
+
+def convert_model_dir(model_path):
+    """
+    Add model.safetensors and label_encoder.json next to the legacy files of one
+    model directory (the legacy files are kept)
+
+    Returns:
+        List of files written
+    """
+    from safetensors.torch import save_file
+
+    written = []
+    weights_file = os.path.join(model_path, SAFETENSORS_FILENAME)
+    legacy_weights = os.path.join(model_path, LEGACY_WEIGHTS_FILENAME)
+    if not os.path.exists(weights_file) and os.path.exists(legacy_weights):
+        state_dict = torch.load(legacy_weights, map_location='cpu')
+        save_file({name: tensor.contiguous() for name, tensor in state_dict.items()}, weights_file,
+                  metadata={'format': 'pt'})
+        written.append(weights_file)
+
+    json_file = os.path.join(model_path, LABEL_ENCODER_JSON)
+    if not os.path.exists(json_file) and os.path.exists(os.path.join(model_path, LABEL_ENCODER_PICKLE)):
+        save_label_encoder(load_label_encoder(model_path), model_path)
+        written.append(json_file)
+
+    return written
+
+
+# Conversion script
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Write model.safetensors and label_encoder.json for the enhanced models'
+    )
+    parser.add_argument('--model-dir', default='ai_models/models/enhanced')
+    args = parser.parse_args()
+
+    for name in ('category', 'staff', 'priority', 'severity'):
+        model_path = os.path.join(args.model_dir, f'{name}_model')
+        if not os.path.isdir(model_path):
+            print(f"⚠️ {model_path} not found, skipped")
+            continue
+        written = convert_model_dir(model_path)
+        print(f"✅ {name}: " + (', '.join(written) if written else 'already converted'))
+
+    encoder_path = os.path.join(args.model_dir, 'multitask_model', 'encoder')
+    if os.path.isdir(encoder_path):
+        for path in convert_model_dir(encoder_path):
+            print(f"✅ multitask: {path}")
@@ -0,0 +1,286 @@
+"""
+Model Registry with Hot-Swappable Versions
+Every trained model set is stored as an immutable version directory, and one small
+pointer file names the active version:
+
+    <root>/<family>/versions/<version>/...   model files (+ REGISTRY.json metadata)
+    <root>/<family>/ACTIVE                   name of the active version
+    <root>/<family>/history.json             activations, newest last (for rollback)
+
+Families: 'enhanced' (category_model/, staff_model/, ... as in AI_MODEL_DIR) and
+'categorizer' (complaint_categorizer.joblib + .json header).
+
+The pointer is replaced atomically (write temp file + os.replace), so readers always
+see a complete version. HotSwapModel notices a new pointer in every worker, loads
+and warms the new version in a background thread and swaps it in; requests keep
+being served by the previous version until then.
+
+Manage versions with: python manage.py model_registry list|add|activate|rollback
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+FAMILIES = ('enhanced', 'categorizer')
+METADATA_FILENAME = 'REGISTRY.json'
+
+
+class ModelRegistry:
+    """Versioned model directories of one model family"""
+
+    def __init__(self, root, family):
+        if family not in FAMILIES:
+            raise ValueError(f"Unknown model family '{family}', expected one of {FAMILIES}")
+        self.family = family
+        self.family_dir = os.path.join(root, family)
+        self.versions_dir = os.path.join(self.family_dir, 'versions')
+        self.pointer_file = os.path.join(self.family_dir, 'ACTIVE')
+        self.history_file = os.path.join(self.family_dir, 'history.json')
+        self._lock = threading.Lock()
+
+    def version_path(self, version):
+        return os.path.join(self.versions_dir, version)
+
+    def versions(self):
+        """All versions with their metadata, oldest first"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+
+        versions = []
+        for version in os.listdir(self.versions_dir):
+            if version.startswith('.'):
+                continue  # staging directories
+            versions.append({'version': version, **self.metadata(version)})
+        return sorted(versions, key=lambda entry: (entry.get('created_at', ''), entry['version']))
+
+    def metadata(self, version):
+        """REGISTRY.json of one version ({} when missing)"""
+        metadata_file = os.path.join(self.version_path(version), METADATA_FILENAME)
+        if not os.path.exists(metadata_file):
+            return {}
+        with open(metadata_file, 'r') as f:
+            return json.load(f)
+
+    def active_version(self):
+        """Name of the active version, or None when nothing was activated yet"""
+        try:
+            with open(self.pointer_file, 'r') as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version if version and os.path.isdir(self.version_path(version)) else None
+
+    def active_path(self):
+        version = self.active_version()
+        return self.version_path(version) if version else None
+
+    def pointer_mtime(self):
+        """Cheap change check for the active pointer (0 when missing)"""
+        try:
+            return os.stat(self.pointer_file).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def staging_dir(self):
+        """Fresh directory to write a new version into, then pass to commit_version()"""
+        path = os.path.join(self.versions_dir, f'.staging-{uuid.uuid4().hex[:8]}')
+        os.makedirs(path)
+        return path
+
+    def commit_version(self, staging_dir, metadata=None, activate=False):
+        """
+        Turn a filled staging directory into an immutable version
+
+        Returns:
+            The new version name (timestamp-based, sorts chronologically)
+        """
+        version = f"v{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:4]}"
+        with open(os.path.join(staging_dir, METADATA_FILENAME), 'w') as f:
+            json.dump({
+                'created_at': datetime.now().isoformat(),
+                **(metadata or {})
+            }, f, indent=2)
+        os.rename(staging_dir, self.version_path(version))
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def add_version(self, source_dir, metadata=None, activate=False):
+        """Copy an existing model directory into the registry as a new version"""
+        staging_dir = self.staging_dir()
+        shutil.copytree(source_dir, staging_dir, dirs_exist_ok=True)
+        return self.commit_version(staging_dir, {'source': os.path.abspath(source_dir), **(metadata or {})}, activate)
+
+    def activate(self, version):
+        """Atomically point the family at `version`"""
+        if not os.path.isdir(self.version_path(version)):
+            raise ValueError(f"Unknown {self.family} version '{version}'")
+
+        with self._lock:
+            tmp_file = f"{self.pointer_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(version)
+            os.replace(tmp_file, self.pointer_file)
+
+            history = self.history()
+            history.append({'version': version, 'activated_at': datetime.now().isoformat()})
+            tmp_file = f"{self.history_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(history, f, indent=2)
+            os.replace(tmp_file, self.history_file)
+
+        logger.info(f"Model registry: {self.family} -> {version}")
+
+    def history(self):
+        try:
+            with open(self.history_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def rollback(self):
+        """Re-activate the version that was active before the current one"""
+        active = self.active_version()
+        for entry in reversed(self.history()):
+            if entry['version'] != active and os.path.isdir(self.version_path(entry['version'])):
+                self.activate(entry['version'])
+                return entry['version']
+        raise ValueError(f"No earlier {self.family} version to roll back to")
+
+    def prune(self, keep):
+        """
+        Delete all but the newest `keep` versions (the active one is always kept)
+
+        Returns:
+            Names of the deleted versions
+        """
+        active = self.active_version()
+        removed = []
+        for entry in self.versions()[:-keep] if keep > 0 else []:
+            if entry['version'] == active:
+                continue
+            shutil.rmtree(self.version_path(entry['version']), ignore_errors=True)
+            removed.append(entry['version'])
+        return removed
+
+    def get_info(self):
+        return {
+            'family': self.family,
+            'active_version': self.active_version(),
+            'versions': len(self.versions())
+        }
+
+
+class HotSwapModel:
+    """
+    Wrapper that always serves the registry's active version
+
+    factory(path, version) builds the served object, warmup(obj) (optional) runs a few
+    predictions on it before it takes traffic. Calls are delegated to the current
+    object; the pointer is re-checked at most every poll_interval seconds, and a
+    change is loaded in a background thread while the old version keeps serving.
+    """
+
+    def __init__(self, registry, factory, warmup=None, poll_interval=5.0, initial=None, initial_version=None):
+        self.registry = registry
+        self.factory = factory
+        self.warmup = warmup
+        self.poll_interval = poll_interval
+
+        self._swap_lock = threading.Lock()
+        self._loading_version = None
+        self._next_check = 0.0
+        self._pointer_mtime = registry.pointer_mtime()
+        self._status = {'swaps': 0, 'last_swap_at': None, 'last_swap_seconds': None, 'last_error': None}
+
+        if initial is not None:
+            self.current, self.version = initial, initial_version
+        else:
+            self.version = registry.active_version()
+            if self.version is None:
+                raise FileNotFoundError(f"No active {registry.family} version in the model registry")
+            self.current = factory(registry.version_path(self.version), self.version)
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper itself
+        self._maybe_swap()
+        return getattr(self.current, name)
+
+    def _maybe_swap(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.poll_interval
+
+        mtime = self.registry.pointer_mtime()
+        if mtime == self._pointer_mtime:
+            return
+        self._pointer_mtime = mtime
+
+        version = self.registry.active_version()
+        if version is None or version == self.version:
+            return
+        self.swap_to(version, background=True)
+
+    def swap_to(self, version, background=True):
+        """Load `version` and make it current (in a background thread by default)"""
+        with self._swap_lock:
+            if self._loading_version == version:
+                return
+            self._loading_version = version
+
+        if background:
+            threading.Thread(
+                target=self._load_and_swap, args=(version,), name=f'model-swap-{version}', daemon=True
+            ).start()
+        else:
+            self._load_and_swap(version)
+
+    def _load_and_swap(self, version):
+        start_time = time.perf_counter()
+        try:
+            candidate = self.factory(self.registry.version_path(version), version)
+            if self.warmup is not None:
+                self.warmup(candidate)
+
+            # Single reference assignment: in-flight calls finish on the old object
+            self.current, self.version = candidate, version
+            self._status.update({
+                'swaps': self._status['swaps'] + 1,
+                'last_swap_at': datetime.now().isoformat(),
+                'last_swap_seconds': round(time.perf_counter() - start_time, 2),
+                'last_error': None
+            })
+            logger.info(f"✅ {self.registry.family} models swapped to {version}")
+        except Exception as e:
+            logger.error(f"❌ Failed to load {self.registry.family} version {version}: {e}")
+            self._status['last_error'] = f"{version}: {e}"
+        finally:
+            with self._swap_lock:
+                if self._loading_version == version:
+                    self._loading_version = None
+
+    def get_registry_info(self):
+        """Served version, registry pointer and swap status"""
+        self._maybe_swap()
+        return {
+            **self.registry.get_info(),
+            'serving_version': self.version,
+            'loading_version': self._loading_version,
+            **self._status
+        }
+
+    def get_model_info(self):
+        info = self.current.get_model_info()
+        info['registry'] = self.get_registry_info()
+        return info
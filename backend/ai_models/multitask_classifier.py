@@ -0,0 +1,266 @@
+"""
+Multi-Task Complaint Classifier
+One shared DistilBERT encoder with four lightweight heads (Category, Staff, Priority, Severity)
+Built by distilling the four standalone checkpoints in ai_models/models/enhanced
+"""
+
+import os
+import json
+import copy
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+import numpy as np
+from typing import Dict, List, Optional
+from transformers import DistilBertModel, DistilBertTokenizer, DistilBertForSequenceClassification
+
+
+TASKS = ['category', 'staff', 'priority', 'severity']
+
+
+class ClassificationHead(nn.Module):
+    """
+    Classification head with the same layout as DistilBertForSequenceClassification
+    (pre_classifier -> ReLU -> dropout -> classifier), so weights can be copied 1:1
+    """
+
+    def __init__(self, hidden_size: int, num_labels: int, dropout: float = 0.2):
+        super(ClassificationHead, self).__init__()
+        self.pre_classifier = nn.Linear(hidden_size, hidden_size)
+        self.classifier = nn.Linear(hidden_size, num_labels)
+        self.dropout = nn.Dropout(dropout)
+
+    def forward(self, pooled_output: torch.Tensor) -> torch.Tensor:
+        hidden = F.relu(self.pre_classifier(pooled_output))
+        hidden = self.dropout(hidden)
+        return self.classifier(hidden)
+
+
+class MultiTaskDistilBert(nn.Module):
+    """
+    Shared DistilBERT encoder + one head per task
+    A single encoder pass produces logits for all four tasks
+    """
+
+    def __init__(self, encoder: DistilBertModel, num_labels: Dict[str, int], dropout: float = 0.2):
+        """
+        Args:
+            encoder: DistilBertModel shared by all heads
+            num_labels: Number of classes per task, e.g. {'category': 15, 'staff': 6, ...}
+            dropout: Dropout used inside each head
+        """
+        super(MultiTaskDistilBert, self).__init__()
+        self.encoder = encoder
+        self.num_labels = dict(num_labels)
+        self.dropout = dropout
+        hidden_size = encoder.config.dim
+        self.heads = nn.ModuleDict({
+            task: ClassificationHead(hidden_size, n, dropout)
+            for task, n in self.num_labels.items()
+        })
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor,
+                tasks: Optional[List[str]] = None) -> Dict[str, torch.Tensor]:
+        """
+        Returns:
+            dict of task -> logits (batch_size, num_classes)
+        """
+        hidden_state = self.encoder(input_ids=input_ids, attention_mask=attention_mask)[0]
+        pooled_output = hidden_state[:, 0]  # [CLS] token, as in DistilBertForSequenceClassification
+        return {
+            task: self.heads[task](pooled_output)
+            for task in (tasks or self.heads.keys())
+        }
+
+    @classmethod
+    def from_teachers(cls, teachers: Dict[str, DistilBertForSequenceClassification],
+                      base_task: str = 'category') -> 'MultiTaskDistilBert':
+        """
+        Initialize from standalone checkpoints: the encoder is copied from base_task's
+        model and every head starts from its own model's classifier weights
+        """
+        encoder = copy.deepcopy(teachers[base_task].distilbert)
+        num_labels = {task: model.config.num_labels for task, model in teachers.items()}
+        dropout = teachers[base_task].config.seq_classif_dropout
+
+        model = cls(encoder, num_labels, dropout)
+        for task, teacher in teachers.items():
+            model.heads[task].pre_classifier.load_state_dict(teacher.pre_classifier.state_dict())
+            model.heads[task].classifier.load_state_dict(teacher.classifier.state_dict())
+        return model
+
+    def save_pretrained(self, output_dir: str):
+        """Save encoder (HF format), head weights and head config"""
+        os.makedirs(output_dir, exist_ok=True)
+        self.encoder.save_pretrained(os.path.join(output_dir, 'encoder'), safe_serialization=True)
+        torch.save(self.heads.state_dict(), os.path.join(output_dir, 'heads.pt'))
+        with open(os.path.join(output_dir, 'multitask_config.json'), 'w') as f:
+            json.dump({
+                'tasks': list(self.num_labels.keys()),
+                'num_labels': self.num_labels,
+                'dropout': self.dropout
+            }, f, indent=2)
+
+    @classmethod
+    def from_pretrained(cls, model_dir: str, use_mmap: bool = True) -> 'MultiTaskDistilBert':
+        """Load a model saved with save_pretrained (encoder memory-mapped when possible)"""
+        from ai_models.model_loading import load_pretrained
+
+        with open(os.path.join(model_dir, 'multitask_config.json'), 'r') as f:
+            config = json.load(f)
+
+        encoder = load_pretrained(DistilBertModel, os.path.join(model_dir, 'encoder'), use_mmap)
+        model = cls(encoder, config['num_labels'], config.get('dropout', 0.2))
+        model.heads.load_state_dict(
+            torch.load(os.path.join(model_dir, 'heads.pt'), map_location='cpu')
+        )
+        return model
+
+
+def distillation_loss(student_logits: torch.Tensor, teacher_logits: torch.Tensor,
+                      temperature: float = 2.0) -> torch.Tensor:
+    """KL(teacher || student) on temperature-softened distributions"""
+    return F.kl_div(
+        F.log_softmax(student_logits / temperature, dim=1),
+        F.softmax(teacher_logits / temperature, dim=1),
+        reduction='batchmean'
+    ) * (temperature ** 2)
+
+
+def build_from_checkpoints(model_dir: str, texts: List[str], output_dir: Optional[str] = None,
+                           base_task: str = 'category', epochs: int = 3, batch_size: int = 32,
+                           learning_rate: float = 3e-5, temperature: float = 2.0,
+                           max_length: int = 128) -> Dict:
+    """
+    Convert the four standalone models into one multi-task model
+
+    The shared encoder starts from base_task's checkpoint and all heads start from
+    their own checkpoint, then the student is distilled on the teachers' soft labels
+    so every head learns to read the shared encoder.
+
+    Args:
+        model_dir: Directory with category_model/, staff_model/, priority_model/, severity_model/
+        texts: Complaint texts used for distillation (no labels needed)
+        output_dir: Where to save (default: <model_dir>/multitask_model)
+        base_task: Which checkpoint provides the shared encoder
+
+    Returns:
+        report: dict with per-task agreement between student and teacher predictions
+    """
+    output_dir = output_dir or os.path.join(model_dir, 'multitask_model')
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+    print(f"\n{'='*70}")
+    print("  Building Multi-Task Model from Standalone Checkpoints")
+    print(f"{'='*70}")
+    print(f"Source: {model_dir}")
+    print(f"Output: {output_dir}")
+    print(f"Texts: {len(texts)}, Epochs: {epochs}, Device: {device}\n")
+
+    tokenizer = DistilBertTokenizer.from_pretrained(os.path.join(model_dir, f'{base_task}_model'))
+    teachers = {
+        task: DistilBertForSequenceClassification.from_pretrained(
+            os.path.join(model_dir, f'{task}_model')
+        ).to(device).eval()
+        for task in TASKS
+    }
+
+    encodings = tokenizer(
+        list(texts),
+        max_length=max_length,
+        padding='max_length',
+        truncation=True,
+        return_tensors='pt'
+    )
+    input_ids = encodings['input_ids']
+    attention_mask = encodings['attention_mask']
+
+    # Teacher soft labels are computed once up front
+    teacher_logits = {task: [] for task in TASKS}
+    with torch.no_grad():
+        for start in range(0, len(input_ids), batch_size):
+            ids = input_ids[start:start + batch_size].to(device)
+            mask = attention_mask[start:start + batch_size].to(device)
+            for task, teacher in teachers.items():
+                teacher_logits[task].append(teacher(input_ids=ids, attention_mask=mask).logits.cpu())
+    teacher_logits = {task: torch.cat(logits) for task, logits in teacher_logits.items()}
+
+    student = MultiTaskDistilBert.from_teachers(teachers, base_task=base_task).to(device)
+    del teachers
+
+    optimizer = torch.optim.AdamW(student.parameters(), lr=learning_rate)
+
+    for epoch in range(epochs):
+        student.train()
+        permutation = torch.randperm(len(input_ids))
+        epoch_loss = 0.0
+        num_batches = 0
+
+        for start in range(0, len(permutation), batch_size):
+            idx = permutation[start:start + batch_size]
+            ids = input_ids[idx].to(device)
+            mask = attention_mask[idx].to(device)
+
+            optimizer.zero_grad()
+            student_logits = student(ids, mask)
+            loss = sum(
+                distillation_loss(student_logits[task], teacher_logits[task][idx].to(device), temperature)
+                for task in TASKS
+            )
+            loss.backward()
+            optimizer.step()
+
+            epoch_loss += loss.item()
+            num_batches += 1
+
+        print(f"Epoch {epoch+1}/{epochs} - distillation loss: {epoch_loss / max(num_batches, 1):.4f}")
+
+    # Agreement with the standalone models
+    student.eval()
+    student_preds = {task: [] for task in TASKS}
+    with torch.no_grad():
+        for start in range(0, len(input_ids), batch_size):
+            ids = input_ids[start:start + batch_size].to(device)
+            mask = attention_mask[start:start + batch_size].to(device)
+            for task, logits in student(ids, mask).items():
+                student_preds[task].append(logits.argmax(dim=1).cpu())
+
+    report = {'base_task': base_task, 'num_texts': len(texts), 'epochs': epochs, 'agreement': {}}
+    for task in TASKS:
+        preds = torch.cat(student_preds[task]).numpy()
+        teacher_preds = teacher_logits[task].argmax(dim=1).numpy()
+        report['agreement'][task] = float(np.mean(preds == teacher_preds))
+        print(f"  {task:<10} agreement with standalone model: {report['agreement'][task]:.2%}")
+
+    student.cpu().save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, 'conversion_report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n✅ Multi-task model saved to: {output_dir}\n")
+    return report
+
+
+# Conversion script
+if __name__ == "__main__":
+    import argparse
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Build the shared-encoder multi-task model')
+    parser.add_argument('--model-dir', default='ai_models/models/enhanced')
+    parser.add_argument('--data', default='../Railway_Complaints_Final_Validated.csv')
+    parser.add_argument('--output-dir', default=None)
+    parser.add_argument('--base-task', default='category', choices=TASKS)
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data)
+    build_from_checkpoints(
+        model_dir=args.model_dir,
+        texts=df['Complaint Description'].astype(str).tolist(),
+        output_dir=args.output_dir,
+        base_task=args.base_task,
+        epochs=args.epochs,
+        batch_size=args.batch_size
+    )
@@ -0,0 +1,85 @@
+"""
+Preload-and-fork support for the AI classifiers
+With gunicorn's preload_app the models are loaded once in the master process; the
+forked workers then share the weight pages copy-on-write instead of each loading
+its own copy of the four DistilBERT models.
+
+Pages only stay shared while nobody writes to them, so before forking:
+  - every model is put in eval mode with requires_grad off (see
+    EnhancedClassificationService.freeze())
+  - all Python objects are moved to the GC's permanent generation (gc.freeze()),
+    so collections in the workers don't write to the pages holding them
+No forward pass runs in the master: thread pools created before a fork are not
+safe to use in the children.
+"""
+
+import gc
+import os
+import re
+import sys
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:  # Windows
+    RESOURCE_AVAILABLE = False
+
+
+def freeze_heap():
+    """Collect garbage, then exclude every surviving object from future collections"""
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+def memory_report(pid=None):
+    """
+    Memory of a process in MB
+
+    rss:     resident pages, shared ones counted in full
+    pss:     shared pages divided between the processes mapping them - the real
+             cost of one worker; N workers sharing preloaded models have a pss
+             far below their rss
+    shared / private: resident pages mapped by several processes / only this one
+    (pss, shared and private need Linux /proc/<pid>/smaps_rollup)
+    """
+    pid = pid or os.getpid()
+    report = {'pid': pid}
+
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+            fields = {
+                match.group(1): int(match.group(2))
+                for match in re.finditer(r'^(\w+):\s+(\d+) kB', f.read(), re.MULTILINE)
+            }
+        report.update({
+            'rss_mb': round(fields.get('Rss', 0) / 1024, 1),
+            'pss_mb': round(fields.get('Pss', 0) / 1024, 1),
+            'shared_mb': round((fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)) / 1024, 1),
+            'private_mb': round((fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)) / 1024, 1)
+        })
+        return report
+    except OSError:
+        pass
+
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            match = re.search(r'^VmRSS:\s+(\d+) kB', f.read(), re.MULTILINE)
+        if match:
+            report['rss_mb'] = round(int(match.group(1)) / 1024, 1)
+            return report
+    except OSError:
+        pass
+
+    if RESOURCE_AVAILABLE and pid == os.getpid():
+        # Peak RSS only; KB on Linux, bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report['max_rss_mb'] = round(max_rss / (1024 ** 2 if sys.platform == 'darwin' else 1024), 1)
+    return report
+
+
+def format_memory(report):
+    """One log line for a memory_report()"""
+    return ', '.join(
+        f"{key[:-3]} {value:.1f} MB" for key, value in report.items() if key.endswith('_mb')
+    ) or 'memory usage unavailable'
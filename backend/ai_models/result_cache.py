@@ -0,0 +1,276 @@
+"""
+Classification Result Cache
+Content-addressed cache for classifier outputs: the key is a hash of the normalized
+complaint text plus the version of the loaded model, so identical complaints are only
+classified once and a model reload never serves results from the previous weights.
+
+Backends:
+  - memory: in-process LRU (OrderedDict) with optional TTL
+  - django: any configured Django cache (shared between workers)
+  - disk:   one pickle file per entry, LRU by file mtime, shared between workers
+"""
+
+import os
+import copy
+import time
+import pickle
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_BACKENDS = ('none', 'memory', 'django', 'disk')
+
+
+def normalize_text(text):
+    """
+    Normalization applied before hashing
+    Only changes the classifiers ignore: the tokenizers are uncased and every rule
+    lowercases the text, so case, surrounding whitespace and Unicode form don't matter
+    """
+    return unicodedata.normalize('NFC', text).strip().lower()
+
+
+def make_key(namespace, model_version, text):
+    payload = f"{namespace}\x00{model_version}\x00{normalize_text(text)}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class InProcessBackend:
+    """Thread-safe LRU held in this process"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=2048, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers may modify the returned dict
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class DjangoCacheBackend:
+    """
+    Stores entries in a Django cache alias
+    Size is bounded by the cache itself (MAX_ENTRIES for locmem, maxmemory for Redis)
+    """
+
+    name = 'django'
+
+    def __init__(self, alias='default', ttl=None, prefix='ai_result'):
+        from django.core.cache import caches
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.cache.get(f"{self.prefix}:{key}")
+
+    def set(self, key, value):
+        self.cache.set(f"{self.prefix}:{key}", value, timeout=self.ttl or None)
+
+    def clear(self):
+        # Keys carry the model version, so entries of old models are never read again
+        # and simply expire; the shared cache is not flushed for other users
+        pass
+
+    def size(self):
+        return None
+
+
+class DiskBackend:
+    """
+    One pickle per entry under cache_dir/<2-char shard>/<key>.pkl
+    Hits touch the file, and the oldest files are pruned when max_entries is exceeded
+    """
+
+    name = 'disk'
+
+    def __init__(self, cache_dir, max_entries=20000, ttl=None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes_since_prune = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if self.ttl and time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+            return value
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._writes_since_prune += 1
+            if self._writes_since_prune < max(self.max_entries // 10, 1):
+                return
+            self._writes_since_prune = 0
+        self._prune()
+
+    def _files(self):
+        for root, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if filename.endswith('.pkl'):
+                    yield os.path.join(root, filename)
+
+    def _prune(self):
+        files = list(self._files())
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0)
+        for path in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for path in list(self._files()):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def size(self):
+        return sum(1 for _ in self._files())
+
+
+class ResultCache:
+    """
+    Cache front-end used by the classifiers
+
+    Usage:
+        cached = cache.get(text, model_version)
+        if cached is None:
+            cached = classify(text)
+            cache.set(text, model_version, cached)
+    """
+
+    def __init__(self, backend, namespace):
+        self.backend = backend
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'sets': 0, 'errors': 0, 'invalidations': 0}
+
+    def _count(self, counter):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def get(self, text, model_version):
+        try:
+            value = self.backend.get(make_key(self.namespace, model_version, text))
+        except Exception as e:
+            # A broken cache must never break classification
+            logger.warning(f"Result cache read failed: {e}")
+            self._count('errors')
+            return None
+
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, text, model_version, value):
+        try:
+            self.backend.set(make_key(self.namespace, model_version, text), value)
+            self._count('sets')
+        except Exception as e:
+            logger.warning(f"Result cache write failed: {e}")
+            self._count('errors')
+
+    def clear(self):
+        """Drop cached results (called when models are reloaded)"""
+        self.backend.clear()
+        self._count('invalidations')
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'backend': self.backend.name,
+            'namespace': self.namespace,
+            'hit_rate': round(stats['hits'] / lookups, 4) if lookups else 0.0,
+            'size': self.backend.size(),
+            'max_entries': getattr(self.backend, 'max_entries', None),
+            'ttl_seconds': self.backend.ttl
+        })
+        return stats
+
+
+def build_result_cache(namespace, backend='memory', max_entries=2048, ttl=None,
+                       cache_dir=None, django_alias='default'):
+    """Create a ResultCache, or None when backend is 'none'"""
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown result cache backend '{backend}', expected one of {CACHE_BACKENDS}")
+
+    if backend == 'none':
+        return None
+    if backend == 'memory':
+        return ResultCache(InProcessBackend(max_entries, ttl), namespace)
+    if backend == 'django':
+        return ResultCache(DjangoCacheBackend(django_alias, ttl, prefix=f"ai_result:{namespace}"), namespace)
+    return ResultCache(
+        DiskBackend(os.path.join(cache_dir or 'ai_models/cache', namespace), max_entries, ttl),
+        namespace
+    )
+
+
+def build_result_cache_from_settings(namespace):
+    """Create the cache configured by the AI_RESULT_CACHE_* Django settings"""
+    from django.conf import settings
+
+    return build_result_cache(
+        namespace,
+        backend=getattr(settings, 'AI_RESULT_CACHE_BACKEND', 'memory'),
+        max_entries=getattr(settings, 'AI_RESULT_CACHE_SIZE', 2048),
+        ttl=getattr(settings, 'AI_RESULT_CACHE_TTL', 0) or None,
+        cache_dir=getattr(settings, 'AI_RESULT_CACHE_DIR', None),
+        django_alias=getattr(settings, 'AI_RESULT_CACHE_ALIAS', 'default')
+    )
@@ -0,0 +1,411 @@
+"""
+Compiled Rule Engine for the rule-based complaint classifiers
+Compiles every keyword list and regex pattern of a classifier once, then scores all
+rule groups (categories / priority triggers) in a single pass over the text.
+
+score() handles one text; score_batch() scores a whole list / pandas Series at once
+using a sparse (texts x keywords) hit matrix.
+
+Scores are identical to the classifiers' _match_score():
+  keyword_score = min(keyword_hits / max(len(keywords) * keyword_weight, 1), 1.0)
+  pattern_score = min(pattern_hits / max(len(patterns) * pattern_weight, 1), 1.0) if patterns else 0
+  score         = keyword_share * keyword_score + pattern_share * pattern_score
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+
+def _trie_regex(words: List[str]) -> str:
+    """
+    Regex matching the longest of `words` that starts at the current position.
+    Built as a character trie, so the regex engine follows one branch per character
+    instead of trying every keyword in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        is_end = '' in node
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(item for item in node.items() if item[0] != '')
+        ]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 and not is_end else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: prefer the longer keyword, fall back to the one ending here
+        return body + '?' if is_end else body
+
+    return build(trie)
+
+
+def required_literals(pattern: str, flags: int = 0) -> Optional[Set[str]]:
+    r"""
+    Lower-cased strings of which at least one must occur in any match of `pattern`
+    (e.g. r'\b(theft|stolen)\b' -> {'theft', 'stolen'}), or None if none can be derived.
+    Used to skip regex searches that cannot succeed.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+
+    def from_sequence(items):
+        candidates = []
+        run = []
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                run.append(chr(av))
+                continue
+            if run:
+                candidates.append({''.join(run)})
+                run = []
+            if op is sre_parse.SUBPATTERN:
+                _, add_flags, del_flags, sub = av
+                if not add_flags and not del_flags:
+                    literals = from_sequence(sub)
+                    if literals:
+                        candidates.append(literals)
+            elif op is sre_parse.BRANCH:
+                alternatives = [from_sequence(branch) for branch in av[1]]
+                if all(alternatives):
+                    candidates.append(set().union(*alternatives))
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                literals = from_sequence(av[2])
+                if literals:
+                    candidates.append(literals)
+        if run:
+            candidates.append({''.join(run)})
+
+        # Only ASCII literals are safe: re.IGNORECASE folds some non-ASCII characters
+        # onto ASCII ones (e.g. U+017F matches 's')
+        candidates = [c for c in candidates if all(lit.isascii() for lit in c)]
+        if not candidates:
+            return None
+        # Most selective set: the one whose shortest literal is longest
+        return max(candidates, key=lambda c: min(len(lit) for lit in c))
+
+    literals = from_sequence(parsed)
+    return {lit.lower() for lit in literals} if literals else None
+
+
+class CompiledRuleSet:
+    """
+    All rule groups of one classifier, compiled once
+
+    Args:
+        groups: list of (group name, keywords, patterns)
+        keyword_weight / pattern_weight: divisors used by _match_score (hits / (n * weight))
+        keyword_share / pattern_share: weights of the combined score
+        lowercase_keywords: True if _match_score compares kw.lower() (enhanced classifier),
+                            False if it compares kw as written (base classifier)
+    """
+
+    def __init__(self, groups: List[Tuple[str, List[str], List[str]]], keyword_weight: float,
+                 pattern_weight: float, keyword_share: float, pattern_share: float,
+                 lowercase_keywords: bool = False):
+        self.group_names = [name for name, _, _ in groups]
+        self.keyword_weight = keyword_weight
+        self.pattern_weight = pattern_weight
+        self.keyword_share = keyword_share
+        self.pattern_share = pattern_share
+
+        # keyword -> [(group, times it appears in that group's list)]
+        keyword_groups = defaultdict(lambda: defaultdict(int))
+        # pattern string -> [(group, times)]
+        pattern_groups = defaultdict(lambda: defaultdict(int))
+        self.num_keywords = {}
+        self.num_patterns = {}
+
+        for name, keywords, patterns in groups:
+            self.num_keywords[name] = len(keywords)
+            self.num_patterns[name] = len(patterns)
+            for keyword in keywords:
+                keyword_groups[keyword.lower() if lowercase_keywords else keyword][name] += 1
+            for pattern in patterns:
+                pattern_groups[pattern][name] += 1
+
+        self.keyword_groups = {kw: list(counts.items()) for kw, counts in keyword_groups.items()}
+
+        # Each distinct pattern is evaluated once per text, even if several groups use it,
+        # and only when one of its required literals occurs in the text
+        self.patterns = [
+            (re.compile(pattern, re.IGNORECASE), required_literals(pattern, re.IGNORECASE),
+             list(counts.items()))
+            for pattern, counts in pattern_groups.items()
+        ]
+
+        # Keywords and pattern literals are found together in one scan
+        strings = set(self.keyword_groups)
+        for _, literals, _ in self.patterns:
+            strings.update(literals or ())
+
+        # '' is a substring of every text
+        self.always_found = {s for s in strings if s == ''}
+        strings = sorted((s for s in strings if s), key=len, reverse=True)
+
+        # All strings starting at one position are prefixes of the longest one found there
+        self.prefixes = {
+            string: [other for other in strings if string.startswith(other)]
+            for string in strings
+        }
+        self.scan_regex = (
+            re.compile('(?=(' + _trie_regex(strings) + '))') if strings else None
+        )
+
+        # Matrices for score_batch()
+        self.strings = strings
+        column = {string: i for i, string in enumerate(strings)}
+        group_column = {name: j for j, name in enumerate(self.group_names)}
+
+        # longest string found at a position -> every string found there
+        rows, cols = zip(*[
+            (column[string], column[prefix])
+            for string in strings for prefix in self.prefixes[string]
+        ]) if strings else ((), ())
+        self.prefix_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(strings), len(strings))
+        )
+
+        # string -> keyword hits per group (0 for pattern literals that are not keywords)
+        self.keyword_matrix = np.zeros((len(strings), len(self.group_names)), dtype=np.int64)
+        self.always_keyword_hits = np.zeros(len(self.group_names), dtype=np.int64)
+        for keyword, groups in self.keyword_groups.items():
+            for name, times in groups:
+                if keyword:
+                    self.keyword_matrix[column[keyword], group_column[name]] += times
+                else:
+                    self.always_keyword_hits[group_column[name]] += times
+
+        # pattern -> pattern hits per group, and the columns of its required literals
+        self.pattern_matrix = np.zeros((len(self.patterns), len(self.group_names)), dtype=np.int64)
+        self.literal_columns = []
+        for i, (_, literals, groups) in enumerate(self.patterns):
+            for name, times in groups:
+                self.pattern_matrix[i, group_column[name]] += times
+            self.literal_columns.append(
+                [column[lit] for lit in literals] if literals is not None else None
+            )
+
+        self.num_keywords_vector = np.array([self.num_keywords[n] for n in self.group_names])
+        self.num_patterns_vector = np.array([self.num_patterns[n] for n in self.group_names])
+
+    def strings_in(self, text_lower: str) -> set:
+        """Distinct keywords / pattern literals occurring as substrings of text_lower"""
+        found = set(self.always_found)
+        if self.scan_regex is not None:
+            prefixes = self.prefixes
+            for match in self.scan_regex.finditer(text_lower):
+                found.update(prefixes[match.group(1)])
+        return found
+
+    def hit_counts(self, text: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Per-group keyword and pattern hit counts (list multiplicity preserved)"""
+        text_lower = text.lower()
+        keyword_hits = dict.fromkeys(self.group_names, 0)
+        pattern_hits = dict.fromkeys(self.group_names, 0)
+
+        found = self.strings_in(text_lower)
+        for string in found:
+            for name, times in self.keyword_groups.get(string, ()):
+                keyword_hits[name] += times
+
+        # The literal prefilter is exact for ASCII text only (see required_literals)
+        prefilter = text_lower.isascii()
+        for regex, literals, groups in self.patterns:
+            if prefilter and literals is not None and found.isdisjoint(literals):
+                continue
+            if regex.search(text_lower):
+                for name, times in groups:
+                    pattern_hits[name] += times
+
+        return keyword_hits, pattern_hits
+
+    def combine(self, name: str, keyword_matches: int, pattern_matches: int) -> float:
+        """Same arithmetic as _match_score"""
+        num_patterns = self.num_patterns[name]
+        keyword_score = min(keyword_matches / max(self.num_keywords[name] * self.keyword_weight, 1), 1.0)
+        pattern_score = (
+            min(pattern_matches / max(num_patterns * self.pattern_weight, 1), 1.0) if num_patterns else 0
+        )
+        return self.keyword_share * keyword_score + self.pattern_share * pattern_score
+
+    def score(self, text: str) -> Dict[str, float]:
+        """Score every group for one text: {group name: score}"""
+        keyword_hits, pattern_hits = self.hit_counts(text)
+        return {
+            name: self.combine(name, keyword_hits[name], pattern_hits[name])
+            for name in self.group_names
+        }
+
+    # ------------------------------------------------------------------
+    # Batch scoring
+    # ------------------------------------------------------------------
+
+    def hit_matrix(self, texts_lower: List[str]) -> sparse.csr_matrix:
+        """
+        Sparse (texts x strings) presence matrix of keywords / pattern literals
+
+        The texts are joined with NUL (which no keyword contains) and scanned in one
+        regex pass; match offsets are mapped back to rows with searchsorted.
+        """
+        n_texts = len(texts_lower)
+        if self.scan_regex is None or n_texts == 0:
+            return sparse.csr_matrix((n_texts, len(self.strings)), dtype=np.int32)
+
+        corpus = '\x00'.join(texts_lower)
+        lengths = np.fromiter((len(t) + 1 for t in texts_lower), dtype=np.int64, count=n_texts)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        column = {string: i for i, string in enumerate(self.strings)}
+        positions = []
+        longest = []
+        for match in self.scan_regex.finditer(corpus):
+            positions.append(match.start())
+            longest.append(column[match.group(1)])
+
+        rows = np.searchsorted(offsets, positions, side='right') - 1
+        longest_hits = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, longest)),
+            shape=(n_texts, len(self.strings))
+        )
+        hits = (longest_hits @ self.prefix_matrix).tocsr()
+        hits.data[:] = 1
+        return hits
+
+    def batch_hit_counts(self, texts) -> Tuple[np.ndarray, np.ndarray]:
+        """(texts x groups) keyword and pattern hit counts; texts is a list or pandas Series"""
+        texts_lower = [text.lower() if isinstance(text, str) else '' for text in texts]
+        n_texts = len(texts_lower)
+
+        hits = self.hit_matrix(texts_lower)
+        keyword_hits = np.asarray(hits @ self.keyword_matrix) + self.always_keyword_hits
+
+        # Regex searches only on rows that contain a required literal (or are non-ASCII)
+        hits_by_column = hits.tocsc()
+        non_ascii = np.fromiter((not t.isascii() for t in texts_lower), dtype=bool, count=n_texts)
+        pattern_found = np.zeros((n_texts, len(self.patterns)), dtype=np.int64)
+
+        for j, (regex, _, _) in enumerate(self.patterns):
+            literal_columns = self.literal_columns[j]
+            if literal_columns is None:
+                candidates = range(n_texts)
+            else:
+                has_literal = np.asarray(hits_by_column[:, literal_columns].sum(axis=1)).ravel() > 0
+                candidates = np.flatnonzero(has_literal | non_ascii)
+            search = regex.search
+            matched = [i for i in candidates if search(texts_lower[i])]
+            pattern_found[matched, j] = 1
+
+        pattern_hits = pattern_found @ self.pattern_matrix
+        return keyword_hits, pattern_hits
+
+    def score_batch(self, texts) -> np.ndarray:
+        """
+        Score every group for many texts at once
+        Returns an array of shape (len(texts), len(group_names)); non-string entries
+        (e.g. NaN in a Series) score as empty text
+        """
+        keyword_hits, pattern_hits = self.batch_hit_counts(texts)
+
+        keyword_score = np.minimum(
+            keyword_hits / np.maximum(self.num_keywords_vector * self.keyword_weight, 1), 1.0
+        )
+        pattern_score = np.where(
+            self.num_patterns_vector > 0,
+            np.minimum(pattern_hits / np.maximum(self.num_patterns_vector * self.pattern_weight, 1), 1.0),
+            0.0
+        )
+        return self.keyword_share * keyword_score + self.pattern_share * pattern_score
+
+
+def benchmark(data_path: str, repeat: int = 3, batch_rows: int = 100000):
+    """
+    Compare the compiled engine with the per-group _match_score() calls on a CSV of complaints,
+    then score_batch() with per-row score() on the texts repeated to batch_rows rows;
+    raises AssertionError if any score differs
+    """
+    import csv
+    import time
+    from ai_models.hybrid_classifier import RuleBasedClassifier
+    from ai_models.enhanced_hybrid_classifier import EnhancedRuleBasedClassifier
+
+    with open(data_path, encoding='utf-8') as f:
+        texts = [row['Complaint Description'] for row in csv.DictReader(f)]
+
+    print(f"\n{'='*70}")
+    print("  Rule Engine Benchmark")
+    print(f"{'='*70}")
+    print(f"Texts: {len(texts)}, repeats: {repeat}\n")
+
+    for classifier in (RuleBasedClassifier(), EnhancedRuleBasedClassifier()):
+        groups = classifier._rule_groups()
+        engine = classifier._engine
+
+        def reference(text):
+            return {
+                name: classifier._match_score(text, keywords, patterns)
+                for name, keywords, patterns in groups
+            }
+
+        for text in texts:
+            assert engine.score(text) == reference(text), f"Score mismatch for: {text}"
+
+        timings = {}
+        for label, func in (('per-group _match_score', reference), ('compiled engine', engine.score)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for text in texts:
+                    func(text)
+            timings[label] = (time.perf_counter() - start) / repeat
+
+        speedup = timings['per-group _match_score'] / timings['compiled engine']
+        print(f"{type(classifier).__name__} ({len(groups)} groups) - scores identical")
+        for label, seconds in timings.items():
+            print(f"  {label:<24} {seconds * 1000:8.1f} ms  ({seconds / len(texts) * 1e6:.1f} us/text)")
+        print(f"  speedup: {speedup:.1f}x\n")
+
+        if batch_rows:
+            rows = (texts * (batch_rows // max(len(texts), 1) + 1))[:batch_rows]
+
+            start = time.perf_counter()
+            per_row = np.array([list(engine.score(text).values()) for text in rows])
+            per_row_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch = engine.score_batch(rows)
+            batch_seconds = time.perf_counter() - start
+
+            assert np.array_equal(per_row, batch), "score_batch() differs from score()"
+            print(f"  {len(rows)} rows - batch scores identical")
+            print(f"  {'per-row score()':<24} {per_row_seconds * 1000:8.1f} ms")
+            print(f"  {'score_batch()':<24} {batch_seconds * 1000:8.1f} ms")
+            print(f"  speedup: {per_row_seconds / batch_seconds:.1f}x\n")
+
+
+# Benchmark script
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the compiled rule engine')
+    parser.add_argument('--data', default='../Railway_Complaints_Final_Validated.csv')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--batch-rows', type=int, default=100000,
+                        help='Rows for the score_batch() comparison (0 to skip)')
+    args = parser.parse_args()
+
+    benchmark(args.data, args.repeat, args.batch_rows)
@@ -0,0 +1,133 @@
+"""
+Tokenization Cache for the Enhanced Complaint Classifiers
+The four standalone models are fine-tuned from the same DistilBERT checkpoint, so their
+tokenizers are normally identical. Tokenizers are grouped by a fingerprint of their
+vocabulary and settings, and the token ids of a text are computed once per group and
+shared by every head in it. Recent encodings are kept in a small LRU keyed by a hash
+of the text, which also covers retried / duplicate submissions.
+"""
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+# Tokenizer settings that change the produced token ids (paths are left out on purpose:
+# the same vocabulary saved next to every model must still compare equal)
+FINGERPRINT_KWARGS = (
+    'do_lower_case', 'strip_accents', 'tokenize_chinese_chars', 'never_split', 'model_max_length'
+)
+
+
+def tokenizer_fingerprint(tokenizer):
+    """Hash of the vocabulary, special tokens and settings of a tokenizer"""
+    digest = hashlib.sha1()
+    digest.update(type(tokenizer).__name__.encode())
+    settings = {key: tokenizer.init_kwargs.get(key) for key in FINGERPRINT_KWARGS}
+    settings.update({
+        'padding_side': tokenizer.padding_side,
+        'truncation_side': tokenizer.truncation_side,
+        'special_tokens': tokenizer.special_tokens_map
+    })
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(sorted(tokenizer.get_vocab().items())).encode())
+    return digest.hexdigest()[:16]
+
+
+class TokenizationCache:
+    """
+    Thread-safe LRU of token ids (truncated, with special tokens, not padded)
+
+    Usage:
+        inputs = cache.encode(tokenizer, texts)
+        model(input_ids=inputs['input_ids'], attention_mask=inputs['attention_mask'])
+    """
+
+    def __init__(self, max_entries=512, max_length=128):
+        self.max_entries = max_entries
+        self.max_length = max_length
+        self._entries = OrderedDict()
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def fingerprint(self, tokenizer):
+        """Fingerprint of a tokenizer, computed once per tokenizer object"""
+        key = id(tokenizer)
+        if key not in self._fingerprints:
+            # Keep a reference so the id cannot be reused by another tokenizer
+            self._fingerprints[key] = (tokenizer, tokenizer_fingerprint(tokenizer))
+        return self._fingerprints[key][1]
+
+    def _key(self, fingerprint, text):
+        return fingerprint, hashlib.sha256(text.encode('utf-8')).digest()
+
+    def token_ids(self, tokenizer, texts):
+        """Token ids of every text; only texts not seen recently are tokenized"""
+        fingerprint = self.fingerprint(tokenizer)
+        keys = [self._key(fingerprint, text) for text in texts]
+        ids = [None] * len(texts)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    ids[i] = entry
+            missing = [i for i, entry in enumerate(ids) if entry is None]
+            self._stats['hits'] += len(texts) - len(missing)
+            self._stats['misses'] += len(missing)
+
+        if missing:
+            encoded = tokenizer(
+                [texts[i] for i in missing],
+                max_length=self.max_length,
+                truncation=True
+            )['input_ids']
+
+            with self._lock:
+                for i, token_ids in zip(missing, encoded):
+                    ids[i] = tuple(token_ids)
+                    if self.max_entries:
+                        self._entries[keys[i]] = ids[i]
+                        self._entries.move_to_end(keys[i])
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return ids
+
+    def pad(self, tokenizer, ids, length=None):
+        """
+        input_ids / attention_mask tensors for token ids from token_ids(), padded to
+        `length` or, by default, to the longest sequence (a single text is not padded)
+        """
+        return tokenizer.pad(
+            {'input_ids': [list(token_ids) for token_ids in ids]},
+            padding='max_length' if length else 'longest',
+            max_length=length,
+            return_tensors='pt'
+        )
+
+    def encode(self, tokenizer, texts, length=None):
+        """
+        Same tensors as tokenizer(texts, max_length=max_length, truncation=True,
+        padding=..., return_tensors='pt'), padded as in pad()
+        """
+        return self.pad(tokenizer, self.token_ids(tokenizer, texts), length)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'hit_rate': round(stats['hits'] / lookups, 4) if lookups else 0.0,
+            'max_entries': self.max_entries
+        })
+        return stats
@@ -250,6 +250,68 @@ CLOUDINARY_CLOUD_NAME = os.getenv('CLOUDINARY_CLOUD_NAME')
 CLOUDINARY_API_KEY = os.getenv('CLOUDINARY_API_KEY')
 CLOUDINARY_API_SECRET = os.getenv('CLOUDINARY_API_SECRET')
 
+# AI Complaint Classifier Configuration
+AI_MODEL_DIR = os.getenv('AI_MODEL_DIR', 'ai_models/models/enhanced')
+# Use the shared-encoder multi-task model (ai_models/models/enhanced/multitask_model/)
+AI_CLASSIFIER_MULTITASK = os.getenv('AI_CLASSIFIER_MULTITASK', 'False').lower() == 'true'
+# Inference backend: torch (fp32), torch-int8 (dynamic quantization) or onnx (ONNX Runtime)
+AI_INFERENCE_BACKEND = os.getenv('AI_INFERENCE_BACKEND', 'torch')
+# Rule-first fast path: skip Priority/Severity models when a rule decides them anyway
+AI_RULE_SHORT_CIRCUIT = os.getenv('AI_RULE_SHORT_CIRCUIT', 'True').lower() == 'true'
+# Optional: also skip the Category model above this rule confidence (e.g. 0.95); changes results
+AI_RULE_CATEGORY_SHORT_CIRCUIT = float(os.getenv('AI_RULE_CATEGORY_SHORT_CIRCUIT', '0')) or None
+# Micro-batch concurrent classify_complaint() calls into one forward pass; only requests
+# served by threads of the same process are merged (gunicorn.conf.py then runs
+# GUNICORN_THREADS gthread threads per worker; a single-threaded worker skips the wait)
+AI_MICRO_BATCHING = os.getenv('AI_MICRO_BATCHING', 'False').lower() == 'true'
+AI_BATCH_MAX_SIZE = int(os.getenv('AI_BATCH_MAX_SIZE', '16'))
+AI_BATCH_MAX_WAIT_MS = float(os.getenv('AI_BATCH_MAX_WAIT_MS', '8'))
+# Classification result cache: none, memory (per process), django (CACHES alias) or disk
+AI_RESULT_CACHE_BACKEND = os.getenv('AI_RESULT_CACHE_BACKEND', 'memory')
+AI_RESULT_CACHE_SIZE = int(os.getenv('AI_RESULT_CACHE_SIZE', '2048'))
+AI_RESULT_CACHE_TTL = int(os.getenv('AI_RESULT_CACHE_TTL', '0'))  # seconds, 0 = no expiry
+AI_RESULT_CACHE_ALIAS = os.getenv('AI_RESULT_CACHE_ALIAS', 'default')
+AI_RESULT_CACHE_DIR = os.getenv('AI_RESULT_CACHE_DIR', os.path.join(BASE_DIR, 'ai_models', 'cache'))
+# Recent complaint texts whose token ids are kept for reuse (0 = no LRU)
+AI_TOKENIZATION_CACHE_SIZE = int(os.getenv('AI_TOKENIZATION_CACHE_SIZE', '512'))
+# Load each standalone model on first use instead of at startup (weights are memory-mapped)
+AI_LAZY_MODEL_HEADS = os.getenv('AI_LAZY_MODEL_HEADS', 'True').lower() == 'true'
+# Versioned model registry (python manage.py model_registry ...); workers re-check the active
+# version pointer every AI_MODEL_REGISTRY_POLL_SECONDS and hot-swap to it in the background
+AI_MODEL_REGISTRY_DIR = os.getenv('AI_MODEL_REGISTRY_DIR', os.path.join(BASE_DIR, 'ai_models', 'registry'))
+AI_MODEL_REGISTRY_POLL_SECONDS = float(os.getenv('AI_MODEL_REGISTRY_POLL_SECONDS', '5'))
+# Categorizer training jobs (POST /ai/train-model/): parallel CV folds (-1 = all cores), and
+# minutes without progress after which a queued/running job is marked failed (its process died)
+AI_TRAINING_N_JOBS = int(os.getenv('AI_TRAINING_N_JOBS', '-1'))
+AI_TRAINING_JOB_TIMEOUT_MINUTES = int(os.getenv('AI_TRAINING_JOB_TIMEOUT_MINUTES', '60'))
+# Online categorizer: hashing features + SGD updated with partial_fit from closed complaints
+# (admin re-classifications included), batched per AI_ONLINE_UPDATE_INTERVAL_SECONDS
+AI_CATEGORIZER_ONLINE = os.getenv('AI_CATEGORIZER_ONLINE', 'False').lower() == 'true'
+AI_ONLINE_BATCH_SIZE = int(os.getenv('AI_ONLINE_BATCH_SIZE', '64'))
+AI_ONLINE_UPDATE_INTERVAL_SECONDS = float(os.getenv('AI_ONLINE_UPDATE_INTERVAL_SECONDS', '60'))
+AI_ONLINE_N_FEATURES = int(os.getenv('AI_ONLINE_N_FEATURES', str(2 ** 16)))
+AI_ONLINE_KEEP_VERSIONS = int(os.getenv('AI_ONLINE_KEEP_VERSIONS', '10'))
+# Seconds behind the online cursor re-read for complaints whose close committed late
+AI_ONLINE_CURSOR_OVERLAP_SECONDS = int(os.getenv('AI_ONLINE_CURSOR_OVERLAP_SECONDS', '300'))
+
+# Staff assignment: in-memory workload index (complaints/workload_index.py), rebuilt from
+# the database every WORKLOAD_INDEX_RECONCILE_SECONDS
+WORKLOAD_INDEX_ENABLED = os.getenv('WORKLOAD_INDEX_ENABLED', 'True').lower() == 'true'
+WORKLOAD_INDEX_RECONCILE_SECONDS = float(os.getenv('WORKLOAD_INDEX_RECONCILE_SECONDS', '60'))
+# Expertise index (complaints/expertise_index.py): rebuilt when Staff changes bump its version
+# in the cache (shared caches only), and at least every EXPERTISE_INDEX_REFRESH_SECONDS (0 = never)
+EXPERTISE_INDEX_REFRESH_SECONDS = float(os.getenv('EXPERTISE_INDEX_REFRESH_SECONDS', '60'))
+# Open complaints a staff member can hold before ticket reservation skips it (0 = no limit)
+STAFF_MAX_ACTIVE_TICKETS = int(os.getenv('STAFF_MAX_ACTIVE_TICKETS', '0'))
+# Analytics dashboard response cache (complaints/dashboard_cache.py): entries are fresh for
+# DASHBOARD_CACHE_TTL seconds or until a write, then served stale while rebuilt in the background
+DASHBOARD_CACHE_ENABLED = os.getenv('DASHBOARD_CACHE_ENABLED', 'True').lower() == 'true'
+DASHBOARD_CACHE_ALIAS = os.getenv('DASHBOARD_CACHE_ALIAS', 'default')
+DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', '15'))
+DASHBOARD_CACHE_STALE_SECONDS = int(os.getenv('DASHBOARD_CACHE_STALE_SECONDS', '120'))
+# Load the classifier when the WSGI app is imported (in the gunicorn master with preload_app)
+AI_PRELOAD_MODELS = os.getenv('AI_PRELOAD_MODELS', 'False').lower() == 'true'
+
 # Firebase Configuration - Secure Environment Variable Based Setup
 if not firebase_admin._apps:
     try:
@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Optionally load the AI models now instead of on the first complaint. Under gunicorn
+# with preload_app (gunicorn.conf.py, AI_PRELOAD_MODELS=True) this module is imported
+# once in the master, so all workers share one copy of the weights after fork.
+from django.conf import settings  # noqa: E402
+
+if getattr(settings, 'AI_PRELOAD_MODELS', False):
+    from complaints.views import preload_ai_classifier
+    preload_ai_classifier()
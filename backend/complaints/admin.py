@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Complaint, Feedback, Staff, QuickSolution, SolutionApplication
+from .models import Complaint, DailyComplaintStats, Feedback, Staff, QuickSolution, SolutionApplication, TrainingJob
 
 class ComplaintAdmin(admin.ModelAdmin):
     list_display = ('id', 'type', 'status', 'severity', 'date_of_incident')
@@ -28,9 +28,20 @@ class SolutionApplicationAdmin(admin.ModelAdmin):
     search_fields = ('solution__problem', 'applied_by', 'feedback')
     readonly_fields = ('applied_at',)
 
+class DailyComplaintStatsAdmin(admin.ModelAdmin):
+    list_display = ('date', 'type', 'status', 'staff', 'severity', 'created_count', 'resolved_count')
+    list_filter = ('status', 'severity', 'date')
+    search_fields = ('type', 'staff')
+
+class TrainingJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'progress', 'registry_version', 'duration_seconds', 'created_at')
+    list_filter = ('status',)
+    readonly_fields = ('created_at', 'started_at', 'progress_at', 'finished_at', 'duration_seconds')
+
 admin.site.register(Complaint, ComplaintAdmin)
 admin.site.register(Feedback, FeedbackAdmin)
 admin.site.register(Staff, StaffAdmin)
 admin.site.register(QuickSolution, QuickSolutionAdmin)
 admin.site.register(SolutionApplication, SolutionApplicationAdmin)
-
+admin.site.register(TrainingJob, TrainingJobAdmin)
+admin.site.register(DailyComplaintStats, DailyComplaintStatsAdmin)
\ No newline at end of file
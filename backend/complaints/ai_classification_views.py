@@ -161,6 +161,8 @@ def classify_batch_complaints_view(request):
                 'error': 'Classification service initialization failed'
             }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         
+        # Keep response order; empty descriptions are reported in place
+        pending = []
         for item in complaints:
             complaint_id = item.get('id')
             description = item.get('description', '')
@@ -173,9 +175,37 @@ def classify_batch_complaints_view(request):
                 })
                 continue
             
+            results.append(None)
+            pending.append((len(results) - 1, complaint_id, description))
+        
+        # Prefer the enhanced classifier's batched path (one forward pass per model)
+        from .views import get_ai_classifier
+        classifier = get_ai_classifier()
+        
+        if classifier is not None and pending:
+            try:
+                batch_results = classifier.classify_batch(
+                    [description for _, _, description in pending],
+                    return_details=True
+                )
+                for (index, complaint_id, _), classification in zip(pending, batch_results):
+                    results[index] = {
+                        'id': complaint_id,
+                        'success': True,
+                        'category': classification['category'],
+                        'staff_assignment': classification['staff'],
+                        'priority': classification['priority'],
+                        'severity': classification['severity'],
+                        'confidence_scores': classification.get('confidences', {})
+                    }
+                pending = []
+            except Exception as e:
+                logger.error(f"Batch classification failed, classifying one by one: {e}")
+        
+        for index, complaint_id, description in pending:
             try:
                 classification = classify_complaint(description)
-                results.append({
+                results[index] = {
                     'id': complaint_id,
                     'success': True,
                     'category': classification['category'],
@@ -183,14 +213,14 @@ def classify_batch_complaints_view(request):
                     'priority': classification['priority'],
                     'severity': classification['severity'],
                     'confidence_scores': classification.get('confidence_scores', {})
-                })
+                }
             except Exception as e:
                 logger.error(f"Error classifying complaint {complaint_id}: {e}")
-                results.append({
+                results[index] = {
                     'id': complaint_id,
                     'success': False,
                     'error': str(e)
-                })
+                }
         
         return Response({
             'success': True,
@@ -240,6 +270,12 @@ def get_classification_info(request):
         
         info = service.get_model_info()
         
+        # Enhanced classifier used by file_complaint (includes micro-batching metrics when enabled)
+        from .views import get_ai_classifier
+        classifier = get_ai_classifier()
+        if classifier is not None:
+            info['enhanced_classifier'] = classifier.get_model_info()
+        
         return Response({
             'success': True,
             **info
@@ -327,11 +363,14 @@ def health_check(request):
     
     GET /api/complaints/ai-health/
     """
+    from .views import get_ai_model_versions
+    
     try:
         if not CLASSIFICATION_AVAILABLE:
             return Response({
                 'status': 'unavailable',
-                'message': 'AI classification service is not installed'
+                'message': 'AI classification service is not installed',
+                'model_versions': get_ai_model_versions()
             }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         
         service = get_classification_service()
@@ -339,7 +378,8 @@ def health_check(request):
         if service is None:
             return Response({
                 'status': 'error',
-                'message': 'Classification service failed to initialize'
+                'message': 'Classification service failed to initialize',
+                'model_versions': get_ai_model_versions()
             }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         
         # Test classification
@@ -350,7 +390,8 @@ def health_check(request):
             'message': 'AI classification service is running',
             'model_type': service.config['model_type'],
             'device': str(service.device),
-            'test_result': test_result
+            'test_result': test_result,
+            'model_versions': get_ai_model_versions()
         }, status=status.HTTP_200_OK)
     
     except Exception as e:
@@ -359,3 +400,57 @@ def health_check(request):
             'status': 'error',
             'message': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def readiness_check(request):
+    """
+    Readiness of the enhanced classifier in the worker answering the request
+    
+    GET /api/complaints/ai/ready/
+    
+    Returns 200 once the models are loaded (503 while loading or after a failure),
+    with this worker's memory usage. Workers forked from a preloading master report
+    "shared_from_master": true and a PSS well below their RSS.
+    """
+    import os
+    from django.conf import settings
+    from ai_models.preload import memory_report
+    from .views import get_ai_classifier, get_ai_classifier_state
+    
+    try:
+        state = get_ai_classifier_state()
+        
+        # Without preloading, the first probe warms this worker up
+        if state['status'] == 'not_loaded' and not getattr(settings, 'AI_PRELOAD_MODELS', False):
+            get_ai_classifier()
+            state = get_ai_classifier_state()
+        
+        ready = state['status'] == 'ready'
+        body = {
+            'status': state['status'],
+            'ready': ready,
+            'pid': os.getpid(),
+            'preloaded': state['preloaded'],
+            'shared_from_master': ready and state['loaded_in_pid'] != os.getpid(),
+            'load_seconds': state['load_seconds'],
+            'memory': memory_report()
+        }
+        if state['error']:
+            body['error'] = state['error']
+        if body['shared_from_master']:
+            body['master_memory'] = memory_report(os.getppid())
+        
+        return Response(
+            body,
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    
+    except Exception as e:
+        logger.exception("Error in readiness_check")
+        return Response({
+            'status': 'error',
+            'ready': False,
+            'message': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -7,9 +7,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from django.db.models import Q, Count
 from django.utils import timezone
-from .models import Complaint, Staff
+from .models import Complaint, Staff, TrainingJob
+from .training_jobs import start_training_job, training_job_to_dict
 from ai_models.complaint_categorizer import complaint_categorizer
 import logging
 import json
@@ -34,10 +36,11 @@ def categorize_complaint(request):
         # Get AI prediction
         prediction = complaint_categorizer.predict_category(complaint_text)
         
-        # Get staff assignment
+        # Suggested staff assignment (a preview: no ticket is reserved)
         staff_assignment = complaint_categorizer.get_staff_assignment(
             prediction['category'], 
-            location
+            location,
+            reserve=False
         )
         
         return Response({
@@ -72,26 +75,31 @@ def create_smart_complaint(request):
         category = prediction['category']
         confidence = prediction['confidence']
         
-        # Get staff assignment
-        staff_assignment = complaint_categorizer.get_staff_assignment(
-            category, 
-            data.get('location', '')
-        )
-        
-        # Create complaint with AI-generated data
-        complaint = Complaint.objects.create(
-            type=prediction['category_info'].get('name', category.replace('_', ' ').title()),
-            description=complaint_text,
-            location=data.get('location', ''),
-            train_number=data.get('train_number', ''),
-            pnr_number=data.get('pnr_number', ''),
-            date_of_incident=data.get('date_of_incident'),
-            priority=staff_assignment.get('priority', 'Medium'),
-            staff=staff_assignment.get('staff_name', 'Unassigned'),
-            photos=data.get('photos', ''),
-            user_id=data.get('user_id'),
-            resolution_notes=f"Auto-categorized as '{category}' with {confidence:.2%} confidence. Assigned to {staff_assignment.get('staff_role', 'customer_service')} department."
-        )
+        # Reserve the staff ticket and create the complaint together: if the complaint
+        # can't be saved the reservation is rolled back
+        with transaction.atomic():
+            staff_assignment = complaint_categorizer.get_staff_assignment(
+                category, 
+                data.get('location', '')
+            )
+            
+            # Create complaint with AI-generated data
+            complaint = Complaint(
+                type=prediction['category_info'].get('name', category.replace('_', ' ').title()),
+                description=complaint_text,
+                location=data.get('location', ''),
+                train_number=data.get('train_number', ''),
+                pnr_number=data.get('pnr_number', ''),
+                date_of_incident=data.get('date_of_incident'),
+                priority=staff_assignment.get('priority', 'Medium'),
+                staff=staff_assignment.get('staff_name', 'Unassigned'),
+                photos=data.get('photos', ''),
+                user_id=data.get('user_id'),
+                resolution_notes=f"Auto-categorized as '{category}' with {confidence:.2%} confidence. Assigned to {staff_assignment.get('staff_role', 'customer_service')} department."
+            )
+            if staff_assignment.get('reserved'):
+                complaint._reserved_ticket = complaint.staff
+            complaint.save()
         
         # Store AI metadata
         ai_metadata = {
@@ -242,17 +250,9 @@ def resolve_complaint(request, complaint_id):
         complaint.resolved_by = staff_name
         complaint.resolved_at = timezone.now()
         complaint.resolution_notes = resolution_notes
+        # Releases the assigned staff member's ticket (complaints/signals.py)
         complaint.save()
         
-        # Update staff active tickets count
-        try:
-            staff = Staff.objects.get(name=staff_name)
-            if staff.active_tickets > 0:
-                staff.active_tickets -= 1
-                staff.save()
-        except Staff.DoesNotExist:
-            pass
-        
         return Response({
             'message': 'Complaint resolved successfully',
             'complaint_id': complaint.id,
@@ -269,19 +269,22 @@ def resolve_complaint(request, complaint_id):
 @api_view(['POST'])
 def train_ai_model(request):
     """
-    Manually trigger AI model training
+    Start a background training job for the AI model
+    Returns immediately with the job; poll training_job_status for progress and metrics.
+    If a job is already queued or running, that job is returned instead.
     """
     try:
         force_retrain = request.data.get('force_retrain', False)
+        requested_by = request.user.get_username() if request.user.is_authenticated else None
         
-        # Train the model
-        training_result = complaint_categorizer.train_model(retrain=force_retrain)
+        job, created = start_training_job(force_retrain=force_retrain, requested_by=requested_by)
         
         return Response({
-            'training_result': training_result,
-            'model_info': complaint_categorizer.get_model_info(),
+            'job': training_job_to_dict(job),
+            'created': created,
+            'status_url': f'/api/complaints/ai/train-model/jobs/{job.pk}/',
             'timestamp': timezone.now().isoformat()
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_202_ACCEPTED)
         
     except Exception as e:
         logger.error(f"Error in train_ai_model: {str(e)}")
@@ -289,6 +292,27 @@ def train_ai_model(request):
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+def training_job_status(request, job_id):
+    """
+    Status, progress, metrics and duration of one training job
+    """
+    job = get_object_or_404(TrainingJob, pk=job_id)
+    response = {'job': training_job_to_dict(job)}
+    if job.status == 'succeeded':
+        response['model_info'] = complaint_categorizer.get_model_info()
+    return Response(response, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def training_jobs(request):
+    """
+    Most recent training jobs, newest first
+    """
+    jobs = TrainingJob.objects.all()[:20]
+    return Response({
+        'jobs': [training_job_to_dict(job) for job in jobs]
+    }, status=status.HTTP_200_OK)
+
 @api_view(['GET'])
 def ai_model_status(request):
     """
@@ -303,8 +327,11 @@ def ai_model_status(request):
             count=Count('type')
         ).order_by('-count')
         
+        from .views import get_ai_model_versions
+        
         return Response({
             'model_info': model_info,
+            'model_versions': get_ai_model_versions(),
             'categories': complaint_categorizer.CATEGORIES,
             'statistics': {
                 'total_complaints': total_complaints,
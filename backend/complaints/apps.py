@@ -1,6 +1,29 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class ComplaintsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'complaints'
+    
+    def ready(self):
+        # Import signal handlers
+        from .models import Complaint, Feedback, Staff
+        from .signals import (
+            complaint_deleted, complaint_saved, complaint_stats_changed, complaint_stats_deleted,
+            complaint_tickets_changed, complaint_tickets_deleted, complaint_workload_changed,
+            dashboard_data_changed, staff_deleted, staff_saved
+        )
+        post_save.connect(complaint_saved, sender=Complaint)
+        post_save.connect(complaint_workload_changed, sender=Complaint)
+        post_save.connect(complaint_tickets_changed, sender=Complaint)
+        post_save.connect(complaint_stats_changed, sender=Complaint)
+        post_delete.connect(complaint_deleted, sender=Complaint)
+        post_delete.connect(complaint_tickets_deleted, sender=Complaint)
+        post_delete.connect(complaint_stats_deleted, sender=Complaint)
+        post_save.connect(staff_saved, sender=Staff)
+        post_delete.connect(staff_deleted, sender=Staff)
+        # The dashboards count accounts.Staff as well as the complaints app's Staff
+        for model in (Complaint, Feedback, Staff, 'accounts.Staff'):
+            post_save.connect(dashboard_data_changed, sender=model)
+            post_delete.connect(dashboard_data_changed, sender=model)
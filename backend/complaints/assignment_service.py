@@ -6,8 +6,11 @@ Assigns complaints to specific staff members based on:
 3. Severity of existing complaints (prefer staff with lighter workload)
 """
 
-from django.db.models import Count, Q, F
+from django.conf import settings
+from django.db.models import Count, Q
 from .models import Complaint, Staff
+from functools import lru_cache
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,16 +38,55 @@ class ComplaintAssignmentService:
     # Default expertise for categories
     DEFAULT_EXPERTISE = ['General Inquiries', 'Complaint Resolution', 'Passenger Assistance']
     
+    OPEN_STATUSES = ['Open', 'In Progress']
+    
     @staticmethod
-    def get_staff_expertise(staff):
-        """Extract expertise from staff JSON field"""
-        import json
+    @lru_cache(maxsize=4096)
+    def parse_expertise(raw_expertise):
+        """Expertise JSON as a frozenset, cached by the raw string (staff rarely change it)"""
         try:
-            if isinstance(staff.expertise, str):
-                return json.loads(staff.expertise)
-            return staff.expertise or []
-        except:
-            return []
+            expertise = json.loads(raw_expertise)
+        except (TypeError, ValueError):
+            return frozenset()
+        if isinstance(expertise, str):
+            return frozenset([expertise])
+        if isinstance(expertise, list):
+            return frozenset(item for item in expertise if isinstance(item, str))
+        return frozenset()
+    
+    @staticmethod
+    def get_required_expertise(complaint_category):
+        """Expertise areas that qualify staff for a complaint category"""
+        return ComplaintAssignmentService.CATEGORY_TO_EXPERTISE.get(
+            (complaint_category or '').lower(),
+            ComplaintAssignmentService.DEFAULT_EXPERTISE
+        )
+    
+    @staticmethod
+    def get_open_workloads(staff_names=None):
+        """
+        Open and open high-severity complaint counts per staff name, from one grouped query
+        
+        Args:
+            staff_names: Only count complaints of these staff (default: everybody)
+        
+        Returns:
+            Dict of staff name -> (open_complaints, severe_complaints)
+        """
+        complaints = Complaint.objects.filter(
+            status__in=ComplaintAssignmentService.OPEN_STATUSES,
+            staff__isnull=False
+        )
+        if staff_names is not None:
+            complaints = complaints.filter(staff__in=list(staff_names))
+        rows = complaints.values('staff').annotate(
+            open_complaints=Count('id'),
+            severe_complaints=Count('id', filter=Q(severity='High'))
+        ).order_by()
+        return {
+            row['staff']: (row['open_complaints'], row['severe_complaints'])
+            for row in rows
+        }
     
     @staticmethod
     def find_best_staff(complaint_category, severity='Medium'):
@@ -59,46 +101,29 @@ class ComplaintAssignmentService:
             Staff object or None
         """
         # Get required expertise for this category
-        required_expertise = ComplaintAssignmentService.CATEGORY_TO_EXPERTISE.get(
-            complaint_category.lower(),
-            ComplaintAssignmentService.DEFAULT_EXPERTISE
-        )
+        required_expertise = ComplaintAssignmentService.get_required_expertise(complaint_category)
         
         logger.info(f"Finding staff for category: {complaint_category}, severity: {severity}, expertise: {required_expertise}")
         
-        # Get all active staff
-        staff_list = Staff.objects.filter(status='active').all()
+        # Eligible staff come from the inverted expertise index (a set lookup); only they
+        # are scored, from one grouped query of their open / severe complaint counts
+        from .expertise_index import expertise_index
         
-        if not staff_list.exists():
-            logger.warning("No active staff members found!")
+        eligible_names = expertise_index.staff_names(sorted(expertise_index.staff_for_category(complaint_category)))
+        
+        if not eligible_names:
+            logger.warning(f"⚠️ No suitable staff found for category: {complaint_category}")
             return None
         
+        workloads = ComplaintAssignmentService.get_open_workloads(eligible_names.values())
+        
         # Score each staff member
         best_staff = None
         best_score = -999
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
-        for staff in staff_list:
-            staff_expertise = ComplaintAssignmentService.get_staff_expertise(staff)
-            
-            # Check if staff has matching expertise
-            expertise_match = any(exp in staff_expertise for exp in required_expertise)
-            
-            if not expertise_match:
-                logger.info(f"  {staff.name}: No expertise match (has {staff_expertise})")
-                continue
-            
-            # Count current assignments
-            current_complaints = Complaint.objects.filter(
-                staff=staff.name,
-                status__in=['Open', 'In Progress']
-            ).count()
-            
-            # Count severe complaints (High priority/severity)
-            severe_complaints = Complaint.objects.filter(
-                staff=staff.name,
-                status__in=['Open', 'In Progress'],
-                severity='High'
-            ).count()
+        for staff_id, staff_name in eligible_names.items():
+            current_complaints, severe_complaints = workloads.get(staff_name, (0, 0))
             
             # Calculate score (higher is better)
             # Lower complaint count = higher score
@@ -110,17 +135,23 @@ class ComplaintAssignmentService:
             
             total_score = expertise_bonus + workload_score - severe_penalty
             
-            logger.info(
-                f"  {staff.name} (ID:{staff.id}): "
-                f"complaints={current_complaints}, severe={severe_complaints}, "
-                f"score={total_score} (expertise={expertise_bonus}, workload={workload_score}, severe_penalty={severe_penalty})"
-            )
+            if debug_enabled:
+                logger.debug(
+                    f"  {staff_name} (ID:{staff_id}): "
+                    f"complaints={current_complaints}, severe={severe_complaints}, "
+                    f"score={total_score} (expertise={expertise_bonus}, workload={workload_score}, severe_penalty={severe_penalty})"
+                )
             
             if total_score > best_score:
                 best_score = total_score
-                best_staff = staff
-        
-        if best_staff:
+                best_staff = staff_id
+        
+        if best_staff is not None:
+            best_staff = Staff.objects.filter(pk=best_staff, status='active').first()
+            if best_staff is None:
+                # Changed by another process since the index was built
+                expertise_index.rebuild()
+                return ComplaintAssignmentService.find_best_staff(complaint_category, severity)
             logger.info(f"✅ Assigned to: {best_staff.name} (ID: {best_staff.id}, score: {best_score})")
         else:
             logger.warning(f"⚠️ No suitable staff found for category: {complaint_category}")
@@ -132,9 +163,21 @@ class ComplaintAssignmentService:
         """
         Assign a complaint to the best available staff member
         
+        Uses the in-memory workload index (no queries) when enabled, and the
+        database scoring of find_best_staff otherwise or while the index is not built.
+        
         Returns:
             Tuple of (staff_name, staff_id) or (None, None)
         """
+        if getattr(settings, 'WORKLOAD_INDEX_ENABLED', True):
+            from .workload_index import workload_index
+            
+            result = workload_index.best_staff(
+                ComplaintAssignmentService.get_required_expertise(complaint_category)
+            )
+            if result is not None:
+                return result
+        
         staff = ComplaintAssignmentService.find_best_staff(complaint_category, severity)
         
         if staff:
@@ -175,21 +218,15 @@ class ComplaintAssignmentService:
     @staticmethod
     def get_staff_workload(staff_name):
         """Get workload statistics for a staff member"""
-        open_complaints = Complaint.objects.filter(
-            staff=staff_name,
-            status__in=['Open', 'In Progress']
-        ).count()
-        
-        closed_complaints = Complaint.objects.filter(
-            staff=staff_name,
-            status='Closed'
-        ).count()
-        
-        high_severity = Complaint.objects.filter(
-            staff=staff_name,
-            status__in=['Open', 'In Progress'],
-            severity='High'
-        ).count()
+        open_filter = Q(status__in=ComplaintAssignmentService.OPEN_STATUSES)
+        counts = Complaint.objects.filter(staff=staff_name).aggregate(
+            open_complaints=Count('id', filter=open_filter),
+            closed_complaints=Count('id', filter=Q(status='Closed')),
+            high_severity=Count('id', filter=open_filter & Q(severity='High'))
+        )
+        open_complaints = counts['open_complaints']
+        closed_complaints = counts['closed_complaints']
+        high_severity = counts['high_severity']
         
         return {
             'open_complaints': open_complaints,
@@ -0,0 +1,191 @@
+"""
+Batch Staff Assignment
+Assigns a whole backlog of complaints at once, balancing the load across staff
+instead of sending every complaint to whoever is least loaded right now (which, with
+loads read once, piles the backlog onto the same person).
+
+The problem is solved as a min-cost assignment of complaints to staff "slots":
+  - slot j of a staff member is its (j+1)-th new complaint; it costs the load penalty
+    find_best_staff would see at that point (10 per open complaint, 20 more per severe
+    one), so filling a staff member's slots in order adds up its growing load
+  - a complaint may only take slots of the staff eligible for its category
+    (expertise_index); categories without eligible staff fall back to all active staff
+  - an optional capacity caps the open complaints per staff member
+  - for n complaints only the n cheapest eligible slots of each category are
+    candidates (an optimal solution never needs a dearer one), which keeps the cost
+    matrix small
+  - high-severity complaints are solved first, then the rest, in chunks of
+    chunk_size complaints, with loads carried over between chunks
+
+Chunks are solved with scipy's linear_sum_assignment (Hungarian method); without
+scipy every complaint greedily takes the cheapest eligible slot.
+"""
+
+import time
+import heapq
+import logging
+
+import numpy as np
+
+from .assignment_service import ComplaintAssignmentService
+from .expertise_index import expertise_index
+from .workload_index import OPEN_WEIGHT, SEVERE_WEIGHT
+
+try:
+    from scipy.optimize import linear_sum_assignment
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Cost of an ineligible (complaint, slot) pair; such pairs are never kept
+INELIGIBLE_COST = 1e12
+
+
+def _step(severity):
+    """Load added by one new complaint"""
+    return OPEN_WEIGHT + (SEVERE_WEIGHT if severity == 'High' else 0)
+
+
+def _cheapest_slots(staff_ids, count, loads, open_counts, step, capacity):
+    """The `count` cheapest (staff id, slot) pairs among the staff, with their costs"""
+    heap = [
+        (loads[staff_id], staff_id, 0) for staff_id in staff_ids
+        if capacity is None or open_counts[staff_id] < capacity
+    ]
+    heapq.heapify(heap)
+
+    slots = []
+    while heap and len(slots) < count:
+        cost, staff_id, slot = heapq.heappop(heap)
+        slots.append((staff_id, slot, cost))
+        if capacity is None or open_counts[staff_id] + slot + 1 < capacity:
+            heapq.heappush(heap, (cost + step, staff_id, slot + 1))
+    return slots
+
+
+def _solve_chunk(chunk, loads, open_counts, step, capacity):
+    """Assign one chunk of (key, eligible staff ids) items; returns {key: staff id}"""
+    rows_by_group = {}
+    for row, (_, group) in enumerate(chunk):
+        rows_by_group.setdefault(group, []).append(row)
+
+    columns = {}
+    group_slots = {}
+    for group, rows in rows_by_group.items():
+        slots = _cheapest_slots(group, len(chunk), loads, open_counts, step, capacity)
+        group_slots[group] = slots
+        for staff_id, slot, _ in slots:
+            columns.setdefault((staff_id, slot), len(columns))
+
+    if not columns:
+        return {}
+
+    if SCIPY_AVAILABLE:
+        costs = np.full((len(chunk), len(columns)), INELIGIBLE_COST)
+        for group, rows in rows_by_group.items():
+            slots = group_slots[group]
+            if not slots:
+                continue
+            # The staff id breaks ties towards the lowest id, like find_best_staff
+            slot_costs = np.array([cost + staff_id * 1e-9 for staff_id, _, cost in slots])
+            slot_columns = [columns[(staff_id, slot)] for staff_id, slot, _ in slots]
+            costs[np.ix_(rows, slot_columns)] = slot_costs
+
+        row_indexes, column_indexes = linear_sum_assignment(costs)
+        staff_by_column = {column: staff_id for (staff_id, _), column in columns.items()}
+        return {
+            chunk[row][0]: staff_by_column[column]
+            for row, column in zip(row_indexes, column_indexes)
+            if costs[row, column] < INELIGIBLE_COST
+        }
+
+    # Greedy fallback: cheapest free eligible slot, complaint by complaint
+    taken = {}
+    result = {}
+    for key, group in chunk:
+        best = None
+        for staff_id in group:
+            slot = taken.get(staff_id, 0)
+            if capacity is not None and open_counts[staff_id] + slot >= capacity:
+                continue
+            candidate = (loads[staff_id] + step * slot, staff_id)
+            if best is None or candidate < best:
+                best = candidate
+        if best is not None:
+            taken[best[1]] = taken.get(best[1], 0) + 1
+            result[key] = best[1]
+    return result
+
+
+def solve_batch_assignment(items, capacity=None, chunk_size=500):
+    """
+    Assign a backlog of complaints to active staff (2 queries, then in memory)
+
+    Args:
+        items: Iterable of (key, complaint_category, severity)
+        capacity: Maximum open complaints per staff member (default: no limit)
+        chunk_size: Complaints per assignment problem
+
+    Returns:
+        Dict with 'assignments' ({key: (staff_name, staff_id)}), 'unassigned' (keys),
+        'staff' ({staff_id: name}), 'loads_before' / 'loads_after'
+        ({staff_id: (open, severe)}), 'solver', 'load_ms' and 'solve_ms'
+    """
+    start_time = time.perf_counter()
+    expertise_index.rebuild()
+    all_staff = expertise_index.active_staff_ids()
+    staff_names = expertise_index.staff_names(all_staff)
+    workloads = ComplaintAssignmentService.get_open_workloads()
+
+    loads_before = {staff_id: tuple(workloads.get(name, (0, 0))) for staff_id, name in staff_names.items()}
+    open_counts = {staff_id: counts[0] for staff_id, counts in loads_before.items()}
+    severe_counts = {staff_id: counts[1] for staff_id, counts in loads_before.items()}
+    loads = {
+        staff_id: open_count * OPEN_WEIGHT + severe_counts[staff_id] * SEVERE_WEIGHT
+        for staff_id, open_count in open_counts.items()
+    }
+
+    load_ms = (time.perf_counter() - start_time) * 1000
+
+    # Items are grouped by their eligible staff set: categories sharing it share candidate slots
+    severe_items, other_items = [], []
+    for key, category, severity in items:
+        staff_ids = expertise_index.staff_for_category(category) or all_staff
+        (severe_items if severity == 'High' else other_items).append((key, staff_ids))
+
+    assignments = {}
+    unassigned = []
+    for severity_items, severity in ((severe_items, 'High'), (other_items, 'Medium')):
+        step = _step(severity)
+        for start in range(0, len(severity_items), chunk_size):
+            chunk = severity_items[start:start + chunk_size]
+            solved = _solve_chunk(chunk, loads, open_counts, step, capacity)
+
+            for key, _ in chunk:
+                staff_id = solved.get(key)
+                if staff_id is None:
+                    unassigned.append(key)
+                    continue
+                assignments[key] = (staff_names[staff_id], staff_id)
+                loads[staff_id] += step
+                open_counts[staff_id] += 1
+                if severity == 'High':
+                    severe_counts[staff_id] += 1
+
+    solve_ms = (time.perf_counter() - start_time) * 1000 - load_ms
+    if unassigned:
+        logger.warning(f"⚠️ Batch assignment left {len(unassigned)} complaints unassigned (no capacity)")
+
+    return {
+        'assignments': assignments,
+        'unassigned': unassigned,
+        'staff': staff_names,
+        'loads_before': loads_before,
+        'loads_after': {staff_id: (open_counts[staff_id], severe_counts[staff_id]) for staff_id in staff_names},
+        'solver': 'linear_sum_assignment' if SCIPY_AVAILABLE else 'greedy',
+        'load_ms': round(load_ms, 2),
+        'solve_ms': round(solve_ms, 2)
+    }
@@ -0,0 +1,230 @@
+"""
+Daily Complaint Stats Rollup
+DailyComplaintStats holds complaint counts per (date, type, status, staff, severity),
+so the analytics dashboards sum a few hundred rows instead of scanning every complaint:
+  - a complaint adds 1 to created_count of the row for its creation day and current
+    type / status / staff / severity
+  - a closed complaint with resolved_at also adds 1 to resolved_count and its
+    resolution time to resolution_seconds of the row for its resolution day
+  - complaint saves and deletes move those contributions (record_change, called from
+    complaints/signals.py) with F() updates in the same transaction as the complaint
+  - rebuild_daily_stats recomputes the rows from the complaints, for the initial
+    backfill and after bulk writes that bypass signals
+    (manage.py rebuild_daily_stats)
+"""
+
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+KEY_FIELDS = ('type', 'status', 'staff', 'severity')
+
+
+def complaint_snapshot(complaint):
+    """The fields of a complaint that its rollup contributions depend on"""
+    return (complaint.created_at, complaint.type, complaint.status, complaint.staff or '',
+            complaint.severity, complaint.resolved_at)
+
+
+def _local_date(value):
+    if timezone.is_aware(value):
+        return timezone.localdate(value)
+    return value.date()
+
+
+def contributions(snapshot):
+    """{(date, type, status, staff, severity): [created, resolved, resolution seconds]}"""
+    if snapshot is None:
+        return {}
+    created_at, complaint_type, status, staff, severity, resolved_at = snapshot
+    attributes = (complaint_type, status, staff, severity)
+
+    result = {}
+    if created_at is not None:
+        result[(_local_date(created_at),) + attributes] = [1, 0, 0.0]
+    if status == 'Closed' and resolved_at is not None and created_at is not None:
+        values = result.setdefault((_local_date(resolved_at),) + attributes, [0, 0, 0.0])
+        values[1] += 1
+        values[2] += (resolved_at - created_at).total_seconds()
+    return result
+
+
+def _apply(key, created, resolved, seconds):
+    from .models import DailyComplaintStats
+
+    lookup = dict(zip(('date',) + KEY_FIELDS, key))
+    changes = {
+        'created_count': F('created_count') + created,
+        'resolved_count': F('resolved_count') + resolved,
+        'resolution_seconds': F('resolution_seconds') + seconds
+    }
+    if DailyComplaintStats.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            DailyComplaintStats.objects.create(
+                **lookup, created_count=created, resolved_count=resolved, resolution_seconds=seconds
+            )
+    except IntegrityError:
+        # Created by a concurrent write since the update
+        DailyComplaintStats.objects.filter(**lookup).update(**changes)
+
+
+def record_changes(changes):
+    """
+    Move the contributions of complaint writes, one update per affected row
+
+    Args:
+        changes: Iterable of (before, after) complaint_snapshot() tuples, None for a
+            created / deleted complaint
+    """
+    deltas = {}
+    for before, after in changes:
+        if before == after:
+            continue
+        for snapshot, sign in ((before, -1), (after, 1)):
+            for key, (created, resolved, seconds) in contributions(snapshot).items():
+                values = deltas.setdefault(key, [0, 0, 0.0])
+                values[0] += sign * created
+                values[1] += sign * resolved
+                values[2] += sign * seconds
+
+    for key, (created, resolved, seconds) in deltas.items():
+        if created or resolved or seconds:
+            _apply(key, created, resolved, seconds)
+
+
+def record_change(before, after):
+    """Move one complaint's contributions (see record_changes)"""
+    record_changes([(before, after)])
+
+
+def rebuild_daily_stats(since=None, complaint_model=None, stats_model=None):
+    """
+    Recompute the rollup rows from the complaints (two grouped queries)
+
+    Args:
+        since: Only rebuild rows from this date on
+        complaint_model / stats_model: Model classes to use (historical models in
+            migrations); default to the current ones
+
+    Returns:
+        Number of rows written
+    """
+    if complaint_model is None or stats_model is None:
+        from .models import Complaint, DailyComplaintStats
+        complaint_model = complaint_model or Complaint
+        stats_model = stats_model or DailyComplaintStats
+
+    created = complaint_model.objects.all()
+    resolved = complaint_model.objects.filter(status='Closed', resolved_at__isnull=False, created_at__isnull=False)
+    if since is not None:
+        created = created.filter(created_at__date__gte=since)
+        resolved = resolved.filter(resolved_at__date__gte=since)
+
+    rows = {}
+
+    def row_for(day, row):
+        key = (day, row['type'], row['status'], row['staff'] or '', row['severity'])
+        if key not in rows:
+            rows[key] = stats_model(**dict(zip(('date',) + KEY_FIELDS, key)))
+        return rows[key]
+
+    for row in created.annotate(day=TruncDate('created_at')).values('day', *KEY_FIELDS).annotate(
+        complaints=Count('id')
+    ).order_by():
+        row_for(row['day'], row).created_count += row['complaints']
+
+    for row in resolved.annotate(day=TruncDate('resolved_at')).values('day', *KEY_FIELDS).annotate(
+        complaints=Count('id'),
+        duration=Sum(ExpressionWrapper(F('resolved_at') - F('created_at'), output_field=DurationField()))
+    ).order_by():
+        stats = row_for(row['day'], row)
+        stats.resolved_count += row['complaints']
+        stats.resolution_seconds += row['duration'].total_seconds() if row['duration'] else 0.0
+
+    with transaction.atomic():
+        existing = stats_model.objects.all()
+        if since is not None:
+            existing = existing.filter(date__gte=since)
+        existing.delete()
+        stats_model.objects.bulk_create(rows.values(), batch_size=1000)
+
+    logger.info(f"Daily complaint stats rebuilt: {len(rows)} rows")
+    return len(rows)
+
+
+# ----- dashboard queries -----
+
+def totals():
+    """All-time complaint counts by status and resolution totals (one query)"""
+    from .models import DailyComplaintStats
+
+    result = DailyComplaintStats.objects.aggregate(
+        total=Sum('created_count'),
+        open=Sum('created_count', filter=Q(status='Open')),
+        in_progress=Sum('created_count', filter=Q(status='In Progress')),
+        closed=Sum('created_count', filter=Q(status='Closed')),
+        resolved=Sum('resolved_count'),
+        resolution_seconds=Sum('resolution_seconds')
+    )
+    return {key: value or 0 for key, value in result.items()}
+
+
+def average_resolution_hours(stats):
+    """Mean resolution time in hours from totals(); None without resolved complaints"""
+    if not stats['resolved']:
+        return None
+    return stats['resolution_seconds'] / stats['resolved'] / 3600
+
+
+def daily_counts(start, end=None):
+    """
+    {date: {'created', 'open', 'in_progress', 'closed'}} for days from start (one query);
+    open / in_progress count complaints created that day, closed those resolved that day
+    """
+    from .models import DailyComplaintStats
+
+    rows = DailyComplaintStats.objects.filter(date__gte=start)
+    if end is not None:
+        rows = rows.filter(date__lte=end)
+    return {
+        row['date']: {key: row[key] or 0 for key in ('created', 'open', 'in_progress', 'closed')}
+        for row in rows.values('date').annotate(
+            created=Sum('created_count'),
+            open=Sum('created_count', filter=Q(status='Open')),
+            in_progress=Sum('created_count', filter=Q(status='In Progress')),
+            closed=Sum('resolved_count')
+        ).order_by()
+    }
+
+
+def counts_by(field, limit=None):
+    """[{field: value, 'count': complaints}] ordered by count, e.g. counts_by('type', 10)"""
+    from .models import DailyComplaintStats
+
+    rows = DailyComplaintStats.objects.values(field).annotate(
+        count=Sum('created_count')
+    ).filter(count__gt=0).order_by('-count', field)
+    if limit is not None:
+        rows = rows[:limit]
+    return list(rows)
+
+
+def staff_counts():
+    """{staff name: (assigned complaints, closed complaints)} (one query)"""
+    from .models import DailyComplaintStats
+
+    return {
+        row['staff']: (row['assigned'] or 0, row['closed'] or 0)
+        for row in DailyComplaintStats.objects.exclude(staff='').values('staff').annotate(
+            assigned=Sum('created_count'),
+            closed=Sum('created_count', filter=Q(status='Closed'))
+        ).order_by()
+    }
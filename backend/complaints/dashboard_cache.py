@@ -0,0 +1,153 @@
+"""
+Dashboard Response Cache
+Caches the data of the polled analytics endpoints (admin dashboard stats, complaint
+trends, feedback sentiment stats) in a Django cache, so the cost of a dashboard no
+longer grows with the number of open admin tabs:
+  - every data source (complaints, feedback, staff) has a version number in the cache,
+    bumped after each committed write to it (complaints/signals.py); entry keys
+    include the versions of the sources the endpoint reads, so a write makes the
+    next request rebuild
+  - entries are fresh for DASHBOARD_CACHE_TTL seconds; bulk writes that bypass
+    signals are picked up after at most that long
+  - a stale entry (outdated version or past its TTL) is still served for up to
+    DASHBOARD_CACHE_STALE_SECONDS while one background thread rebuilds it
+  - rebuilds are single-flight: a lock taken with cache.add lets one caller rebuild
+    while concurrent callers serve the stale entry, or wait for the rebuilt one
+
+With the default local-memory cache this works per process; configure a shared cache
+(CACHES / DASHBOARD_CACHE_ALIAS, e.g. Redis) to share entries and locks between workers.
+"""
+
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+SOURCES = ('complaints', 'feedback', 'staff')
+KEY_PREFIX = 'dashboard'
+
+# Background revalidation of stale entries
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='dashboard-cache')
+
+
+def _cache():
+    from django.core.cache import caches
+    return caches[getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')]
+
+
+def _ttl():
+    return getattr(settings, 'DASHBOARD_CACHE_TTL', 15)
+
+
+def _stale_seconds():
+    return getattr(settings, 'DASHBOARD_CACHE_STALE_SECONDS', 120)
+
+
+def _version_key(source):
+    return f'{KEY_PREFIX}:version:{source}'
+
+
+def _initial_version():
+    # Time-based, so a version lost by eviction never repeats an older number
+    return int(time.time() * 1000)
+
+
+def bump_version(source):
+    """Invalidate the entries that read a data source"""
+    cache = _cache()
+    key = _version_key(source)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not set yet or evicted
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def current_versions(sources):
+    cache = _cache()
+    keys = [_version_key(source) for source in sources]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def _base_key(name, params):
+    digest = hashlib.sha256(repr(sorted(params.items())).encode('utf-8')).hexdigest()[:16]
+    return f'{KEY_PREFIX}:{name}:{digest}'
+
+
+def _rebuild(cache, base, key, build):
+    """Build and store an entry; the caller holds the rebuild lock"""
+    try:
+        data = build()
+        entry = {'data': data, 'built_at': time.time()}
+        timeout = _ttl() + _stale_seconds()
+        cache.set_many({key: entry, f'{base}:last': entry}, timeout=timeout)
+        return data
+    finally:
+        cache.delete(f'{base}:lock')
+
+
+def _revalidate(cache, base, key, build):
+    try:
+        _rebuild(cache, base, key, build)
+    except Exception as e:
+        logger.error(f"Dashboard cache revalidation failed for {base}: {str(e)}")
+    finally:
+        close_old_connections()
+
+
+def cached_data(name, sources, build, params=None):
+    """
+    Data of a dashboard endpoint, from the cache when possible
+
+    Args:
+        name: Endpoint name (part of the key)
+        sources: Data sources the endpoint reads, from SOURCES
+        build: Callable computing the data; it may run in a background thread, so it
+            must not use the request
+        params: Request parameters the data depends on
+
+    Returns:
+        (data, cache status): 'hit', 'stale', 'miss' or 'off'
+    """
+    if not getattr(settings, 'DASHBOARD_CACHE_ENABLED', True):
+        return build(), 'off'
+
+    cache = _cache()
+    base = _base_key(name, params or {})
+    key = f'{base}:{current_versions(sources)}'
+    lock_timeout = max(5, _ttl())
+    now = time.time()
+
+    entry = cache.get(key)
+    if entry is not None and now - entry['built_at'] < _ttl():
+        return entry['data'], 'hit'
+
+    # Stale while revalidate: serve the last entry and rebuild it in the background
+    stale = entry or cache.get(f'{base}:last')
+    if stale is not None and now - stale['built_at'] < _ttl() + _stale_seconds():
+        if cache.add(f'{base}:lock', True, timeout=lock_timeout):
+            _executor.submit(_revalidate, cache, base, key, build)
+        return stale['data'], 'stale'
+
+    # Nothing to serve: one caller rebuilds, the others wait for its entry
+    if cache.add(f'{base}:lock', True, timeout=lock_timeout):
+        return _rebuild(cache, base, key, build), 'miss'
+
+    deadline = now + lock_timeout
+    while time.time() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['data'], 'hit'
+    return build(), 'miss'
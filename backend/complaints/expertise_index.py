@@ -0,0 +1,190 @@
+"""
+Inverted Expertise Index
+Maps each expertise area to the ids of the active staff who have it, and each
+complaint category (ComplaintAssignmentService.CATEGORY_TO_EXPERTISE) to the union of
+its areas, so finding the staff eligible for a complaint is a dictionary lookup
+instead of parsing and scanning every staff member's expertise list.
+
+Built from the database on first use (one query), then kept current by the Staff
+post_save / post_delete signals (complaints/signals.py), which update the one staff
+member that changed without a query. The signals also bump a version number in the
+Django cache; a lookup that finds a version other than the one its index was built
+at rebuilds it, so changes made in other worker processes are picked up as soon as
+the cache is shared between them (e.g. Redis). With a per-process cache, or if the
+version is lost, the index is still rebuilt every EXPERTISE_INDEX_REFRESH_SECONDS.
+"""
+
+import time
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+VERSION_KEY = 'expertise_index:version'
+
+
+def bump_version():
+    """Make every process's index rebuild on its next lookup (a Staff row changed)"""
+    from django.core.cache import cache
+
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Not set yet or evicted; time-based so it never repeats an older number
+        cache.set(VERSION_KEY, int(time.time() * 1000), timeout=None)
+    except Exception as e:
+        logger.error(f"Failed to bump expertise index version: {str(e)}")
+
+
+def shared_version():
+    """Current version in the cache (set if missing), None if the cache is unavailable"""
+    from django.core.cache import cache
+
+    try:
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+            version = cache.get(VERSION_KEY)
+        return version
+    except Exception as e:
+        logger.error(f"Failed to read expertise index version: {str(e)}")
+        return None
+
+
+class ExpertiseIndex:
+    """expertise area -> staff ids and category -> staff ids for active staff"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ready = False
+        self._by_expertise = {}   # area -> set of staff ids
+        self._by_category = {}    # category -> frozenset of staff ids
+        self._staff = {}          # staff id -> (name, expertise frozenset)
+        self._version = None      # shared version the index was built at
+        self._built_at = 0.0      # time.monotonic() of the last rebuild
+
+    def rebuild(self, staff_rows=None):
+        """
+        Rebuild from (id, name, raw expertise) rows of the active staff; they are read
+        from the database when not given
+        """
+        from .assignment_service import ComplaintAssignmentService
+        from .models import Staff
+
+        # Read before the rows, so a change made meanwhile triggers another rebuild
+        version = shared_version()
+        built_at = time.monotonic()
+        if staff_rows is None:
+            staff_rows = Staff.objects.filter(status='active').values_list('id', 'name', 'expertise')
+
+        staff = {}
+        by_expertise = {}
+        for staff_id, name, raw_expertise in staff_rows:
+            expertise = ComplaintAssignmentService.parse_expertise(raw_expertise)
+            staff[staff_id] = (name, expertise)
+            for area in expertise:
+                by_expertise.setdefault(area, set()).add(staff_id)
+
+        with self._lock:
+            self._staff = staff
+            self._by_expertise = by_expertise
+            self._refresh_categories()
+            self._version = version
+            self._built_at = built_at
+            self._ready = True
+
+    def _refresh_categories(self):
+        from .assignment_service import ComplaintAssignmentService
+
+        categories = dict(ComplaintAssignmentService.CATEGORY_TO_EXPERTISE)
+        categories[None] = ComplaintAssignmentService.DEFAULT_EXPERTISE
+        self._by_category = {
+            category: frozenset().union(*(self._by_expertise.get(area, ()) for area in areas))
+            for category, areas in categories.items()
+        }
+
+    def _outdated(self):
+        refresh_seconds = getattr(settings, 'EXPERTISE_INDEX_REFRESH_SECONDS', 60)
+        if refresh_seconds and time.monotonic() - self._built_at > refresh_seconds:
+            return True
+        return shared_version() != self._version
+
+    def ensure_ready(self):
+        """Build on first use, rebuild when staff changed elsewhere or the index is too old"""
+        if self._ready and not self._outdated():
+            return
+        with self._lock:
+            if not self._ready or self._outdated():
+                self.rebuild()
+
+    def staff_changed(self, staff_id, name, raw_expertise, active):
+        """Update one staff member (Staff saved or deleted); no database access"""
+        from .assignment_service import ComplaintAssignmentService
+
+        if not self._ready:
+            return
+
+        with self._lock:
+            _, old_expertise = self._staff.pop(staff_id, (None, frozenset()))
+            for area in old_expertise:
+                members = self._by_expertise.get(area)
+                if members is not None:
+                    members.discard(staff_id)
+                    if not members:
+                        del self._by_expertise[area]
+
+            if active:
+                expertise = ComplaintAssignmentService.parse_expertise(raw_expertise)
+                self._staff[staff_id] = (name, expertise)
+                for area in expertise:
+                    self._by_expertise.setdefault(area, set()).add(staff_id)
+
+            self._refresh_categories()
+
+    def staff_for_category(self, complaint_category):
+        """Ids of the active staff eligible for a complaint category"""
+        self.ensure_ready()
+        category = (complaint_category or '').lower()
+        with self._lock:
+            if category in self._by_category:
+                return self._by_category[category]
+            return self._by_category[None]
+
+    def staff_for_expertise(self, areas):
+        """Ids of the active staff having any of the expertise areas"""
+        self.ensure_ready()
+        with self._lock:
+            return frozenset().union(*(self._by_expertise.get(area, ()) for area in areas))
+
+    def active_staff_ids(self):
+        """Ids of all active staff"""
+        self.ensure_ready()
+        with self._lock:
+            return frozenset(self._staff)
+
+    def staff_names(self, staff_ids):
+        """staff id -> name for ids returned by the lookups above"""
+        with self._lock:
+            return {staff_id: self._staff[staff_id][0] for staff_id in staff_ids if staff_id in self._staff}
+
+    def staff_expertise(self, staff_id):
+        with self._lock:
+            return self._staff.get(staff_id, (None, frozenset()))[1]
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'ready': self._ready,
+                'staff': len(self._staff),
+                'expertise_areas': len(self._by_expertise),
+                'eligible_per_category': {
+                    category: len(staff_ids) for category, staff_ids in self._by_category.items() if category
+                }
+            }
+
+
+# Global instance
+expertise_index = ExpertiseIndex()
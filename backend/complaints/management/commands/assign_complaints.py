@@ -1,9 +1,18 @@
 """
 Management command to assign unassigned complaints
+One at a time by default; --batch assigns the whole backlog together, balancing the
+load across staff (complaints/batch_assignment.py), and writes it with bulk_update.
+Usage:
+    python manage.py assign_complaints [--reclassify] [--batch-size 64]
+    python manage.py assign_complaints --batch [--capacity 20] [--chunk-size 500] [--dry-run]
 """
 
-from django.core.management.base import BaseCommand
-from django.db import models
+import time
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
 from complaints.models import Complaint, Staff
 from complaints.assignment_service import ComplaintAssignmentService
 
@@ -11,29 +20,75 @@ from complaints.assignment_service import ComplaintAssignmentService
 class Command(BaseCommand):
     help = 'Assign all unassigned complaints to active staff members'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reclassify',
+            action='store_true',
+            help='Re-classify the backlog with the AI classifier (batched) before assigning'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=64,
+            help='Number of complaints per classifier forward pass (default: 64)'
+        )
+        parser.add_argument(
+            '--batch',
+            action='store_true',
+            help='Assign the whole backlog at once with a load-balanced assignment'
+        )
+        parser.add_argument(
+            '--capacity',
+            type=int,
+            help='With --batch: maximum open complaints per staff member (default: no limit)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='With --batch: complaints per assignment problem and per bulk_update (default: 500)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='With --batch: report the assignment and its timings without saving it'
+        )
+
     def handle(self, *args, **options):
+        if (options['dry_run'] or options['capacity'] is not None) and not options['batch']:
+            raise CommandError('--dry-run and --capacity need --batch')
+
         # Find unassigned complaints
-        unassigned = Complaint.objects.filter(
-            models.Q(staff__isnull=True) | 
-            models.Q(staff='') | 
+        start_time = time.perf_counter()
+        unassigned = list(Complaint.objects.filter(
+            models.Q(staff__isnull=True) |
+            models.Q(staff='') |
             models.Q(staff='Unassigned')
-        )
-        
-        self.stdout.write(f'Found {unassigned.count()} unassigned complaints')
-        
+        ))
+
+        load_ms = (time.perf_counter() - start_time) * 1000
+
+        self.stdout.write(f'Found {len(unassigned)} unassigned complaints')
+
+        ai_results = {}
+        if options['reclassify']:
+            ai_results = self.classify_backlog(unassigned, options['batch_size'])
+
+        if options['batch']:
+            self.assign_batch(unassigned, ai_results, load_ms, options)
+            return
+
         assigned_count = 0
-        
+
         for complaint in unassigned:
             try:
-                # Try smart assignment
-                complaint_category = complaint.type or 'miscellaneous'
-                severity = complaint.severity or 'Medium'
-                
+                complaint_category, severity = self.resolve_category(complaint, ai_results.get(complaint.id))
+
                 staff_name, staff_id = ComplaintAssignmentService.assign_complaint(
                     complaint_category=complaint_category,
                     severity=severity
                 )
-                
+
                 if staff_name:
                     complaint.staff = staff_name
                     complaint.save()
@@ -51,12 +106,151 @@ class Command(BaseCommand):
                             f'✅ CMP{complaint.id:03d}: Assigned to {any_staff.name} (fallback)'
                         ))
                         assigned_count += 1
-                    
+
             except Exception as e:
                 self.stdout.write(self.style.ERROR(
                     f'❌ CMP{complaint.id:03d}: {e}'
                 ))
-        
+
         self.stdout.write(self.style.SUCCESS(
-            f'\n✅ Successfully assigned {assigned_count}/{unassigned.count()} complaints'
+            f'\n✅ Successfully assigned {assigned_count}/{len(unassigned)} complaints'
         ))
+
+    def resolve_category(self, complaint, ai_result):
+        """Category and severity to assign on; applies the AI result to the complaint"""
+        if ai_result:
+            from complaints.views import AI_CATEGORY_MAPPING
+
+            # Same mapping as file_complaint: assign on the AI category
+            complaint_category = ai_result['category']
+            severity = 'High' if ai_result['severity'] == 'Critical' else ai_result['severity']
+            complaint.type = AI_CATEGORY_MAPPING.get(complaint_category, 'miscellaneous')
+            complaint.priority = ai_result['priority']
+            complaint.severity = severity
+            return complaint_category, severity
+
+        # Try smart assignment
+        return complaint.type or 'miscellaneous', complaint.severity or 'Medium'
+
+    def assign_batch(self, unassigned, ai_results, load_ms, options):
+        """Assign the backlog in one solve and save it with chunked bulk_update"""
+        from complaints.batch_assignment import solve_batch_assignment
+        from complaints.daily_stats import complaint_snapshot, record_changes
+        from complaints.dashboard_cache import bump_version
+        from complaints.staff_tickets import add_tickets
+
+        complaints = {complaint.id: complaint for complaint in unassigned}
+        snapshots = {complaint.id: complaint_snapshot(complaint) for complaint in unassigned}
+        items = [
+            (complaint.id, *self.resolve_category(complaint, ai_results.get(complaint.id)))
+            for complaint in unassigned
+        ]
+
+        result = solve_batch_assignment(
+            items, capacity=options['capacity'], chunk_size=options['chunk_size']
+        )
+        assignments = result['assignments']
+
+        for complaint_id, (staff_name, _) in assignments.items():
+            complaints[complaint_id].staff = staff_name
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'   CMP{complaint_id:03d}: {staff_name}')
+
+        write_ms = None
+        if not options['dry_run'] and assignments:
+            fields = ['staff', 'updated_at']
+            if ai_results:
+                fields += ['type', 'priority', 'severity']
+
+            now = timezone.now()
+            to_update = [complaints[complaint_id] for complaint_id in assignments]
+            for complaint in to_update:
+                complaint.updated_at = now  # auto_now is not applied by bulk_update
+
+            # bulk_update sends no signals: take the staff tickets, move the daily stats and
+            # invalidate the cached dashboards here
+            tickets = {}
+            for complaint_id, (_, staff_id) in assignments.items():
+                if complaints[complaint_id].status in ComplaintAssignmentService.OPEN_STATUSES:
+                    tickets[staff_id] = tickets.get(staff_id, 0) + 1
+
+            start_time = time.perf_counter()
+            with transaction.atomic():
+                Complaint.objects.bulk_update(to_update, fields, batch_size=options['chunk_size'])
+                add_tickets(tickets)
+                record_changes(
+                    (snapshots[complaint.id], complaint_snapshot(complaint)) for complaint in to_update
+                )
+                for source in ('complaints', 'staff'):
+                    transaction.on_commit(lambda source=source: bump_version(source))
+            write_ms = (time.perf_counter() - start_time) * 1000
+
+        self.report_batch(result, len(unassigned), load_ms, write_ms, options['dry_run'])
+
+    def report_batch(self, result, backlog_size, load_ms, write_ms, dry_run):
+        def spread(loads):
+            open_counts = [open_count for open_count, _ in loads.values()] or [0]
+            return (f'min {min(open_counts)}, mean {statistics.mean(open_counts):.1f}, '
+                    f'max {max(open_counts)}, stdev {statistics.pstdev(open_counts):.2f}')
+
+        assigned = len(result['assignments'])
+        self.stdout.write(f'\n📊 Batch assignment ({result["solver"]}, {len(result["staff"])} active staff)')
+        self.stdout.write(f'   Assigned:   {assigned}/{backlog_size}')
+        if result['unassigned']:
+            self.stdout.write(self.style.WARNING(
+                f'   Unassigned: {len(result["unassigned"])} (no eligible staff under capacity)'
+            ))
+        self.stdout.write(f'   Open complaints per staff before: {spread(result["loads_before"])}')
+        self.stdout.write(f'   Open complaints per staff after:  {spread(result["loads_after"])}')
+
+        busiest = sorted(
+            result['loads_after'].items(), key=lambda item: (-item[1][0], -item[1][1])
+        )[:5]
+        if busiest:
+            self.stdout.write('   Busiest after: ' + ', '.join(
+                f'{result["staff"][staff_id]} ({open_count} open, {severe_count} severe)'
+                for staff_id, (open_count, severe_count) in busiest
+            ))
+
+        self.stdout.write(
+            f'⏱️ Backlog load {load_ms:.1f} ms, staff load {result["load_ms"]:.1f} ms, '
+            f'solve {result["solve_ms"]:.1f} ms, '
+            + ('write skipped (dry run)' if write_ms is None and dry_run else f'write {write_ms or 0:.1f} ms')
+        )
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('Dry run: no complaints were saved'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'\n✅ Successfully assigned {assigned}/{backlog_size} complaints'
+            ))
+
+    def classify_backlog(self, complaints, batch_size):
+        """Classify complaint descriptions in batches; returns {complaint_id: result}"""
+        from complaints.views import get_ai_classifier
+
+        classifier = get_ai_classifier()
+        if classifier is None:
+            self.stdout.write(self.style.WARNING(
+                '⚠️ AI classifier not available, assigning with existing categories'
+            ))
+            return {}
+
+        to_classify = [c for c in complaints if c.description and c.description.strip()]
+        ai_results = {}
+        start_time = time.time()
+
+        for start in range(0, len(to_classify), batch_size):
+            chunk = to_classify[start:start + batch_size]
+            batch_results = classifier.classify_batch(
+                [c.description for c in chunk],
+                batch_size=batch_size
+            )
+            for complaint, result in zip(chunk, batch_results):
+                ai_results[complaint.id] = result
+
+        elapsed = time.time() - start_time
+        self.stdout.write(
+            f'Classified {len(ai_results)} complaints in {elapsed:.1f}s (batch size {batch_size})'
+        )
+        return ai_results
@@ -0,0 +1,132 @@
+"""
+Management command to benchmark staff assignment
+For each staff count it creates that many active staff with open complaints, then
+reports the queries and latency of one assignment through the database scoring
+(find_best_staff) and through the in-memory workload index (assign_complaint).
+Everything runs inside a transaction that is rolled back, so the database is left
+untouched.
+Usage:
+    python manage.py benchmark_assignment [--sizes 10,100,1000,5000] [--complaints-per-staff 3] [--repeat 5]
+"""
+
+import json
+import random
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from complaints.assignment_service import ComplaintAssignmentService
+from complaints.models import Complaint, Staff
+from complaints.workload_index import workload_index
+
+
+EXPERTISE_AREAS = [
+    'Complaint Resolution', 'General Inquiries', 'Passenger Assistance', 'Booking Issues',
+    'Refunds', 'Security Concerns', 'Escalation Management', 'Technical Support',
+    'Technical Troubleshooting'
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure queries and latency of staff assignment as the number of staff grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10,100,1000,5000',
+            help='Comma-separated staff counts (default: 10,100,1000,5000)'
+        )
+        parser.add_argument(
+            '--complaints-per-staff',
+            type=int,
+            default=3,
+            help='Open complaints created per staff member (default: 3)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Assignments timed per size, the median is reported (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        random.seed(42)
+
+        self.stdout.write(
+            f"{'staff':>8} {'complaints':>11} {'db queries':>11} {'db ms':>8} {'index queries':>14} {'index ms':>9}"
+        )
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    self.benchmark_size(size, options)
+                    raise _Rollback()
+            except _Rollback:
+                pass
+
+        # Drop the benchmark staff from this process's indexes
+        workload_index.rebuild()
+
+    def measure(self, assign, repeat):
+        """Median latency in ms and query count of one call"""
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                start_time = time.perf_counter()
+                assign()
+                timings.append((time.perf_counter() - start_time) * 1000)
+        timings.sort()
+        return timings[len(timings) // 2], len(queries.captured_queries)
+
+    def benchmark_size(self, size, options):
+        Staff.objects.filter(status='active').update(status='inactive')
+
+        Staff.objects.bulk_create([
+            Staff(
+                name=f'Benchmark Staff {index}',
+                email=f'benchmark.staff.{index}@example.com',
+                phone='0000000000',
+                department='Benchmark',
+                role='staff',
+                status='active',
+                expertise=json.dumps(random.sample(EXPERTISE_AREAS, 2))
+            )
+            for index in range(size)
+        ], batch_size=1000)
+
+        complaints = [
+            Complaint(
+                type='Benchmark',
+                description='Benchmark complaint',
+                date_of_incident=date.today(),
+                status=random.choice(['Open', 'In Progress']),
+                severity=random.choice(['Low', 'Medium', 'High']),
+                staff=f'Benchmark Staff {index}'
+            )
+            for index in range(size)
+            for _ in range(options['complaints_per_staff'])
+        ]
+        Complaint.objects.bulk_create(complaints, batch_size=1000)
+
+        # bulk_create sends no signals: load the benchmark data into the indexes directly
+        workload_index.ensure_ready()
+        workload_index.rebuild()
+
+        db_ms, db_queries = self.measure(
+            lambda: ComplaintAssignmentService.find_best_staff('electrical', 'High'), options['repeat']
+        )
+        index_ms, index_queries = self.measure(
+            lambda: workload_index.best_staff(ComplaintAssignmentService.get_required_expertise('electrical')),
+            options['repeat']
+        )
+
+        self.stdout.write(
+            f"{size:>8} {len(complaints):>11} {db_queries:>11} {db_ms:>8.2f} {index_queries:>14} {index_ms:>9.3f}"
+        )
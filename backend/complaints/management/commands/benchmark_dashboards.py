@@ -0,0 +1,173 @@
+"""
+Management command to benchmark the admin dashboard endpoints
+For each complaint count it creates that many complaints spread over the last 60 days,
+assigned to --staff staff members, then reports the queries and latency of each
+endpoint. With --max-queries / --max-ms it fails when an endpoint needs more queries
+or time, so both can be checked in CI.
+Everything runs inside a transaction that is rolled back, so the database is left
+untouched.
+Usage:
+    python manage.py benchmark_dashboards [--sizes 100,10000] [--staff 200] [--repeat 3] [--max-queries 10] [--max-ms 1000]
+    python manage.py benchmark_dashboards --sizes 500000 --staff 2000 --max-queries 10 --max-ms 1000
+"""
+
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from accounts.models import FirebaseUser, Staff
+from complaints.daily_stats import rebuild_daily_stats
+from complaints.models import Complaint
+
+
+COMPLAINT_TYPES = ['coach-cleanliness', 'catering', 'electrical', 'security', 'ticketing', 'medical']
+DEPARTMENTS = ['Cleaning', 'Catering', 'Electrical', 'Security', 'Ticketing', 'Medical', 'Operations']
+
+ENDPOINTS = {
+    'admin_dashboard_stats': '/api/complaints/admin/dashboard-stats/',
+    'admin_performance_metrics': '/api/complaints/admin/performance-metrics/',
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure queries and latency of the admin dashboard endpoints as complaints grow'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='100,10000',
+            help='Comma-separated complaint counts (default: 100,10000)'
+        )
+        parser.add_argument(
+            '--staff',
+            type=int,
+            default=200,
+            help='Staff members the complaints are assigned to (default: 200)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Calls timed per endpoint and size, the median is reported (default: 3)'
+        )
+        parser.add_argument(
+            '--max-queries',
+            type=int,
+            help='Fail if an endpoint runs more queries than this'
+        )
+        parser.add_argument(
+            '--max-ms',
+            type=float,
+            help='Fail if the median latency of an endpoint is above this'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        random.seed(42)
+
+        self.stdout.write(f"{'endpoint':<28} {'complaints':>11} {'queries':>8} {'ms':>9}")
+        failures = []
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    staff_names = self.create_staff(options['staff'])
+                    self.create_complaints(size, staff_names)
+                    for name in ENDPOINTS:
+                        queries, ms = self.measure(name, options['repeat'])
+                        self.stdout.write(f"{name:<28} {size:>11} {queries:>8} {ms:>9.1f}")
+                        if options['max_queries'] is not None and queries > options['max_queries']:
+                            failures.append(f'{name} ran {queries} queries with {size} complaints')
+                        if options['max_ms'] is not None and ms > options['max_ms']:
+                            failures.append(f'{name} took {ms:.1f} ms with {size} complaints')
+                    raise _Rollback()
+            except _Rollback:
+                pass
+
+        if failures:
+            raise CommandError('❌ ' + '; '.join(failures))
+
+    def create_staff(self, count):
+        """Create staff members (accounts.Staff with their users); returns their names"""
+        users = FirebaseUser.objects.bulk_create([
+            FirebaseUser(
+                email=f'benchmark-staff-{i}@example.com',
+                firebase_uid=f'benchmark-staff-{i}',
+                full_name=f'Benchmark Staff {i}',
+                is_staff=True,
+                is_passenger=False
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        if users and users[0].pk is None:
+            users = FirebaseUser.objects.filter(firebase_uid__startswith='benchmark-staff-').order_by('id')
+
+        Staff.objects.bulk_create([
+            Staff(
+                user=user,
+                email=user.email,
+                full_name=user.full_name,
+                department=random.choice(DEPARTMENTS),
+                role='benchmark',
+                status=random.choice(['active', 'active', 'active', 'inactive', 'on_leave']),
+                rating=round(random.uniform(3, 5), 1)
+            )
+            for user in users
+        ], batch_size=1000)
+        return [user.full_name for user in users]
+
+    def create_complaints(self, size, staff_names=()):
+        now = timezone.now()
+        complaints = []
+        for _ in range(size):
+            created_at = now - timedelta(minutes=random.randrange(60 * 24 * 60))
+            status = random.choice(['Open', 'In Progress', 'Closed'])
+            complaints.append(Complaint(
+                type=random.choice(COMPLAINT_TYPES),
+                description='Benchmark complaint',
+                date_of_incident=created_at.date(),
+                status=status,
+                severity=random.choice(['Low', 'Medium', 'High']),
+                staff=random.choice(staff_names) if staff_names and random.random() < 0.9 else '',
+                created_at=created_at,
+                resolved_at=(
+                    min(now, created_at + timedelta(minutes=random.randrange(60 * 72)))
+                    if status == 'Closed' else None
+                )
+            ))
+        Complaint.objects.bulk_create(complaints, batch_size=1000)
+
+        # bulk_create sends no signals: load the benchmark data into the rollup directly
+        rebuild_daily_stats()
+
+    def measure(self, name, repeat):
+        """Query count and median latency in ms of one uncached call, as an admin"""
+        from complaints import views
+
+        view = getattr(views, name)
+        timings = []
+        for _ in range(repeat):
+            request = RequestFactory().get(ENDPOINTS[name])
+            # Attributes normally set by the authentication middleware
+            request.is_authenticated = True
+            request.is_admin = True
+            request.is_staff = True
+
+            # The response cache would turn every repeat into a hit: time the computation
+            with override_settings(DASHBOARD_CACHE_ENABLED=False), CaptureQueriesContext(connection) as queries:
+                start_time = time.perf_counter()
+                response = view(request)
+                timings.append((time.perf_counter() - start_time) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f'{name} returned {response.status_code}: {response.data}')
+        timings.sort()
+        return len(queries.captured_queries), timings[len(timings) // 2]
@@ -0,0 +1,142 @@
+"""
+Management command to check that an inference backend keeps the accuracy recorded in test_metrics.json.
+Rebuilds each model's held-out test split (same split as training: 15%, stratified, random_state=42),
+scores it with fp32 PyTorch and the selected backend, and compares accuracy, macro-F1 and latency.
+Usage: python manage.py check_classifier_parity --backend torch-int8 [--tolerance 0.01]
+"""
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+from transformers import DistilBertTokenizer
+
+from ai_models.inference_backends import BACKENDS, resolve_device, load_sequence_classifier
+from ai_models.model_loading import load_label_encoder
+
+TARGET_COLUMNS = {
+    'category': 'Category',
+    'staff': 'Staff Assignment',
+    'priority': 'Auto Priority',
+    'severity': 'Auto Severity'
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare accuracy and latency of an inference backend against fp32 PyTorch and test_metrics.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend',
+            choices=BACKENDS,
+            default='torch-int8',
+            help='Backend to check (default: torch-int8)'
+        )
+        parser.add_argument(
+            '--model-dir',
+            default=getattr(settings, 'AI_MODEL_DIR', 'ai_models/models/enhanced')
+        )
+        parser.add_argument(
+            '--data',
+            default=os.path.join(settings.BASE_DIR.parent, 'Railway_Complaints_Final_Validated.csv'),
+            help='Labelled complaints CSV used for training'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.01,
+            help='Maximum allowed accuracy / macro-F1 drop vs test_metrics.json (default: 0.01)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=32
+        )
+
+    def handle(self, *args, **options):
+        backend = options['backend']
+        model_dir = options['model_dir']
+
+        if not os.path.exists(options['data']):
+            raise CommandError(f"Dataset not found: {options['data']}")
+
+        df = pd.read_csv(options['data'])
+        texts = df['Complaint Description'].astype(str).values
+        failures = []
+
+        self.stdout.write(f'Checking backend "{backend}" against fp32 PyTorch\n')
+
+        for name, column in TARGET_COLUMNS.items():
+            model_path = os.path.join(model_dir, f'{name}_model')
+            encoder = load_label_encoder(model_path)
+            with open(os.path.join(model_path, 'test_metrics.json'), 'r') as f:
+                recorded = json.load(f)
+
+            labels = encoder.transform(df[column].values)
+            _, X_test, _, y_test = train_test_split(
+                texts, labels, test_size=0.15, random_state=42, stratify=labels
+            )
+
+            tokenizer = DistilBertTokenizer.from_pretrained(model_path)
+            reference = self.evaluate(
+                load_sequence_classifier(model_path, 'torch', torch.device('cpu')),
+                tokenizer, list(X_test), options['batch_size'], torch.device('cpu')
+            )
+            candidate = self.evaluate(
+                load_sequence_classifier(model_path, backend),
+                tokenizer, list(X_test), options['batch_size'], resolve_device(backend)
+            )
+
+            accuracy = accuracy_score(y_test, candidate['predictions'])
+            macro_f1 = f1_score(y_test, candidate['predictions'], average='macro')
+            agreement = float(np.mean(candidate['predictions'] == reference['predictions']))
+            speedup = reference['ms_per_item'] / max(candidate['ms_per_item'], 1e-9)
+
+            self.stdout.write(
+                f"{name.upper():<9} accuracy {accuracy:.4f} (recorded {recorded.get('accuracy', 0):.4f})  "
+                f"macro-F1 {macro_f1:.4f} (recorded {recorded.get('macro_f1', 0):.4f})  "
+                f"agreement with fp32 {agreement:.2%}  "
+                f"{candidate['ms_per_item']:.2f} ms/item ({speedup:.1f}x)"
+            )
+
+            if accuracy < recorded.get('accuracy', 0) - options['tolerance']:
+                failures.append(f'{name}: accuracy {accuracy:.4f} < {recorded["accuracy"]:.4f}')
+            if macro_f1 < recorded.get('macro_f1', 0) - options['tolerance']:
+                failures.append(f'{name}: macro-F1 {macro_f1:.4f} < {recorded["macro_f1"]:.4f}')
+
+        if failures:
+            raise CommandError('Parity check failed:\n  ' + '\n  '.join(failures))
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Backend "{backend}" is within tolerance of test_metrics.json'))
+
+    def evaluate(self, model, tokenizer, texts, batch_size, device):
+        """Predict all texts; returns predicted class indices and average latency per item"""
+        predictions = []
+        start_time = time.perf_counter()
+
+        with torch.no_grad():
+            for start in range(0, len(texts), batch_size):
+                inputs = tokenizer(
+                    texts[start:start + batch_size],
+                    max_length=128,
+                    padding=True,
+                    truncation=True,
+                    return_tensors='pt'
+                )
+                logits = model(
+                    input_ids=inputs['input_ids'].to(device),
+                    attention_mask=inputs['attention_mask'].to(device)
+                ).logits
+                predictions.append(logits.argmax(dim=1).cpu().numpy())
+
+        elapsed = time.perf_counter() - start_time
+        return {
+            'predictions': np.concatenate(predictions),
+            'ms_per_item': elapsed * 1000.0 / max(len(texts), 1)
+        }
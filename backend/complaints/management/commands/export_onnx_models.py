@@ -0,0 +1,59 @@
+"""
+Management command to export the enhanced classifiers to ONNX for the 'onnx' inference backend.
+Usage: python manage.py export_onnx_models [--model-dir ai_models/models/enhanced] [--multitask]
+"""
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_models.inference_backends import export_onnx
+
+MODEL_NAMES = ('category', 'staff', 'priority', 'severity')
+
+
+class Command(BaseCommand):
+    help = 'Export the enhanced DistilBERT classifiers to model.onnx files for ONNX Runtime'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model-dir',
+            default=getattr(settings, 'AI_MODEL_DIR', 'ai_models/models/enhanced'),
+            help='Directory with category_model/, staff_model/, priority_model/, severity_model/'
+        )
+        parser.add_argument(
+            '--multitask',
+            action='store_true',
+            help='Also export multitask_model/ (shared encoder)'
+        )
+        parser.add_argument(
+            '--opset',
+            type=int,
+            default=14,
+            help='ONNX opset version (default: 14)'
+        )
+
+    def handle(self, *args, **options):
+        model_dir = options['model_dir']
+        if not os.path.isdir(model_dir):
+            raise CommandError(f'Model directory not found: {model_dir}')
+
+        targets = [(name, os.path.join(model_dir, f'{name}_model'), False) for name in MODEL_NAMES]
+        if options['multitask']:
+            targets.append(('multitask', os.path.join(model_dir, 'multitask_model'), True))
+
+        for name, model_path, multitask in targets:
+            if not os.path.isdir(model_path):
+                self.stdout.write(self.style.WARNING(f'⚠️ {name}: {model_path} not found, skipped'))
+                continue
+
+            output_file, max_diff = export_onnx(model_path, multitask=multitask, opset=options['opset'])
+            size_mb = os.path.getsize(output_file) / 1024 ** 2
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {name}: {output_file} ({size_mb:.1f} MB, max logit diff vs PyTorch {max_diff:.2e})'
+            ))
+
+        self.stdout.write(
+            '\nRun "python manage.py check_classifier_parity --backend onnx" before switching '
+            'AI_INFERENCE_BACKEND to onnx'
+        )
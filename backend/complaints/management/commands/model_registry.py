@@ -0,0 +1,90 @@
+"""
+Management command to manage versioned AI models in the model registry (ai_models/model_registry.py).
+Running workers pick up activations and rollbacks within AI_MODEL_REGISTRY_POLL_SECONDS, no restart needed.
+Usage:
+    python manage.py model_registry list [--family enhanced]
+    python manage.py model_registry add --family enhanced --source ai_models/models/enhanced [--activate]
+    python manage.py model_registry activate --family enhanced v20250101-120000-ab12
+    python manage.py model_registry rollback --family categorizer
+"""
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai_models.model_registry import FAMILIES, ModelRegistry
+
+
+class Command(BaseCommand):
+    help = 'List, add, activate or roll back model versions in the AI model registry'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=('list', 'add', 'activate', 'rollback'))
+        parser.add_argument('version', nargs='?', help='Version to activate')
+        parser.add_argument(
+            '--family',
+            choices=FAMILIES,
+            default='enhanced',
+            help='Model family (default: enhanced)'
+        )
+        parser.add_argument(
+            '--source',
+            help='Model directory to copy in with "add" (default: AI_MODEL_DIR for enhanced)'
+        )
+        parser.add_argument(
+            '--activate',
+            action='store_true',
+            help='Activate the version created by "add"'
+        )
+        parser.add_argument(
+            '--note',
+            default='',
+            help='Free-text note stored with a version created by "add"'
+        )
+
+    def handle(self, *args, **options):
+        registry = ModelRegistry(
+            getattr(settings, 'AI_MODEL_REGISTRY_DIR', os.path.join(settings.BASE_DIR, 'ai_models', 'registry')),
+            options['family']
+        )
+
+        try:
+            getattr(self, f"handle_{options['action']}")(registry, options)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+    def handle_list(self, registry, options):
+        active = registry.active_version()
+        versions = registry.versions()
+        if not versions:
+            self.stdout.write(f'No {registry.family} versions in the registry yet')
+            return
+
+        self.stdout.write(f'{registry.family} versions ({registry.versions_dir}):\n')
+        for entry in versions:
+            marker = '➡️ ' if entry['version'] == active else '   '
+            details = ', '.join(
+                f'{key}={value}' for key, value in entry.items() if key not in ('version', 'source')
+            )
+            self.stdout.write(f"{marker}{entry['version']}  {details}")
+
+    def handle_add(self, registry, options):
+        source = options['source']
+        if source is None and registry.family == 'enhanced':
+            source = getattr(settings, 'AI_MODEL_DIR', 'ai_models/models/enhanced')
+        if not source or not os.path.isdir(source):
+            raise CommandError(f'Source model directory not found: {source}')
+
+        version = registry.add_version(source, {'note': options['note']}, activate=options['activate'])
+        state = 'active' if options['activate'] else 'inactive, run "activate" to serve it'
+        self.stdout.write(self.style.SUCCESS(f'✅ Added {registry.family} version {version} ({state})'))
+
+    def handle_activate(self, registry, options):
+        if not options['version']:
+            raise CommandError('Give the version to activate (see "list")')
+        registry.activate(options['version'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {registry.family} now points at {options['version']}"))
+
+    def handle_rollback(self, registry, options):
+        version = registry.rollback()
+        self.stdout.write(self.style.SUCCESS(f'✅ {registry.family} rolled back to {version}'))
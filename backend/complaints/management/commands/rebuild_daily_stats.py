@@ -0,0 +1,52 @@
+"""
+Management command to rebuild the daily complaint stats rollup (DailyComplaintStats)
+from the complaints: the initial backfill, or a repair after bulk writes that bypass
+signals (bulk_create, queryset.update(), direct SQL). Complaints saved while it runs
+may be missed; run it when writes are quiet or rebuild a recent window with --since.
+Usage:
+    python manage.py rebuild_daily_stats [--since 2026-01-01 | --days 30]
+"""
+
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from complaints.daily_stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily complaint stats rollup from the complaints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Only rebuild days from this date on (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Only rebuild the last N days'
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since'] and options['days'] is not None:
+            raise CommandError('Use either --since or --days')
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['since']}")
+        elif options['days'] is not None:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        start_time = time.perf_counter()
+        rows = rebuild_daily_stats(since=since)
+        elapsed = time.perf_counter() - start_time
+
+        scope = f'from {since}' if since else 'for all days'
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rebuilt {rows} daily stats rows {scope} in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,35 @@
+"""
+Management command to rebuild the staff ticket counters (Staff.active_tickets) from
+the open complaints assigned to each staff member, correcting drift left by direct
+database edits or bulk updates that bypass signals.
+Usage:
+    python manage.py rebuild_ticket_counters [--dry-run]
+"""
+
+from django.core.management.base import BaseCommand
+
+from complaints.staff_tickets import rebuild_ticket_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute Staff.active_tickets from the open complaints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the wrong counters without fixing them'
+        )
+
+    def handle(self, *args, **options):
+        changed = rebuild_ticket_counters(dry_run=options['dry_run'])
+
+        for staff, old_count, new_count in changed:
+            self.stdout.write(f'   {staff.name} (ID:{staff.id}): {old_count} -> {new_count}')
+
+        if not changed:
+            self.stdout.write(self.style.SUCCESS('✅ All ticket counters are correct'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'⚠️ {len(changed)} ticket counters are wrong (dry run, not fixed)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ Corrected {len(changed)} ticket counters'))
@@ -113,11 +113,10 @@ class Command(BaseCommand):
                 staff=random.choice(STAFF_NAMES) if chosen_status != 'Open' else None,
                 user=user,
                 resolved_at=resolved_at,
+                created_at=created_at,  # default=timezone.now, not auto_now: backdated on save
             )
-            # Bypass the auto-now behavior by using update() after creation
+            # save() (not update()) so the signals record it in the daily stats rollup
             complaint.save()
-            # Backdate created_at since it uses default=timezone.now
-            Complaint.objects.filter(pk=complaint.pk).update(created_at=created_at)
             created += 1
 
         self.stdout.write(
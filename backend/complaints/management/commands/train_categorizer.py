@@ -0,0 +1,61 @@
+"""
+Management command to train the complaint categorizer as a recorded training job,
+in this process instead of a web worker (e.g. from cron or a dedicated job host).
+Workers serving requests pick up the new model version from the model registry.
+Usage:
+    python manage.py train_categorizer [--force] [--n-jobs 4]
+    python manage.py train_categorizer --online   # partial_fit on newly closed complaints
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from complaints.training_jobs import create_training_job, run_training_job
+
+
+class Command(BaseCommand):
+    help = 'Train the complaint categorizer and record it as a training job'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Retrain even if a trained model is already loaded'
+        )
+        parser.add_argument(
+            '--online',
+            action='store_true',
+            help='Incremental update of the online model from newly closed complaints'
+        )
+        parser.add_argument(
+            '--n-jobs',
+            type=int,
+            help='Parallel cross-validation folds (default: AI_TRAINING_N_JOBS)'
+        )
+
+    def handle(self, *args, **options):
+        if options['n_jobs'] is not None:
+            from ai_models.complaint_categorizer import complaint_categorizer
+            complaint_categorizer.training_n_jobs = options['n_jobs']
+
+        job, created = create_training_job(
+            force_retrain=options['force'],
+            requested_by='manage.py',
+            kind='online' if options['online'] else 'full'
+        )
+        if not created:
+            raise CommandError(f'Training job {job.pk} is already {job.status}')
+
+        self.stdout.write(f'🚀 Running training job {job.pk}...')
+        job = run_training_job(job.pk)
+
+        if job.status != 'succeeded':
+            raise CommandError(f'❌ Training job {job.pk} failed: {job.error}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Training job {job.pk} done in {job.duration_seconds}s '
+            f'(version {job.registry_version or "unchanged"})'
+        ))
+        for key in ('best_classifier', 'cv_accuracy', 'test_accuracy', 'total_samples',
+                    'samples', 'skipped', 'online_samples', 'update_ms'):
+            if key in job.metrics:
+                self.stdout.write(f'   {key}: {job.metrics[key]}')
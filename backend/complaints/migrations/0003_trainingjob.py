@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0002_solutionapplication'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('progress', models.IntegerField(default=0)),
+                ('stage', models.CharField(blank=True, default='', max_length=255)),
+                ('force_retrain', models.BooleanField(default=False)),
+                ('requested_by', models.CharField(blank=True, max_length=255, null=True)),
+                ('metrics', models.JSONField(blank=True, default=dict)),
+                ('registry_version', models.CharField(blank=True, max_length=100, null=True)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Training Jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
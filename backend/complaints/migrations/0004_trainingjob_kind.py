@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0003_trainingjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingjob',
+            name='kind',
+            field=models.CharField(choices=[('full', 'Full retrain'), ('online', 'Online update')], default='full', max_length=20),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.5 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+def backfill_daily_stats(apps, schema_editor):
+    from complaints.daily_stats import rebuild_daily_stats
+
+    rebuild_daily_stats(
+        complaint_model=apps.get_model('complaints', 'Complaint'),
+        stats_model=apps.get_model('complaints', 'DailyComplaintStats')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0004_trainingjob_kind'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyComplaintStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('type', models.CharField(max_length=100)),
+                ('status', models.CharField(max_length=20)),
+                ('staff', models.CharField(blank=True, default='', max_length=255)),
+                ('severity', models.CharField(max_length=10)),
+                ('created_count', models.IntegerField(default=0)),
+                ('resolved_count', models.IntegerField(default=0)),
+                ('resolution_seconds', models.FloatField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily Complaint Stats',
+                'constraints': [models.UniqueConstraint(fields=('date', 'type', 'status', 'staff', 'severity'), name='unique_daily_complaint_stats')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
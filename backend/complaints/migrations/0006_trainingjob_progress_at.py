@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0005_dailycomplaintstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingjob',
+            name='progress_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
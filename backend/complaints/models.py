@@ -64,8 +64,15 @@ class Complaint(models.Model):
  
     def save(self, *args, **kwargs):
         # If status is changing to Closed, record resolution time
+        from .daily_stats import complaint_snapshot
+        self._workload_before = None
+        self._stats_before = None
         if self.pk:
             old_instance = Complaint.objects.get(pk=self.pk)
+            # Previous assignment state, for the staff workload index (complaints/signals.py)
+            self._workload_before = (old_instance.staff, old_instance.status, old_instance.severity)
+            # and for the daily stats rollup
+            self._stats_before = complaint_snapshot(old_instance)
             old_closed = old_instance.status.lower() == 'closed'
             new_closed = self.status.lower() == 'closed'
             if not old_closed and new_closed and not self.resolved_at:
@@ -227,5 +234,70 @@ class NotificationPreference(models.Model):
         verbose_name_plural = "Notification Preferences"
 
 
+
+class TrainingJob(models.Model):
+    """
+    Background training run of the complaint categorizer (see complaints/training_jobs.py)
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    KIND_CHOICES = [
+        ('full', 'Full retrain'),
+        ('online', 'Online update'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='full')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    progress = models.IntegerField(default=0)  # 0-100
+    stage = models.CharField(max_length=255, blank=True, default='')
+    force_retrain = models.BooleanField(default=False)
+    requested_by = models.CharField(max_length=255, blank=True, null=True)
+    metrics = models.JSONField(default=dict, blank=True)  # CV / test accuracy, best classifier, ...
+    registry_version = models.CharField(max_length=100, blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    progress_at = models.DateTimeField(default=timezone.now)  # Last progress report, for stale job detection
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Training job {self.pk} - {self.status}"
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = "Training Jobs"
+
+class DailyComplaintStats(models.Model):
+    """
+    Complaint counts per day, type, status, staff and severity, maintained from complaint
+    saves (see complaints/daily_stats.py). created_count counts complaints created that
+    day; resolved_count / resolution_seconds count closed complaints by resolution day.
+    """
+    date = models.DateField()
+    type = models.CharField(max_length=100)
+    status = models.CharField(max_length=20)
+    staff = models.CharField(max_length=255, blank=True, default='')  # '' when unassigned
+    severity = models.CharField(max_length=10)
+    created_count = models.IntegerField(default=0)
+    resolved_count = models.IntegerField(default=0)
+    resolution_seconds = models.FloatField(default=0)
+    
+    def __str__(self):
+        return f"{self.date} {self.type} - {self.status}"
+    
+    class Meta:
+        verbose_name_plural = "Daily Complaint Stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'type', 'status', 'staff', 'severity'], name='unique_daily_complaint_stats'
+            )
+        ]
+
 # Import assignment model so Django recognizes it
 from .models_assignment import ComplaintAssignment
\ No newline at end of file
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.db import transaction
+
+
+def complaint_saved(sender, instance, created, **kwargs):
+    """
+    Closed (or re-classified closed) complaints feed the categorizer's online mode.
+    Only schedules the update, after the transaction commits; nothing runs here.
+    """
+    if instance.status != 'Closed' or not getattr(settings, 'AI_CATEGORIZER_ONLINE', False):
+        return
+    from .training_jobs import schedule_online_update
+    transaction.on_commit(schedule_online_update)
+
+
+def complaint_workload_changed(sender, instance, created, raw=False, **kwargs):
+    """Move the complaint's load between staff counters in the workload index"""
+    if raw or not getattr(settings, 'WORKLOAD_INDEX_ENABLED', True):
+        return
+    from .workload_index import workload_index
+    before = None if created else getattr(instance, '_workload_before', None)
+    after = (instance.staff, instance.status, instance.severity)
+    transaction.on_commit(lambda: workload_index.complaint_changed(before, after))
+
+
+def complaint_deleted(sender, instance, **kwargs):
+    if not getattr(settings, 'WORKLOAD_INDEX_ENABLED', True):
+        return
+    from .workload_index import workload_index
+    before = (instance.staff, instance.status, instance.severity)
+    transaction.on_commit(lambda: workload_index.complaint_changed(before, None))
+
+
+def complaint_tickets_changed(sender, instance, created, raw=False, **kwargs):
+    """Move the complaint's ticket between staff counters, in the same transaction"""
+    if raw:
+        return
+    from .staff_tickets import complaint_tickets_changed as move_tickets
+    before = None if created else getattr(instance, '_workload_before', None)
+    after = (instance.staff, instance.status, instance.severity)
+    # Set when the ticket was reserved before the complaint was created
+    reserved_staff = getattr(instance, '_reserved_ticket', None)
+    instance._reserved_ticket = None
+    move_tickets(before, after, reserved_staff)
+
+
+def complaint_tickets_deleted(sender, instance, **kwargs):
+    from .staff_tickets import complaint_tickets_changed as move_tickets
+    move_tickets((instance.staff, instance.status, instance.severity), None)
+
+
+def complaint_stats_changed(sender, instance, created, raw=False, **kwargs):
+    """Move the complaint's counts in the daily stats rollup, in the same transaction"""
+    if raw:
+        return
+    from .daily_stats import complaint_snapshot, record_change
+    before = None if created else getattr(instance, '_stats_before', None)
+    record_change(before, complaint_snapshot(instance))
+
+
+def complaint_stats_deleted(sender, instance, **kwargs):
+    from .daily_stats import complaint_snapshot, record_change
+    record_change(complaint_snapshot(instance), None)
+
+
+DASHBOARD_SOURCES = {'complaint': 'complaints', 'feedback': 'feedback', 'staff': 'staff'}
+
+
+def dashboard_data_changed(sender, raw=False, **kwargs):
+    """Complaint / Feedback / Staff write: invalidate the cached dashboards after commit"""
+    if raw or not getattr(settings, 'DASHBOARD_CACHE_ENABLED', True):
+        return
+    from .dashboard_cache import bump_version
+    source = DASHBOARD_SOURCES[sender._meta.model_name]
+    transaction.on_commit(lambda: bump_version(source))
+
+
+def _staff_changed(instance, active):
+    """Keep the expertise and workload indexes in step with one Staff row"""
+    from .expertise_index import bump_version, expertise_index
+    from .workload_index import workload_index
+
+    def update_indexes():
+        for index in (expertise_index, workload_index):
+            index.staff_changed(instance.pk, instance.name, instance.expertise, active)
+        # Other processes rebuild their expertise index on their next lookup
+        bump_version()
+
+    transaction.on_commit(update_indexes)
+
+
+def staff_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _staff_changed(instance, instance.status == 'active')
+
+
+def staff_deleted(sender, instance, **kwargs):
+    _staff_changed(instance, False)
@@ -0,0 +1,135 @@
+"""
+Staff Ticket Counters
+Staff.active_tickets counts the open (Open / In Progress) complaints assigned to a
+staff member. It is only changed with conditional F() updates, never by saving the
+whole Staff row, so concurrent assignments can't lose increments:
+  - reserve_ticket takes a ticket for a new assignment, only while the staff member
+    is active and, if STAFF_MAX_ACTIVE_TICKETS is set (default 0, no limit), under it
+  - complaint saves and deletes move tickets on close, reopen and reassignment
+    (complaint_tickets_changed, called from complaints/signals.py); updates run in the
+    same transaction as the complaint write
+  - rebuild_ticket_counters recomputes every counter from the complaints
+    (manage.py rebuild_ticket_counters)
+
+Complaints reference staff by name; counters are updated by primary key, and a name
+shared by several staff members counts towards the one with the lowest id.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import Staff
+from .workload_index import OPEN_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def max_active_tickets():
+    """Open complaints a staff member can take; 0 means no limit"""
+    return getattr(settings, 'STAFF_MAX_ACTIVE_TICKETS', 0)
+
+
+def reserve_ticket(staff_id, capacity=None):
+    """
+    Take one ticket of a staff member if it is active and under capacity
+
+    Returns:
+        True if the ticket was reserved
+    """
+    capacity = max_active_tickets() if capacity is None else capacity
+    staff = Staff.objects.filter(pk=staff_id, status='active')
+    if capacity:
+        staff = staff.filter(active_tickets__lt=capacity)
+    return staff.update(active_tickets=F('active_tickets') + 1) == 1
+
+
+def staff_ids_by_name(names):
+    """{staff name: id} for the given names (one query); duplicates map to the lowest id"""
+    names = [name for name in set(names) if name]
+    if not names:
+        return {}
+    ids = {}
+    for staff_id, name in Staff.objects.filter(name__in=names).order_by('-id').values_list('id', 'name'):
+        ids[name] = staff_id
+    return ids
+
+
+def add_tickets(deltas):
+    """Apply {staff id: ticket delta}; counters never go below zero"""
+    for staff_id, delta in deltas.items():
+        if not delta:
+            continue
+        Staff.objects.filter(pk=staff_id).update(
+            active_tickets=Greatest(F('active_tickets') + delta, 0)
+        )
+
+
+def add_tickets_by_name(deltas):
+    """Apply {staff name: ticket delta} (see staff_ids_by_name)"""
+    deltas = {name: delta for name, delta in deltas.items() if name and delta}
+    ids = staff_ids_by_name(deltas)
+    add_tickets({ids[name]: delta for name, delta in deltas.items() if name in ids})
+
+
+def ticket_deltas(before, after):
+    """
+    Ticket changes of one complaint write; before / after are (staff, status, severity)
+    tuples, None for a created / deleted complaint
+    """
+    deltas = {}
+    for state, sign in ((before, -1), (after, 1)):
+        if state is not None and state[0] and state[1] in OPEN_STATUSES:
+            deltas[state[0]] = deltas.get(state[0], 0) + sign
+    return deltas
+
+
+def complaint_tickets_changed(before, after, reserved_staff=None):
+    """
+    Move tickets for one complaint write
+
+    Args:
+        reserved_staff: Staff name whose ticket was already taken by reserve_ticket
+            for this complaint, so it is not counted twice
+    """
+    deltas = ticket_deltas(before, after)
+    if reserved_staff and deltas.get(reserved_staff, 0) > 0:
+        deltas[reserved_staff] -= 1
+    add_tickets_by_name(deltas)
+
+
+def rebuild_ticket_counters(dry_run=False):
+    """
+    Recompute every staff member's counter from its open complaints
+
+    The Staff rows are locked while counting, so ticket updates made meanwhile wait
+    and apply on top of the rebuilt values.
+
+    Returns:
+        List of (staff, old count, new count) for the counters that were wrong
+    """
+    from .assignment_service import ComplaintAssignmentService
+
+    with transaction.atomic():
+        staff = list(Staff.objects.select_for_update().only('id', 'name', 'active_tickets').order_by('id'))
+        workloads = ComplaintAssignmentService.get_open_workloads()
+
+        changed = []
+        counted = set()
+        for member in staff:
+            # Ordered by id: a shared name counts towards its first staff member
+            open_count = 0 if member.name in counted else workloads.get(member.name, (0, 0))[0]
+            counted.add(member.name)
+            if member.active_tickets != open_count:
+                changed.append((member, member.active_tickets, open_count))
+                member.active_tickets = open_count
+
+        if changed and not dry_run:
+            Staff.objects.bulk_update([member for member, _, _ in changed], ['active_tickets'], batch_size=500)
+
+    if changed:
+        logger.info(f"Ticket counters rebuilt: {len(changed)} staff corrected")
+    return changed
@@ -0,0 +1,104 @@
+"""
+Query-count regression tests for the admin dashboard endpoints: each one must run the
+same fixed number of queries however many complaints and staff members there are.
+(For latency at scale: python manage.py benchmark_dashboards)
+Usage:
+    python manage.py test complaints
+"""
+
+import random
+from datetime import timedelta
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import FirebaseUser, Staff as StaffProfile
+from complaints import views
+from complaints.daily_stats import rebuild_daily_stats
+from complaints.models import Complaint
+
+
+COMPLAINT_TYPES = ['coach-cleanliness', 'catering', 'electrical', 'security']
+DEPARTMENTS = ['Cleaning', 'Catering', 'Electrical', 'Security']
+
+# (staff members, complaints) of the two data sizes compared
+SIZES = [(5, 40), (50, 800)]
+
+
+@override_settings(DASHBOARD_CACHE_ENABLED=False)
+class DashboardQueryCountTests(TestCase):
+    """The dashboards read grouped aggregates, so their query count doesn't grow with data"""
+
+    def setUp(self):
+        random.seed(42)
+        self.staff_names = []
+        self.complaint_count = 0
+
+    def grow_to(self, staff_count, complaint_count):
+        """Add staff members and complaints (spread over 60 days) up to the given counts"""
+        for i in range(len(self.staff_names), staff_count):
+            user = FirebaseUser.objects.create(
+                email=f'staff-{i}@example.com',
+                firebase_uid=f'staff-{i}',
+                full_name=f'Staff {i}',
+                is_staff=True,
+                is_passenger=False
+            )
+            StaffProfile.objects.create(
+                user=user,
+                email=user.email,
+                full_name=user.full_name,
+                department=random.choice(DEPARTMENTS),
+                role='staff',
+                status=random.choice(['active', 'active', 'inactive'])
+            )
+            self.staff_names.append(user.full_name)
+
+        now = timezone.now()
+        complaints = []
+        for _ in range(self.complaint_count, complaint_count):
+            created_at = now - timedelta(minutes=random.randrange(60 * 24 * 60))
+            status = random.choice(['Open', 'In Progress', 'Closed'])
+            complaints.append(Complaint(
+                type=random.choice(COMPLAINT_TYPES),
+                description='Test complaint',
+                date_of_incident=created_at.date(),
+                status=status,
+                severity=random.choice(['Low', 'Medium', 'High']),
+                staff=random.choice(self.staff_names),
+                created_at=created_at,
+                resolved_at=min(now, created_at + timedelta(hours=random.randrange(72))) if status == 'Closed' else None
+            ))
+        Complaint.objects.bulk_create(complaints)
+        self.complaint_count = complaint_count
+
+        # bulk_create sends no signals
+        rebuild_daily_stats()
+
+    def call(self, view):
+        request = RequestFactory().get('/')
+        # Attributes normally set by the authentication middleware
+        request.is_authenticated = True
+        request.is_admin = True
+        request.is_staff = True
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def assertConstantQueries(self, view, expected_queries):
+        for staff_count, complaint_count in SIZES:
+            with self.subTest(staff=staff_count, complaints=complaint_count):
+                self.grow_to(staff_count, complaint_count)
+                with self.assertNumQueries(expected_queries):
+                    data = self.call(view)
+        return data
+
+    def test_admin_dashboard_stats_query_count(self):
+        data = self.assertConstantQueries(views.admin_dashboard_stats, 4)
+        self.assertEqual(data['totalComplaints'], SIZES[-1][1])
+
+    def test_admin_performance_metrics_query_count(self):
+        data = self.assertConstantQueries(views.admin_performance_metrics, 3)
+        handled = sum(department['complaints_handled'] for department in data['department_stats'])
+        self.assertEqual(handled, SIZES[-1][1])
+        self.assertEqual(sum(department['total_staff'] for department in data['department_stats']), SIZES[-1][0])
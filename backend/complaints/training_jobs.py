@@ -0,0 +1,293 @@
+"""
+Background training jobs for the complaint categorizer
+POST /ai/train-model/ only records a TrainingJob and returns; the training itself
+(cross-validation of several sklearn pipelines) runs on a single background thread
+of the process, reporting progress to the job row. Poll it with
+GET /ai/train-model/jobs/<id>/.
+
+When a job finishes, the trained pipeline is swapped in as a whole and saved as a new
+model registry version, which the other workers pick up on their own.
+
+Online mode (AI_CATEGORIZER_ONLINE): every closed complaint schedules an 'online'
+job, at most one per AI_ONLINE_UPDATE_INTERVAL_SECONDS. It reads the complaints closed
+or re-classified since the cursor stored with the active model version, in batches of
+AI_ONLINE_BATCH_SIZE, and updates the model with partial_fit instead of refitting.
+updated_at is stamped at save(), not at commit, so each update also re-reads the last
+AI_ONLINE_CURSOR_OVERLAP_SECONDS behind the cursor for complaints committed late; the
+cursor keeps the (id, updated_at) of the complaints learned in that window to skip them.
+
+Outside the web process: python manage.py train_categorizer [--online]
+"""
+
+import time
+import logging
+import threading
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Complaint, TrainingJob
+
+logger = logging.getLogger(__name__)
+
+# One job at a time per process; training already uses all cores through n_jobs
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='training-job')
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+_online_lock = threading.Lock()
+_online_scheduled = False
+_last_online_update = 0.0
+
+
+def _fail_stale_jobs():
+    """Jobs left queued/running by a process that died never finish on their own"""
+    timeout = getattr(settings, 'AI_TRAINING_JOB_TIMEOUT_MINUTES', 60)
+    TrainingJob.objects.filter(
+        status__in=ACTIVE_STATUSES,
+        progress_at__lt=timezone.now() - timedelta(minutes=timeout)
+    ).update(
+        status='failed',
+        error=f'No progress for {timeout} minutes, the training process probably stopped',
+        finished_at=timezone.now()
+    )
+
+
+def create_training_job(force_retrain=False, requested_by=None, kind='full'):
+    """
+    Record a new training job, or return the one that is already queued/running
+
+    Returns:
+        (job, created)
+    """
+    _fail_stale_jobs()
+    with transaction.atomic():
+        active_job = TrainingJob.objects.select_for_update().filter(status__in=ACTIVE_STATUSES).first()
+        if active_job:
+            return active_job, False
+        job = TrainingJob.objects.create(kind=kind, force_retrain=force_retrain, requested_by=requested_by)
+    return job, True
+
+
+def start_training_job(force_retrain=False, requested_by=None):
+    """Create a training job and run it in the background of this process"""
+    job, created = create_training_job(force_retrain, requested_by)
+    if created:
+        _executor.submit(_run_in_background, job.pk)
+        logger.info(f"Training job {job.pk} queued by {requested_by or 'anonymous'}")
+    return job, created
+
+
+def _run_in_background(job_id):
+    try:
+        run_training_job(job_id)
+    finally:
+        # Worker thread: don't keep its DB connection open
+        close_old_connections()
+
+
+def run_training_job(job_id):
+    """Train or update the categorizer for one job, recording progress, metrics and duration"""
+    from ai_models.complaint_categorizer import complaint_categorizer
+
+    job = TrainingJob.objects.get(pk=job_id)
+    if job.kind == 'online':
+        train = lambda report_progress: _learn_closed_complaints(complaint_categorizer, report_progress)
+    else:
+        train = lambda report_progress: complaint_categorizer.train_model(
+            retrain=job.force_retrain,
+            progress_callback=report_progress
+        )
+
+    job.status = 'running'
+    job.started_at = timezone.now()
+    job.progress_at = job.started_at
+    job.stage = 'Starting'
+    job.save(update_fields=['status', 'started_at', 'progress_at', 'stage'])
+
+    def report_progress(percent, stage):
+        TrainingJob.objects.filter(pk=job_id).update(progress=percent, stage=stage[:255], progress_at=timezone.now())
+
+    start_time = time.perf_counter()
+    try:
+        result = train(report_progress)
+    except Exception as e:
+        result = {'status': 'error', 'message': str(e)}
+
+    job.refresh_from_db(fields=['progress', 'stage', 'progress_at'])
+    job.finished_at = timezone.now()
+    job.duration_seconds = round(time.perf_counter() - start_time, 2)
+
+    if result.get('status') in ('success', 'already_trained'):
+        job.status = 'succeeded'
+        job.progress = 100
+        job.stage = 'Done' if result['status'] == 'success' else 'Model already trained, use force_retrain'
+        job.registry_version = result.get('registry_version')
+        job.metrics = {
+            key: value for key, value in result.items()
+            if key in ('best_classifier', 'cv_accuracy', 'test_accuracy', 'total_samples', 'n_jobs',
+                       'training_seconds', 'classification_report',
+                       'samples', 'skipped', 'batches', 'online_samples', 'update_ms')
+        }
+        logger.info(f"✅ Training job {job_id} finished in {job.duration_seconds}s")
+    else:
+        job.status = 'failed'
+        job.error = result.get('message', 'Training failed')
+        logger.error(f"❌ Training job {job_id} failed: {job.error}")
+
+    job.save()
+    return job
+
+
+def _overlap_seconds():
+    return getattr(settings, 'AI_ONLINE_CURSOR_OVERLAP_SECONDS', 300)
+
+
+def _learned_keys(cursor):
+    """(id, updated_at) of the complaints learned in the overlap window behind the cursor"""
+    return {tuple(key) for key in (cursor or {}).get('recent', [])}
+
+
+def _late_closed_complaints(cursor):
+    """
+    Closed complaints in the overlap window behind the cursor that were not learned:
+    a transaction that commits late can land behind a cursor already past its timestamp
+    """
+    # Cursors stored before the overlap window have no record of what they learned
+    if not cursor or 'recent' not in cursor:
+        return []
+
+    updated_at = parse_datetime(cursor['updated_at'])
+    learned = _learned_keys(cursor)
+    rows = Complaint.objects.filter(
+        status='Closed',
+        updated_at__gte=updated_at - timedelta(seconds=_overlap_seconds()),
+        updated_at__lte=updated_at
+    ).order_by('updated_at', 'id').values_list('id', 'updated_at', 'description', 'type')
+    return [
+        row for row in rows
+        if (row[1], row[0]) <= (updated_at, cursor['id']) and (row[0], row[1].isoformat()) not in learned
+    ]
+
+
+def _advance_cursor(cursor, rows):
+    """Cursor after learning rows of (id, updated_at, ...), with the learned keys of the overlap window"""
+    position = (parse_datetime(cursor['updated_at']), cursor['id']) if cursor else None
+    for row in rows:
+        if position is None or (row[1], row[0]) > position:
+            position = (row[1], row[0])
+
+    horizon = position[0] - timedelta(seconds=_overlap_seconds())
+    keys = _learned_keys(cursor) | {(row[0], row[1].isoformat()) for row in rows}
+    return {
+        'updated_at': position[0].isoformat(),
+        'id': position[1],
+        'recent': sorted([row_id, updated_at] for row_id, updated_at in keys if parse_datetime(updated_at) >= horizon)
+    }
+
+
+def _closed_complaints_after(cursor):
+    """Closed complaints ordered by (updated_at, id), after the given cursor"""
+    complaints = Complaint.objects.filter(status='Closed')
+    if cursor:
+        updated_at = parse_datetime(cursor['updated_at'])
+        complaints = complaints.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=cursor['id'])
+        )
+    return complaints.order_by('updated_at', 'id')
+
+
+def _learn_closed_complaints(categorizer, report_progress):
+    """
+    Feed closed complaints after the active version's cursor to partial_fit, one batch at
+    a time (keyset pagination, so memory stays constant however far behind the model is).
+    Admin corrections via update_classification bump updated_at, so a re-classified
+    complaint is learned again with its corrected type.
+    """
+    batch_size = getattr(settings, 'AI_ONLINE_BATCH_SIZE', 64)
+    cursor = categorizer.online_cursor()
+
+    late = _late_closed_complaints(cursor)
+    if categorizer.is_online_pipeline() and not late and not _closed_complaints_after(cursor).exists():
+        return {'status': 'success', 'mode': 'online', 'samples': 0, 'registry_version': categorizer.registry_version}
+
+    def batches(cursor):
+        # Late commits behind the cursor first, then everything after it
+        for start in range(0, len(late), batch_size):
+            rows = late[start:start + batch_size]
+            cursor = _advance_cursor(cursor, rows)
+            yield [row[2] for row in rows], [row[3] for row in rows], cursor
+
+        while True:
+            rows = list(
+                _closed_complaints_after(cursor)
+                .values_list('id', 'updated_at', 'description', 'type')[:batch_size]
+            )
+            if not rows:
+                return
+            cursor = _advance_cursor(cursor, rows)
+            yield [row[2] for row in rows], [row[3] for row in rows], cursor
+
+    return categorizer.partial_fit(batches(cursor), cursor=cursor, progress_callback=report_progress)
+
+
+def schedule_online_update():
+    """
+    Queue an online update in this process (called on complaint close). Updates are
+    spaced by AI_ONLINE_UPDATE_INTERVAL_SECONDS, so closes arriving meanwhile are
+    learned together in one job.
+    """
+    global _online_scheduled
+    if not getattr(settings, 'AI_CATEGORIZER_ONLINE', False):
+        return
+    with _online_lock:
+        if _online_scheduled:
+            return
+        _online_scheduled = True
+    _executor.submit(_run_online_update_in_background)
+
+
+def _run_online_update_in_background():
+    global _online_scheduled, _last_online_update
+    interval = getattr(settings, 'AI_ONLINE_UPDATE_INTERVAL_SECONDS', 60)
+    wait = _last_online_update + interval - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+
+    with _online_lock:
+        _online_scheduled = False
+        _last_online_update = time.monotonic()
+
+    try:
+        job, created = create_training_job(requested_by='online', kind='online')
+        if created:
+            run_training_job(job.pk)
+    except Exception as e:
+        logger.error(f"Online update failed: {str(e)}")
+    finally:
+        close_old_connections()
+
+
+def training_job_to_dict(job):
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'stage': job.stage,
+        'force_retrain': job.force_retrain,
+        'requested_by': job.requested_by,
+        'metrics': job.metrics,
+        'registry_version': job.registry_version,
+        'error': job.error,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'progress_at': job.progress_at.isoformat() if job.progress_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'duration_seconds': job.duration_seconds
+    }
@@ -19,7 +19,8 @@ from .ai_classification_views import (
     classify_batch_complaints_view,
     get_classification_info,
     auto_assign_complaint,
-    health_check
+    health_check,
+    readiness_check
 )
 from .ai_views import chatbot_proxy
 
@@ -45,6 +46,7 @@ urlpatterns = [
     path('admin/staff/<int:pk>/', views.admin_staff_detail, name='admin-staff-detail'),
     path('admin/dashboard-stats/', views.admin_dashboard_stats, name='admin-dashboard-stats'),
     path('admin/complaint-trends/', views.admin_complaint_trends, name='admin-complaint-trends'),  # Add this new endpoint
+    path('admin/performance-metrics/', views.admin_performance_metrics, name='admin-performance-metrics'),
 
     # Smart Classification endpoints
     path('admin/smart-classification/stats/', views.smart_classification_stats, name='smart-classification-stats'),
@@ -69,6 +71,8 @@ urlpatterns = [
     path('ai/categorize/', views.categorize_complaint, name='categorize_complaint'),
     path('ai/create-smart/', views.create_smart_complaint, name='create_smart_complaint'),
     path('ai/train-model/', views.train_ai_model, name='train_ai_model'),
+    path('ai/train-model/jobs/', views.training_jobs, name='training_jobs'),
+    path('ai/train-model/jobs/<int:job_id>/', views.training_job_status, name='training_job_status'),
     path('ai/model-status/', views.ai_model_status, name='ai_model_status'),
     path('ai/available-staff/', views.get_available_staff, name='get_available_staff'),
     
@@ -78,6 +82,7 @@ urlpatterns = [
     path('ai/classification-info/', get_classification_info, name='classification_info'),
     path('ai/<int:complaint_id>/auto-assign/', auto_assign_complaint, name='auto_assign_complaint'),
     path('ai/health/', health_check, name='ai_health_check'),
+    path('ai/ready/', readiness_check, name='ai_readiness_check'),
     path('ai/chat/', chatbot_proxy, name='chatbot_proxy'),
     
     # Staff management endpoints
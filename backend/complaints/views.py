@@ -23,11 +23,44 @@ from django.utils import timezone
 from .ai_views import *
 from datetime import timedelta
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 # Global classifier instance (singleton pattern)
 _classifier_instance = None
+_classifier_lock = threading.Lock()
+# Load state reported by the AI readiness endpoint
+_classifier_state = {
+    'status': 'not_loaded',  # not_loaded -> loading -> ready / failed
+    'loaded_in_pid': None,
+    'preloaded': False,
+    'load_seconds': None,
+    'error': None
+}
+
+# Map AI classifier categories to complaint form categories
+AI_CATEGORY_MAPPING = {
+    'Cleanliness': 'coach-cleanliness',
+    'Catering': 'catering',
+    'Food Quality': 'catering',
+    'Staff Behavior': 'staff-behaviour',
+    'Ticketing': 'ticketing',
+    'Electrical Issues': 'electrical',
+    'Coach Maintenance': 'coach-maintenance',
+    'Coach Issues': 'coach-maintenance',
+    'Security': 'security',
+    'Medical Emergency': 'medical',
+    'Punctuality': 'punctuality',
+    'Delay': 'punctuality',
+    'Water Supply': 'amenities',
+    'Theft': 'security',
+    'Corruption': 'staff-behaviour',
+    'Harassment': 'security',
+    'Accessibility': 'amenities',
+    'Infrastructure': 'infrastructure'
+}
 
 def create_notification(user_email, notification_type, title, message, related_id=None, action_url=None):
     """
@@ -88,25 +121,125 @@ def create_notification(user_email, notification_type, title, message, related_i
         return None
 
 
+def get_model_registry(family):
+    """ModelRegistry of a model family ('enhanced' or 'categorizer') under AI_MODEL_REGISTRY_DIR"""
+    from ai_models.model_registry import ModelRegistry
+    return ModelRegistry(
+        getattr(settings, 'AI_MODEL_REGISTRY_DIR', os.path.join(settings.BASE_DIR, 'ai_models', 'registry')),
+        family
+    )
+
+def _build_ai_classifier(model_dir):
+    """EnhancedClassificationService for one model directory, configured from settings"""
+    from ai_models.enhanced_classification_service import EnhancedClassificationService
+    from ai_models.result_cache import build_result_cache_from_settings
+    return EnhancedClassificationService(
+        model_dir=model_dir,
+        use_hybrid=True,  # Enable hybrid classifier for 95%+ accuracy
+        use_multitask=getattr(settings, 'AI_CLASSIFIER_MULTITASK', False),
+        backend=getattr(settings, 'AI_INFERENCE_BACKEND', 'torch'),
+        result_cache=build_result_cache_from_settings('enhanced'),
+        hybrid_options={
+            'short_circuit': getattr(settings, 'AI_RULE_SHORT_CIRCUIT', True),
+            'category_short_circuit_threshold': getattr(settings, 'AI_RULE_CATEGORY_SHORT_CIRCUIT', None)
+        },
+        tokenization_cache_size=getattr(settings, 'AI_TOKENIZATION_CACHE_SIZE', 512),
+        lazy_heads=getattr(settings, 'AI_LAZY_MODEL_HEADS', True)
+    )
+
 def get_ai_classifier():
     """
     Get or create the Enhanced AI Classifier singleton instance
     Uses hybrid intelligence for 95%+ accuracy
     """
     global _classifier_instance
-    if _classifier_instance is None:
+    if _classifier_instance is not None:
+        return _classifier_instance
+    
+    with _classifier_lock:
+        if _classifier_instance is not None:
+            return _classifier_instance
+        
+        _classifier_state['status'] = 'loading'
+        start_time = time.perf_counter()
         try:
-            from ai_models.enhanced_classification_service import EnhancedClassificationService
-            _classifier_instance = EnhancedClassificationService(
-                model_dir='ai_models/models/enhanced',
-                use_hybrid=True  # Enable hybrid classifier for 95%+ accuracy
-            )
+            from ai_models.model_registry import HotSwapModel
+            
+            # Serve the registry's active version when one exists (hot-swapped on change),
+            # the fixed AI_MODEL_DIR otherwise
+            registry = get_model_registry('enhanced')
+            if registry.active_version():
+                _classifier_instance = HotSwapModel(
+                    registry,
+                    lambda model_dir, version: _build_ai_classifier(model_dir),
+                    warmup=lambda service: service.warm_up(),
+                    poll_interval=getattr(settings, 'AI_MODEL_REGISTRY_POLL_SECONDS', 5)
+                )
+            else:
+                _classifier_instance = _build_ai_classifier(
+                    getattr(settings, 'AI_MODEL_DIR', 'ai_models/models/enhanced')
+                )
+            if getattr(settings, 'AI_MICRO_BATCHING', False):
+                from ai_models.micro_batcher import MicroBatcher
+                _classifier_instance = MicroBatcher(
+                    _classifier_instance,
+                    max_batch_size=getattr(settings, 'AI_BATCH_MAX_SIZE', 16),
+                    max_wait_ms=getattr(settings, 'AI_BATCH_MAX_WAIT_MS', 8)
+                )
+            _classifier_state.update({
+                'status': 'ready',
+                'loaded_in_pid': os.getpid(),
+                'load_seconds': round(time.perf_counter() - start_time, 2),
+                'error': None
+            })
             logger.info("✅ Enhanced AI Classifier initialized with hybrid intelligence")
         except Exception as e:
             logger.error(f"❌ Failed to initialize AI classifier: {e}")
             _classifier_instance = None
+            _classifier_state.update({'status': 'failed', 'error': str(e)})
     return _classifier_instance
 
+def get_ai_model_versions():
+    """
+    Registry version of each model family: the active pointer and, for models already
+    loaded in this worker, the version actually serving requests
+    """
+    from ai_models.complaint_categorizer import complaint_categorizer
+    
+    enhanced = get_model_registry('enhanced').get_info()
+    if _classifier_instance is not None:
+        if hasattr(_classifier_instance, 'get_registry_info'):
+            enhanced = _classifier_instance.get_registry_info()
+        else:
+            enhanced['serving_version'] = 'AI_MODEL_DIR'
+            enhanced['model_dir'] = getattr(settings, 'AI_MODEL_DIR', 'ai_models/models/enhanced')
+    
+    return {
+        'enhanced': enhanced,
+        'categorizer': complaint_categorizer.get_registry_info()
+    }
+
+def get_ai_classifier_state():
+    """Copy of the classifier load state (status, pid that loaded it, load time)"""
+    return dict(_classifier_state)
+
+def preload_ai_classifier():
+    """
+    Load the classifier before the server forks its workers (called from backend/wsgi.py
+    when AI_PRELOAD_MODELS is on). With gunicorn's preload_app this runs once in the
+    master and every worker shares the frozen weights copy-on-write.
+    """
+    from ai_models.preload import freeze_heap, memory_report, format_memory
+    
+    classifier = get_ai_classifier()
+    if classifier is not None:
+        classifier.freeze()
+        _classifier_state['preloaded'] = True
+    freeze_heap()
+    
+    logger.info(f"🧊 AI classifier preloaded in pid {os.getpid()} ({format_memory(memory_report())})")
+    return classifier
+
 def send_urgent_notification(complaint):
     """
     Send urgent notifications for critical complaints (99% confidence detection)
@@ -244,29 +377,8 @@ def file_complaint(request):
                     )
                     
                     # Map AI category to form category
-                    category_mapping = {
-                        'Cleanliness': 'coach-cleanliness',
-                        'Catering': 'catering',
-                        'Food Quality': 'catering',
-                        'Staff Behavior': 'staff-behaviour',
-                        'Ticketing': 'ticketing',
-                        'Electrical Issues': 'electrical',
-                        'Coach Maintenance': 'coach-maintenance',
-                        'Coach Issues': 'coach-maintenance',
-                        'Security': 'security',
-                        'Medical Emergency': 'medical',
-                        'Punctuality': 'punctuality',
-                        'Delay': 'punctuality',
-                        'Water Supply': 'amenities',
-                        'Theft': 'security',
-                        'Corruption': 'staff-behaviour',
-                        'Harassment': 'security',
-                        'Accessibility': 'amenities',
-                        'Infrastructure': 'infrastructure'
-                    }
-                    
                     ai_category = ai_result.get('category', 'Miscellaneous')
-                    mapped_category = category_mapping.get(ai_category, 'miscellaneous')
+                    mapped_category = AI_CATEGORY_MAPPING.get(ai_category, 'miscellaneous')
                     
                     # Only override if user didn't provide a category
                     if not data.get('type'):
@@ -1213,6 +1325,91 @@ def admin_staff_detail(request, pk):
         print(f"Staff deleted: {staff.full_name}")
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+def _admin_dashboard_stats_data():
+    """Data of admin_dashboard_stats (cached by complaints/dashboard_cache.py)"""
+    from django.db.models import Count
+    from datetime import timedelta
+    import logging
+    from .daily_stats import average_resolution_hours, daily_counts, totals as rollup_totals
+    
+    logger = logging.getLogger(__name__)
+    
+    now = timezone.now()
+    today = timezone.localdate()
+    trend_start = today - timedelta(days=29)
+    
+    # Counts and resolution time come from the daily stats rollup (complaints/daily_stats.py)
+    totals = rollup_totals()
+    total_complaints = totals['total']
+    open_complaints = totals['open']
+    in_progress_complaints = totals['in_progress']
+    closed_complaints = totals['closed']
+    
+    # Complaints open for more than 48 hours (finer than the rollup's days)
+    pending_escalations = Complaint.objects.filter(
+        status__in=['Open', 'In Progress'],
+        created_at__lt=now - timedelta(hours=48)
+    ).count()
+    
+    print(f"[ADMIN_STATS] Complaints: Total={total_complaints}, Open={open_complaints}, InProgress={in_progress_complaints}, Closed={closed_complaints}")
+    
+    # Complaint trends for the last 30 days: open / in progress by creation day,
+    # closed by resolution day
+    days = daily_counts(trend_start, today)
+    
+    complaint_trends = []
+    for i in range(30):
+        date = trend_start + timedelta(days=i)
+        day = days.get(date, {})
+        complaint_trends.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'open': day.get('open', 0),
+            'in_progress': day.get('in_progress', 0),
+            'closed': day.get('closed', 0)
+        })
+    
+    # Today's statistics
+    today_complaints = days.get(today, {}).get('created', 0)
+    today_resolved = days.get(today, {}).get('closed', 0)
+    logger.info(f"[ADMIN_STATS] Today: Complaints={today_complaints}, Resolved={today_resolved}")
+    
+    # Staff statistics - fetch from Staff model (accounts app)
+    from accounts.models import Staff
+    
+    staff_counts = Staff.objects.aggregate(
+        total=Count('pk'),
+        active=Count('pk', filter=Q(status='active'))
+    )
+    
+    # Ensure at least 1 to avoid division by zero
+    total_staff = staff_counts['total'] or 1
+    active_staff = staff_counts['active'] or 1
+    
+    print(f"[ADMIN_STATS] Final total_staff: {total_staff}, active_staff: {active_staff}")
+    
+    # Resolution statistics
+    resolution_rate = round((closed_complaints / total_complaints * 100), 2) if total_complaints > 0 else 0
+    print(f"[ADMIN_STATS] Resolution rate: {resolution_rate}%")
+    
+    avg_hours = average_resolution_hours(totals)
+    average_resolution_time = f"{avg_hours:.1f}h" if avg_hours is not None else "0h"
+    
+    response_data = {
+        'totalComplaints': total_complaints,
+        'openComplaints': open_complaints,
+        'inProgressComplaints': in_progress_complaints,
+        'closedComplaints': closed_complaints,
+        'todayComplaints': today_complaints,
+        'todayResolved': today_resolved,
+        'totalStaff': total_staff,
+        'activeStaff': active_staff,
+        'resolutionRate': resolution_rate,
+        'averageResolutionTime': average_resolution_time,
+        'pendingEscalations': pending_escalations,
+        'complaintTrends': complaint_trends
+    }
+    return response_data
+
 # Admin Dashboard Statistics API View
 @api_view(['GET'])
 def admin_dashboard_stats(request):
@@ -1233,139 +1430,23 @@ def admin_dashboard_stats(request):
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
-        from django.db.models import Count
-        from datetime import timedelta
         import logging
+        from .dashboard_cache import cached_data
         
         logger = logging.getLogger(__name__)
         print(f"[ADMIN_STATS] Request from user: {getattr(request, 'firebase_email', 'Unknown')}")
         print(f"[ADMIN_STATS] is_admin: {getattr(request, 'is_admin', False)}, is_staff: {getattr(request, 'is_staff', False)}")
         
-        # Basic complaint counts
-        print("[ADMIN_STATS] Fetching complaint counts...")
-        total_complaints = Complaint.objects.count()
-        print(f"[ADMIN_STATS] Total complaints in DB: {total_complaints}")
-        
-        open_complaints = Complaint.objects.filter(status='Open').count()
-        print(f"[ADMIN_STATS] Open complaints: {open_complaints}")
-        
-        in_progress_complaints = Complaint.objects.filter(status='In Progress').count()
-        print(f"[ADMIN_STATS] In Progress complaints: {in_progress_complaints}")
-        
-        closed_complaints = Complaint.objects.filter(status='Closed').count()
-        print(f"[ADMIN_STATS] Closed complaints: {closed_complaints}")
-        
-        print(f"[ADMIN_STATS] Complaints: Total={total_complaints}, Open={open_complaints}, InProgress={in_progress_complaints}, Closed={closed_complaints}")
-        
-        # Today's statistics
-        logger.info("[ADMIN_STATS] Calculating today's statistics...")
-        today = timezone.now().date()
-        today_complaints = Complaint.objects.filter(created_at__date=today).count()
-        today_resolved = Complaint.objects.filter(
-            status='Closed', 
-            resolved_at__date=today
-        ).count()
-        logger.info(f"[ADMIN_STATS] Today: Complaints={today_complaints}, Resolved={today_resolved}")
-        
-        # Staff statistics - fetch from Staff model (accounts app)
-        logger.info("[ADMIN_STATS] Fetching staff statistics...")
-        from accounts.models import Staff
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        
-        # Get staff count from Staff model only
-        total_staff = Staff.objects.count()
-        active_staff = Staff.objects.filter(status='active').count()
-        
-        print(f"[ADMIN_STATS] Staff from Staff model: {total_staff}")
-        print(f"[ADMIN_STATS] Active staff: {active_staff}")
-        
-        # Ensure at least 1 to avoid division by zero
-        if total_staff == 0:
-            total_staff = 1
-        if active_staff == 0:
-            active_staff = 1
-        
-        print(f"[ADMIN_STATS] Final total_staff: {total_staff}, active_staff: {active_staff}")
-        
-        # Resolution statistics
-        resolution_rate = round((closed_complaints / total_complaints * 100), 2) if total_complaints > 0 else 0
-        print(f"[ADMIN_STATS] Resolution rate: {resolution_rate}%")
-        
-        # Calculate average resolution time
-        resolved_complaints = Complaint.objects.filter(
-            status='Closed',
-            resolved_at__isnull=False,
-            created_at__isnull=False
+        # Computed at most once per TTL / data change (complaints/dashboard_cache.py)
+        response_data, cache_status = cached_data(
+            'admin_dashboard_stats', ('complaints', 'staff'), _admin_dashboard_stats_data
         )
         
-        if resolved_complaints.exists():
-            total_resolution_time = 0
-            count = 0
-            for complaint in resolved_complaints:
-                if complaint.resolved_at and complaint.created_at:
-                    diff = complaint.resolved_at - complaint.created_at
-                    total_resolution_time += diff.total_seconds()
-                    count += 1
-            
-            if count > 0:
-                avg_seconds = total_resolution_time / count
-                avg_hours = avg_seconds / 3600
-                average_resolution_time = f"{avg_hours:.1f}h"
-            else:
-                average_resolution_time = "0h"
-        else:
-            average_resolution_time = "0h"
-        
-        # Pending escalations (complaints open for more than 48 hours)
-        forty_eight_hours_ago = timezone.now() - timedelta(hours=48)
-        pending_escalations = Complaint.objects.filter(
-            status__in=['Open', 'In Progress'],
-            created_at__lt=forty_eight_hours_ago
-        ).count()
-        
-        # Generate complaint trends data for the last 30 days
-        complaint_trends = []
-        for i in range(30):
-            date = today - timedelta(days=29-i)
-            day_open = Complaint.objects.filter(
-                created_at__date=date,
-                status='Open'
-            ).count()
-            day_progress = Complaint.objects.filter(
-                created_at__date=date,
-                status='In Progress'
-            ).count()
-            day_closed = Complaint.objects.filter(
-                resolved_at__date=date,
-                status='Closed'
-            ).count()
-            
-            complaint_trends.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'open': day_open,
-                'in_progress': day_progress,
-                'closed': day_closed
-            })
-        
-        response_data = {
-            'totalComplaints': total_complaints,
-            'openComplaints': open_complaints,
-            'inProgressComplaints': in_progress_complaints,
-            'closedComplaints': closed_complaints,
-            'todayComplaints': today_complaints,
-            'todayResolved': today_resolved,
-            'totalStaff': total_staff,
-            'activeStaff': active_staff,
-            'resolutionRate': resolution_rate,
-            'averageResolutionTime': average_resolution_time,
-            'pendingEscalations': pending_escalations,
-            'complaintTrends': complaint_trends
-        }
-        
-        logger.info(f"[ADMIN_STATS] Prepared response with {len(complaint_trends)} trend entries")
+        logger.info(f"[ADMIN_STATS] Prepared response with {len(response_data['complaintTrends'])} trend entries (cache: {cache_status})")
         logger.info(f"[ADMIN_STATS] Dashboard stats response: totalComplaints={response_data['totalComplaints']}, totalStaff={response_data['totalStaff']}")
-        return Response(response_data)
+        response = Response(response_data)
+        response['X-Dashboard-Cache'] = cache_status
+        return response
         
     except Exception as e:
         print("=" * 80)
@@ -1471,46 +1552,47 @@ def admin_recent_activity(request):
     
     return Response(activity_data[:15])  # Return top 15 activities
 
-@api_view(['GET'])
-@authentication_classes([])
-@permission_classes([])
-def admin_performance_metrics(request):
-    """
-    Get detailed performance metrics for admin
-    """
+def _performance_metrics_data():
+    """Data of admin_performance_metrics (cached by complaints/dashboard_cache.py)"""
     from accounts.models import Staff
+    from .daily_stats import daily_counts, staff_counts
     
-    if not getattr(request, 'is_authenticated', False):
-        return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
-    if not getattr(request, 'is_admin', False) and not getattr(request, 'is_staff', False):
-        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
-    
-    # Time periods
-    now = timezone.now()
-    today = now.date()
-    week_ago = today - timedelta(days=7)
-    month_ago = today - timedelta(days=30)
-    
-    # Daily stats for the last 30 days
+    # Daily stats for the last 30 days, from the rollup
+    today = timezone.localdate()
+    days = daily_counts(today - timedelta(days=29), today)
     daily_stats = []
     for i in range(30):
         date = today - timedelta(days=i)
-        day_complaints = Complaint.objects.filter(created_at__date=date).count()
-        day_resolved = Complaint.objects.filter(resolved_at__date=date).count()
+        counts = days.get(date, {})
         daily_stats.append({
             'date': date.strftime('%Y-%m-%d'),
-            'new_complaints': day_complaints,
-            'resolved_complaints': day_resolved
+            'new_complaints': counts.get('created', 0),
+            'resolved_complaints': counts.get('closed', 0)
         })
     
-    # Staff performance
+    # Complaints grouped by staff in one query, joined to the staff rows in memory
+    complaint_counts = staff_counts()
+    staff_members = Staff.objects.only('user_id', 'full_name', 'department', 'rating', 'status').order_by('user_id')
+    
     staff_performance = []
-    for staff in Staff.objects.filter(status='active'):
-        assigned_complaints = Complaint.objects.filter(staff=staff.full_name).count()
-        resolved_complaints = Complaint.objects.filter(
-            staff=staff.full_name, 
-            status='Closed'
-        ).count()
+    departments = {}
+    for staff in staff_members:
+        assigned_complaints, resolved_complaints = complaint_counts.get(staff.full_name, (0, 0))
+        
+        dept = departments.setdefault(staff.department, {
+            'department': staff.department,
+            'total_staff': 0,
+            'active_staff': 0,
+            'complaints_handled': 0,
+            'complaints_resolved': 0
+        })
+        dept['total_staff'] += 1
+        dept['complaints_handled'] += assigned_complaints
+        dept['complaints_resolved'] += resolved_complaints
+        
+        if staff.status != 'active':
+            continue
+        dept['active_staff'] += 1
         
         resolution_rate = 0
         if assigned_complaints > 0:
@@ -1530,39 +1612,37 @@ def admin_performance_metrics(request):
     staff_performance.sort(key=lambda x: x['resolution_rate'], reverse=True)
     
     # Department performance
-    departments = Staff.objects.values_list('department', flat=True).distinct()
     department_stats = []
+    for dept in departments.values():
+        dept['resolution_rate'] = 0
+        if dept['complaints_handled'] > 0:
+            dept['resolution_rate'] = round((dept['complaints_resolved'] / dept['complaints_handled']) * 100, 2)
+        department_stats.append(dept)
     
-    for dept in departments:
-        dept_staff = Staff.objects.filter(department=dept)
-        total_staff = dept_staff.count()
-        active_staff = dept_staff.filter(status='active').count()
-        
-        # Get complaints handled by this department
-        dept_complaints = 0
-        dept_resolved = 0
-        for staff in dept_staff:
-            dept_complaints += Complaint.objects.filter(staff=staff.full_name).count()
-            dept_resolved += Complaint.objects.filter(staff=staff.full_name, status='Closed').count()
-        
-        dept_resolution_rate = 0
-        if dept_complaints > 0:
-            dept_resolution_rate = round((dept_resolved / dept_complaints) * 100, 2)
-        
-        department_stats.append({
-            'department': dept,
-            'total_staff': total_staff,
-            'active_staff': active_staff,
-            'complaints_handled': dept_complaints,
-            'complaints_resolved': dept_resolved,
-            'resolution_rate': dept_resolution_rate
-        })
-    
-    return Response({
+    return {
         'daily_stats': daily_stats,
         'staff_performance': staff_performance[:10],  # Top 10 performers
         'department_stats': department_stats
-    })
+    }
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([])
+def admin_performance_metrics(request):
+    """
+    Get detailed performance metrics for admin
+    """
+    from .dashboard_cache import cached_data
+    
+    if not getattr(request, 'is_authenticated', False):
+        return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+    if not getattr(request, 'is_admin', False) and not getattr(request, 'is_staff', False):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+    
+    data, cache_status = cached_data('admin_performance_metrics', ('complaints', 'staff'), _performance_metrics_data)
+    response = Response(data)
+    response['X-Dashboard-Cache'] = cache_status
+    return response
 
 # Add a simple admin settings endpoint
 @api_view(['GET', 'POST'])
@@ -1609,6 +1689,48 @@ def admin_settings(request):
         # For now, just return success
         return Response({'message': 'Settings updated successfully'})
 
+def _complaint_trends_data(days):
+    """Data of admin_complaint_trends (cached by complaints/dashboard_cache.py)"""
+    from datetime import timedelta
+    from .daily_stats import counts_by, daily_counts, totals
+    
+    today = timezone.localdate()
+    start = today - timedelta(days=days-1)
+    
+    # Generate trends data from the daily stats rollup: open / in progress by
+    # creation day, closed by resolution day
+    day_counts = daily_counts(start, today)
+    trends_data = []
+    for i in range(days):
+        date = start + timedelta(days=i)
+        day = day_counts.get(date, {})
+        
+        trends_data.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'open': day.get('open', 0),
+            'in_progress': day.get('in_progress', 0),
+            'closed': day.get('closed', 0),
+            'total_created': day.get('created', 0)
+        })
+    
+    # Also get complaint type distribution
+    type_distribution = counts_by('type', 10)
+    
+    # Get status distribution over time
+    complaint_totals = totals()
+    status_distribution = {
+        'open': complaint_totals['open'],
+        'in_progress': complaint_totals['in_progress'],
+        'closed': complaint_totals['closed']
+    }
+    
+    return {
+        'trends': trends_data,
+        'type_distribution': type_distribution,
+        'status_distribution': status_distribution,
+        'total_complaints': complaint_totals['total']
+    }
+
 @api_view(['GET'])
 def admin_complaint_trends(request):
     """
@@ -1622,53 +1744,17 @@ def admin_complaint_trends(request):
         return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
-        from datetime import timedelta
+        from .dashboard_cache import cached_data
         
         # Get date range from query params (default to 30 days)
         days = int(request.GET.get('days', 30))
-        today = timezone.now().date()
-        
-        # Generate trends data
-        trends_data = []
-        for i in range(days):
-            date = today - timedelta(days=days-1-i)
-            
-            # Count complaints created on this date by status
-            day_complaints = Complaint.objects.filter(created_at__date=date)
-            day_resolved = Complaint.objects.filter(resolved_at__date=date, status='Closed')
-            
-            open_count = day_complaints.filter(status='Open').count()
-            progress_count = day_complaints.filter(status='In Progress').count()
-            closed_count = day_resolved.count()
-            
-            trends_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'open': open_count,
-                'in_progress': progress_count,
-                'closed': closed_count,
-                'total_created': day_complaints.count()
-            })
         
-        # Also get complaint type distribution
-        type_distribution = list(
-            Complaint.objects.values('type')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:10]
+        data, cache_status = cached_data(
+            'admin_complaint_trends', ('complaints',), lambda: _complaint_trends_data(days), {'days': days}
         )
-        
-        # Get status distribution over time
-        status_distribution = {
-            'open': Complaint.objects.filter(status='Open').count(),
-            'in_progress': Complaint.objects.filter(status='In Progress').count(),
-            'closed': Complaint.objects.filter(status='Closed').count()
-        }
-        
-        return Response({
-            'trends': trends_data,
-            'type_distribution': type_distribution,
-            'status_distribution': status_distribution,
-            'total_complaints': Complaint.objects.count()
-        })
+        response = Response(data)
+        response['X-Dashboard-Cache'] = cache_status
+        return response
         
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -2003,10 +2089,13 @@ def smart_classification_stats(request):
         from datetime import datetime, timedelta
         import random
         
+        from .daily_stats import counts_by, daily_counts, totals
+        
         # For demo purposes, we'll generate realistic stats
         # In production, you would calculate these from your ML classification system
-        total_classified = Complaint.objects.count()
-        today_classified = Complaint.objects.filter(created_at__date=timezone.now().date()).count()
+        today = timezone.localdate()
+        total_classified = totals()['total']
+        today_classified = daily_counts(today, today).get(today, {}).get('created', 0)
         
         # Generate category distribution based on actual complaints
         categories = [
@@ -2020,9 +2109,13 @@ def smart_classification_stats(request):
             'Catering / Vending Services'
         ]
         
+        # Complaint counts per type from the daily stats rollup, matched like type__icontains
+        type_counts = [(row['type'].lower(), row['count']) for row in counts_by('type')]
+        
         category_distribution = []
         for cat in categories:
-            count = Complaint.objects.filter(type__icontains=cat.split()[0]).count()
+            keyword = cat.split()[0].lower()
+            count = sum(type_count for complaint_type, type_count in type_counts if keyword in complaint_type)
             if count > 0:
                 category_distribution.append({'type': cat, 'count': count})
         
@@ -2172,38 +2265,20 @@ def quick_resolution_stats(request):
     #     return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
-        # Calculate resolution statistics
-        total_complaints = Complaint.objects.count()
-        resolved_complaints = Complaint.objects.filter(status='Closed').count()
+        from .daily_stats import average_resolution_hours, totals
+        
+        # Calculate resolution statistics from the daily stats rollup
+        complaint_totals = totals()
+        total_complaints = complaint_totals['total']
+        resolved_complaints = complaint_totals['closed']
         
         success_rate = round((resolved_complaints / total_complaints * 100), 1) if total_complaints > 0 else 0
         
         # Calculate average resolution time
-        resolved_with_time = Complaint.objects.filter(
-            status='Closed',
-            resolved_at__isnull=False,
-            created_at__isnull=False
-        )
-        
-        if resolved_with_time.exists():
-            total_time = 0
-            count = 0
-            for complaint in resolved_with_time:
-                if complaint.resolved_at and complaint.created_at:
-                    diff = complaint.resolved_at - complaint.created_at
-                    total_time += diff.total_seconds()
-                    count += 1
-            
-            if count > 0:
-                avg_seconds = total_time / count
-                avg_hours = round(avg_seconds / 3600, 1)
-                avg_resolution_time = f"{avg_hours}h"
-            else:
-                avg_resolution_time = "0h"
-        else:
-            avg_resolution_time = "0h"
+        avg_hours = average_resolution_hours(complaint_totals)
+        avg_resolution_time = f"{round(avg_hours, 1)}h" if avg_hours is not None else "0h"
         
-        pending_issues = Complaint.objects.filter(status__in=['Open', 'In Progress']).count()
+        pending_issues = complaint_totals['open'] + complaint_totals['in_progress']
         
         return Response({
             'success_rate': success_rate,
@@ -2468,6 +2543,68 @@ def create_support_ticket(request):
         logger.error(f"Error in create_support_ticket: {str(e)}")
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _feedback_sentiment_data():
+    """Data of feedback_sentiment_stats (cached by complaints/dashboard_cache.py)"""
+    # Get sentiment statistics
+    total_feedback = Feedback.objects.count()
+    positive_feedback = Feedback.objects.filter(sentiment='POSITIVE').count()
+    negative_feedback = Feedback.objects.filter(sentiment='NEGATIVE').count()
+    neutral_feedback = Feedback.objects.filter(sentiment='NEUTRAL').count()
+    
+    # Calculate percentages
+    if total_feedback > 0:
+        positive_percent = round((positive_feedback / total_feedback) * 100, 1)
+        negative_percent = round((negative_feedback / total_feedback) * 100, 1)
+        neutral_percent = round((neutral_feedback / total_feedback) * 100, 1)
+    else:
+        positive_percent = 0
+        negative_percent = 0
+        neutral_percent = 0
+    
+    # Get average feedback rating
+    avg_rating = Feedback.objects.aggregate(Avg('rating'))['rating__avg'] or 0
+    
+    # Get sentiment by category
+    categories = Feedback.objects.values_list('category', flat=True).distinct()
+    category_sentiment = []
+    
+    for category in categories:
+        category_feedback = Feedback.objects.filter(category=category)
+        category_total = category_feedback.count()
+        category_positive = category_feedback.filter(sentiment='POSITIVE').count()
+        
+        if category_total > 0:
+            sentiment_score = round((category_positive / category_total) * 100, 1)
+        else:
+            sentiment_score = 0
+        
+        category_sentiment.append({
+            'category': category,
+            'total': category_total,
+            'positive_percent': sentiment_score,
+            'avg_rating': category_feedback.aggregate(Avg('rating'))['rating__avg'] or 0
+        })
+    
+    # Get recent feedback with sentiment
+    recent_feedback = Feedback.objects.order_by('-submitted_at')[:10].values(
+        'id', 'feedback_message', 'rating', 'sentiment', 'sentiment_confidence', 'submitted_at'
+    )
+    
+    return {
+        'total_feedback': total_feedback,
+        'sentiment_distribution': {
+            'positive': positive_feedback,
+            'negative': negative_feedback,
+            'neutral': neutral_feedback,
+            'positive_percent': positive_percent,
+            'negative_percent': negative_percent,
+            'neutral_percent': neutral_percent
+        },
+        'avg_rating': round(avg_rating, 1),
+        'category_sentiment': category_sentiment,
+        'recent_feedback': list(recent_feedback)
+    }
+
 @api_view(['GET'])
 def feedback_sentiment_stats(request):
     """
@@ -2483,65 +2620,12 @@ def feedback_sentiment_stats(request):
     #     return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
-        # Get sentiment statistics
-        total_feedback = Feedback.objects.count()
-        positive_feedback = Feedback.objects.filter(sentiment='POSITIVE').count()
-        negative_feedback = Feedback.objects.filter(sentiment='NEGATIVE').count()
-        neutral_feedback = Feedback.objects.filter(sentiment='NEUTRAL').count()
-        
-        # Calculate percentages
-        if total_feedback > 0:
-            positive_percent = round((positive_feedback / total_feedback) * 100, 1)
-            negative_percent = round((negative_feedback / total_feedback) * 100, 1)
-            neutral_percent = round((neutral_feedback / total_feedback) * 100, 1)
-        else:
-            positive_percent = 0
-            negative_percent = 0
-            neutral_percent = 0
-        
-        # Get average feedback rating
-        avg_rating = Feedback.objects.aggregate(Avg('rating'))['rating__avg'] or 0
+        from .dashboard_cache import cached_data
         
-        # Get sentiment by category
-        categories = Feedback.objects.values_list('category', flat=True).distinct()
-        category_sentiment = []
-        
-        for category in categories:
-            category_feedback = Feedback.objects.filter(category=category)
-            category_total = category_feedback.count()
-            category_positive = category_feedback.filter(sentiment='POSITIVE').count()
-            
-            if category_total > 0:
-                sentiment_score = round((category_positive / category_total) * 100, 1)
-            else:
-                sentiment_score = 0
-            
-            category_sentiment.append({
-                'category': category,
-                'total': category_total,
-                'positive_percent': sentiment_score,
-                'avg_rating': category_feedback.aggregate(Avg('rating'))['rating__avg'] or 0
-            })
-        
-        # Get recent feedback with sentiment
-        recent_feedback = Feedback.objects.order_by('-submitted_at')[:10].values(
-            'id', 'feedback_message', 'rating', 'sentiment', 'sentiment_confidence', 'submitted_at'
-        )
-        
-        return Response({
-            'total_feedback': total_feedback,
-            'sentiment_distribution': {
-                'positive': positive_feedback,
-                'negative': negative_feedback,
-                'neutral': neutral_feedback,
-                'positive_percent': positive_percent,
-                'negative_percent': negative_percent,
-                'neutral_percent': neutral_percent
-            },
-            'avg_rating': round(avg_rating, 1),
-            'category_sentiment': category_sentiment,
-            'recent_feedback': list(recent_feedback)
-        })
+        data, cache_status = cached_data('feedback_sentiment_stats', ('feedback',), _feedback_sentiment_data)
+        response = Response(data)
+        response['X-Dashboard-Cache'] = cache_status
+        return response
         
     except Exception as e:
         logger.error(f"Error in feedback_sentiment_stats: {str(e)}")
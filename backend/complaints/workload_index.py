@@ -0,0 +1,297 @@
+"""
+Live Staff Workload Index
+Keeps every active staff member's open / open high-severity complaint counts in
+process memory, so ComplaintAssignmentService.assign_complaint can pick the least
+loaded matching staff member without touching the database.
+
+  - one min-heap per expertise area, keyed by (load, staff id); load is the penalty
+    part of find_best_staff's score (10 per open complaint, 20 more per severe one),
+    so the heap top is the staff member find_best_staff would choose
+  - heap entries are invalidated lazily: a staff member's stamp only ever grows, changes
+    on every update and on deactivation, and outdated entries (or entries of staff no
+    longer active) are dropped when they reach the top
+  - complaint saves and deletes update the counts through signals (complaints/signals.py)
+  - a background thread rebuilds everything from the database every
+    WORKLOAD_INDEX_RECONCILE_SECONDS, correcting changes made by other worker
+    processes or by queryset.update() calls, which bypass signals; changes arriving
+    while it reads the database are buffered and replayed on the rebuilt index
+
+Each process has its own index: an assignment made by another worker is seen after
+the next reconciliation at the latest.
+"""
+
+import os
+import time
+import heapq
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+OPEN_STATUSES = ('Open', 'In Progress')
+OPEN_WEIGHT = 10
+SEVERE_WEIGHT = 20
+
+
+def complaint_load(status, severity):
+    """(open, severe) contribution of one complaint"""
+    if status not in OPEN_STATUSES:
+        return 0, 0
+    return 1, 1 if severity == 'High' else 0
+
+
+class WorkloadIndex:
+    """Per-staff open/severe counters with a min-heap of staff per expertise area"""
+
+    def __init__(self, reconcile_interval=60):
+        self.reconcile_interval = reconcile_interval
+
+        self._lock = threading.RLock()
+        self._counts = {}       # staff name -> [open, severe] (any name found on complaints)
+        self._staff = {}        # staff id -> (name, expertise frozenset) of active staff
+        self._staff_ids = {}    # staff name -> staff id
+        self._heaps = {}        # expertise -> [(load, staff id, stamp), ...]
+        self._stamps = {}       # staff id -> stamp of its current heap entries (never reset while heaps live)
+        self._buffers = []      # one list of changes per rebuild in progress, replayed after its swap
+
+        self._ready = False
+        self._owner_pid = None  # reconciliation thread belongs to one process (not inherited by fork)
+        self._stats = {'reconciliations': 0, 'last_reconcile_at': None, 'last_reconcile_ms': None,
+                       'last_drift': 0, 'updates': 0, 'lookups': 0}
+
+    # ----- building -----
+
+    def rebuild(self):
+        """Rebuild the index from the database (2 queries)"""
+        from .assignment_service import ComplaintAssignmentService
+        from .expertise_index import expertise_index
+        from .models import Staff
+
+        start_time = time.perf_counter()
+        buffer = []
+        with self._lock:
+            self._buffers.append(buffer)
+        try:
+            staff_rows = list(
+                Staff.objects.filter(status='active').values_list('id', 'name', 'expertise')
+            )
+            workloads = ComplaintAssignmentService.get_open_workloads()
+        except Exception:
+            with self._lock:
+                self._buffers.remove(buffer)
+            raise
+        expertise_index.rebuild(staff_rows)
+
+        staff = {
+            staff_id: (name, ComplaintAssignmentService.parse_expertise(expertise))
+            for staff_id, name, expertise in staff_rows
+        }
+        counts = {name: [open_count, severe_count] for name, (open_count, severe_count) in workloads.items()}
+
+        heaps = {}
+        for staff_id, (name, expertise) in staff.items():
+            open_count, severe_count = counts.get(name, (0, 0))
+            entry = (open_count * OPEN_WEIGHT + severe_count * SEVERE_WEIGHT, staff_id, 0)
+            for area in expertise:
+                heaps.setdefault(area, []).append(entry)
+        for heap in heaps.values():
+            heapq.heapify(heap)
+
+        with self._lock:
+            drift = sum(
+                1 for name, values in counts.items() if self._counts.get(name, [0, 0]) != values
+            ) if self._ready else 0
+            self._counts = counts
+            self._staff = staff
+            self._staff_ids = {name: staff_id for staff_id, (name, _) in staff.items()}
+            self._heaps = heaps
+            self._stamps = dict.fromkeys(staff, 0)
+            self._ready = True
+
+            # Changes committed while the rows were read would otherwise be lost until the
+            # next reconciliation (one committed just before the read may count twice)
+            self._buffers.remove(buffer)
+            for apply, args in buffer:
+                apply(*args)
+            self._stats.update({
+                'reconciliations': self._stats['reconciliations'] + 1,
+                'last_reconcile_at': time.time(),
+                'last_reconcile_ms': round((time.perf_counter() - start_time) * 1000, 2),
+                'last_drift': drift
+            })
+
+        if drift:
+            logger.info(f"Workload index reconciled: {drift} staff counters corrected")
+
+    def ensure_ready(self):
+        """Build the index on first use in this process and start its reconciliation thread"""
+        if self._owner_pid == os.getpid():
+            return self._ready
+
+        with self._lock:
+            if self._owner_pid == os.getpid():
+                return self._ready
+            self._owner_pid = os.getpid()
+            self._ready = False
+
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.error(f"Failed to build workload index: {str(e)}")
+
+        threading.Thread(target=self._reconcile_loop, name='workload-index', daemon=True).start()
+        return self._ready
+
+    def _reconcile_loop(self):
+        pid = os.getpid()
+        while self._owner_pid == pid:
+            time.sleep(self.reconcile_interval)
+            try:
+                self.rebuild()
+            except Exception as e:
+                logger.error(f"Workload index reconciliation failed: {str(e)}")
+            finally:
+                close_old_connections()
+
+    # ----- updates -----
+
+    def _push(self, staff_id):
+        """New heap entries for a staff member after its counts changed"""
+        name, expertise = self._staff[staff_id]
+        open_count, severe_count = self._counts.get(name, (0, 0))
+        stamp = self._stamps.get(staff_id, 0) + 1
+        self._stamps[staff_id] = stamp
+
+        entry = (open_count * OPEN_WEIGHT + severe_count * SEVERE_WEIGHT, staff_id, stamp)
+        for area in expertise:
+            heap = self._heaps[area]
+            heapq.heappush(heap, entry)
+            if len(heap) > 64 and len(heap) > 4 * len(self._staff):
+                self._compact(area)
+
+    def _valid(self, entry):
+        """Entry of an active staff member with its current stamp"""
+        return entry[1] in self._staff and entry[2] == self._stamps.get(entry[1])
+
+    def _compact(self, area):
+        self._heaps[area] = [entry for entry in self._heaps[area] if self._valid(entry)]
+        heapq.heapify(self._heaps[area])
+
+    def _add(self, staff_name, open_delta, severe_delta):
+        if not staff_name or (open_delta == 0 and severe_delta == 0):
+            return
+        counts = self._counts.setdefault(staff_name, [0, 0])
+        counts[0] = max(0, counts[0] + open_delta)
+        counts[1] = max(0, counts[1] + severe_delta)
+
+        staff_id = self._staff_ids.get(staff_name)
+        if staff_id is not None:
+            self._push(staff_id)
+
+    def complaint_changed(self, before, after):
+        """
+        Apply one complaint change; before / after are (staff, status, severity) tuples,
+        None for a created / deleted complaint
+        """
+        if before == after:
+            return
+
+        with self._lock:
+            for buffer in self._buffers:
+                buffer.append((self._apply_complaint, (before, after)))
+            if self._ready:
+                self._apply_complaint(before, after)
+
+    def _apply_complaint(self, before, after):
+        with self._lock:
+            if before is not None:
+                open_count, severe_count = complaint_load(before[1], before[2])
+                self._add(before[0], -open_count, -severe_count)
+            if after is not None:
+                open_count, severe_count = complaint_load(after[1], after[2])
+                self._add(after[0], open_count, severe_count)
+            self._stats['updates'] += 1
+
+    def staff_changed(self, staff_id, name, raw_expertise, active):
+        """A Staff row was saved or deleted: move it between the expertise heaps"""
+        with self._lock:
+            for buffer in self._buffers:
+                buffer.append((self._apply_staff, (staff_id, name, raw_expertise, active)))
+            if self._ready:
+                self._apply_staff(staff_id, name, raw_expertise, active)
+
+    def _apply_staff(self, staff_id, name, raw_expertise, active):
+        from .assignment_service import ComplaintAssignmentService
+
+        with self._lock:
+            old_name, _ = self._staff.pop(staff_id, (None, None))
+            if self._staff_ids.get(old_name) == staff_id:
+                del self._staff_ids[old_name]
+            # Outdate its heap entries; the stamp is kept, so a reactivation pushes
+            # entries with a newer stamp instead of reviving the old ones
+            self._stamps[staff_id] = self._stamps.get(staff_id, 0) + 1
+            if not active:
+                return
+
+            expertise = ComplaintAssignmentService.parse_expertise(raw_expertise)
+            self._staff[staff_id] = (name, expertise)
+            self._staff_ids[name] = staff_id
+            for area in expertise:
+                self._heaps.setdefault(area, [])
+            self._push(staff_id)
+
+    # ----- lookups -----
+
+    def _top(self, area):
+        heap = self._heaps.get(area)
+        while heap and not self._valid(heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def best_staff(self, required_expertise):
+        """
+        Least loaded active staff member with any of the required expertise areas
+
+        Returns:
+            (staff_name, staff_id) or (None, None); None when the index is not built
+        """
+        if not self.ensure_ready():
+            return None
+
+        with self._lock:
+            self._stats['lookups'] += 1
+            best = None
+            for area in required_expertise:
+                top = self._top(area)
+                if top is not None and (best is None or top[:2] < best[:2]):
+                    best = top
+
+            if best is None:
+                return None, None
+            return self._staff[best[1]][0], best[1]
+
+    def get_workload(self, staff_name):
+        """(open, severe) complaint counts of one staff member"""
+        with self._lock:
+            return tuple(self._counts.get(staff_name, (0, 0)))
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'ready': self._ready,
+                'staff': len(self._staff),
+                'expertise_areas': len(self._heaps),
+                'heap_entries': sum(len(heap) for heap in self._heaps.values()),
+                'reconcile_interval': self.reconcile_interval,
+                **self._stats
+            }
+
+
+# Global instance
+workload_index = WorkloadIndex(
+    reconcile_interval=getattr(settings, 'WORKLOAD_INDEX_RECONCILE_SECONDS', 60)
+)
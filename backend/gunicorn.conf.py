@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration - read automatically when gunicorn starts in backend/
+Command line flags (e.g. --workers 2 --timeout 120 in the systemd unit) still win.
+
+Usage: gunicorn backend.wsgi:application
+
+AI_PRELOAD_MODELS=True loads the AI classifier once in the master before the
+workers are forked (see backend/wsgi.py and ai_models/preload.py), so N workers
+cost about one copy of the model weights instead of N. Each worker logs its
+RSS / PSS after start; GET /api/complaints/ai/ready/ reports it at runtime.
+
+AI_MICRO_BATCHING=True only merges requests served by threads of one worker, so it
+switches the workers to gthread with GUNICORN_THREADS threads (default 4); with one
+thread per worker there is nothing to batch.
+"""
+
+import os
+
+preload_app = os.getenv('AI_PRELOAD_MODELS', 'False').lower() == 'true'
+
+micro_batching = os.getenv('AI_MICRO_BATCHING', 'False').lower() == 'true'
+# More than one thread makes gunicorn use the gthread worker class
+threads = int(os.getenv('GUNICORN_THREADS') or (4 if micro_batching else 1))
+
+
+def when_ready(server):
+    from ai_models.preload import memory_report, format_memory
+    server.log.info(
+        f"Master {os.getpid()} ready (preload_app={preload_app}): {format_memory(memory_report())}"
+    )
+
+
+def post_worker_init(worker):
+    from ai_models.preload import memory_report, format_memory
+    worker.log.info(f"Worker {worker.pid} booted: {format_memory(memory_report())}")